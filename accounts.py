@@ -0,0 +1,124 @@
+# accounts.py
+# Test account pool. Each test that logs in leases its own mobile/OTP pair,
+# so parallel workers do not share OTP rate limits or server-side sessions.
+#
+# Accounts come from B2C_ACCOUNTS_FILE, a JSON file keyed by backend host:
+#   {"b2c.ecoserp.in": [{"mobile": "...", "otp": "...", "nickname": "..."}],
+#    "localhost:8000":  [...]}
+# or from testvalue.TEST_ACCOUNTS. Leases live in a shared state file, so
+# they hold across worker processes.
+#
+# With a single configured account there is nothing to spread the tests
+# over: it is shared by every test (with a warning) instead of leased, so
+# parallel runs do not queue on it for whole tests.
+
+import os
+import sys
+import json
+import logging
+import time as _time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+import interprocess
+import locators
+import testvalue
+
+Account = namedtuple("Account", ["mobile", "otp", "nickname"])
+
+ACCOUNTS_FILE = os.environ.get("B2C_ACCOUNTS_FILE")
+# Backend the accounts belong to (defaults to the host in locators.URL)
+BACKEND = os.environ.get("B2C_BACKEND") or urlsplit(locators.URL).netloc
+# How long lease() waits for a free account before giving up
+LEASE_WAIT_SECONDS = float(os.environ.get("B2C_ACCOUNT_WAIT", "900"))
+# Leases older than this are considered abandoned (e.g. a killed worker)
+STALE_LEASE_SECONDS = 3600
+
+STATE_FILE = "account_leases.json"
+POLL_SECONDS = 1.0
+
+_accounts = None
+_warned_shared = False
+
+
+def _to_account(entry):
+    return Account(str(entry["mobile"]), str(entry["otp"]),
+                   entry.get("nickname", testvalue.LOGIN_EXPECTED_NICKNAME))
+
+
+def load_accounts():
+    """Accounts configured for BACKEND, in preference order."""
+    global _accounts
+    if _accounts is None:
+        entries = None
+        if ACCOUNTS_FILE:
+            with open(ACCOUNTS_FILE) as f:
+                entries = json.load(f).get(BACKEND)
+            if not entries:
+                logging.warning("No accounts for backend '%s' in %s — using testvalue.TEST_ACCOUNTS",
+                                BACKEND, ACCOUNTS_FILE)
+        _accounts = [_to_account(e) for e in (entries or testvalue.TEST_ACCOUNTS)]
+    return _accounts
+
+
+def _pid_alive(pid):
+    if sys.platform.startswith("win"):
+        return True  # os.kill() would terminate the process on Windows; rely on lease age
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+
+
+def _is_stale(lease, now):
+    return now - lease["since"] > STALE_LEASE_SECONDS or not _pid_alive(lease["pid"])
+
+
+def _key(account):
+    return f"{BACKEND}|{account.mobile}"
+
+
+def lease(holder):
+    """Lease a free account to `holder` (e.g. a test id), waiting for one if all are taken.
+
+    A lone configured account is returned to every holder without a lease.
+    """
+    global _warned_shared
+    if len(load_accounts()) == 1:
+        if not _warned_shared:
+            _warned_shared = True
+            logging.warning("Only one test account for backend '%s' — sharing it between tests "
+                            "(add accounts with B2C_ACCOUNTS_FILE to lease one per test)", BACKEND)
+        return load_accounts()[0]
+    deadline = _time.monotonic() + LEASE_WAIT_SECONDS
+    waited_from = None
+    while True:
+        with interprocess.locked_json(STATE_FILE) as leases:
+            now = _time.time()
+            for key in [k for k, v in leases.items() if _is_stale(v, now)]:
+                logging.warning("Dropping abandoned account lease %s (held by %s)", key, leases[key]["holder"])
+                del leases[key]
+            for account in load_accounts():
+                if _key(account) not in leases:
+                    leases[_key(account)] = {"holder": holder, "pid": os.getpid(), "since": now}
+                    if waited_from is not None:
+                        logging.info("Waited %.1fs for a free test account", _time.monotonic() - waited_from)
+                    logging.info("Leased test account %s to %s", account.mobile, holder)
+                    return account
+        if waited_from is None:
+            waited_from = _time.monotonic()
+            logging.info("All %d test accounts are leased — waiting for one to be released", len(load_accounts()))
+        if _time.monotonic() > deadline:
+            raise RuntimeError(f"No free test account for backend '{BACKEND}' after {LEASE_WAIT_SECONDS:.0f}s")
+        _time.sleep(POLL_SECONDS)
+
+
+def release(account, holder):
+    with interprocess.locked_json(STATE_FILE) as leases:
+        current = leases.get(_key(account))
+        if current and current["holder"] == holder and current["pid"] == os.getpid():
+            del leases[_key(account)]
+            logging.info("Released test account %s from %s", account.mobile, holder)
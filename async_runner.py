@@ -0,0 +1,126 @@
+# async_runner.py
+# Runs many tests concurrently in one process. Each test is a coroutine that
+# hands the (blocking) test body to a thread, with its own browser session, so
+# the waits of one test (OTP rate-limit backoffs, page loads) overlap with the
+# work of others. Concurrency is capped by CPU count and free memory.
+#
+# Every test runs in a one-off subclass of its TestCase, so class-level state
+# (cls.driver, screenshot counters) is not shared between concurrent tests.
+# The stats reports (waits, OTP limiter, state reset, WebDriver commands) are
+# process-wide and cleared when logged, so they are logged once at the end of
+# the run instead of in each test's tearDownClass.
+
+import os
+import asyncio
+import logging
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import browser_pool
+import command_stats
+import otp_limiter
+import resource_policy
+import runner
+import state_reset
+import timings
+import waits
+
+# Browser sessions per CPU core (sessions spend most of their time waiting)
+SESSIONS_PER_CPU = int(os.environ.get("B2C_ASYNC_PER_CPU", "2"))
+# Expected resident memory per Chrome session, and memory left for everything else
+SESSION_MB = int(os.environ.get("B2C_SESSION_MB", "500"))
+RESERVE_MB = int(os.environ.get("B2C_MEM_RESERVE_MB", "1024"))
+
+HEADROOM_POLL_SECONDS = 1.0
+
+
+def mem_available_mb():
+    """MemAvailable from /proc/meminfo in MB, or None where that is not available."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def max_sessions(requested=None):
+    """How many tests may run at once: CPU and memory headroom, capped by `requested`.
+
+    The pool's warm spare sessions take memory too, so they come off the memory budget.
+    """
+    cap = (os.cpu_count() or 1) * SESSIONS_PER_CPU
+    mem = mem_available_mb()
+    if mem is not None:
+        cap = min(cap, int((mem - RESERVE_MB) // SESSION_MB) - browser_pool.POOL_SPARES)
+    if requested:
+        cap = min(cap, requested)
+    return max(1, cap)
+
+
+def run_isolated_test(test_id):
+    """Run one test in its own TestCase subclass (own setUpClass/tearDownClass and browser)."""
+    (test,) = list(_iter_tests(unittest.TestLoader().loadTestsFromName(test_id)))
+    cls = type(test)
+    isolated = type(cls.__name__, (cls,), {"__module__": cls.__module__, "__qualname__": cls.__qualname__,
+                                           "_defer_reports": True})
+    summary = runner.run_suite(unittest.TestSuite([isolated(test._testMethodName)]), [test_id])
+    # A lone test's "class setup" is just a pool lease — keep it out of the history
+    summary["class_overheads"] = {}
+    return summary
+
+
+def _iter_tests(suite):
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _iter_tests(item)
+        else:
+            yield item
+
+
+async def _run_all(test_ids, limit, history):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(limit)
+    running = [0]
+
+    async def wait_for_headroom():
+        # Never block the only running test; otherwise start a new browser only if memory allows
+        while running[0] > 0:
+            mem = mem_available_mb()
+            if mem is None or mem - RESERVE_MB >= SESSION_MB:
+                return
+            await asyncio.sleep(HEADROOM_POLL_SECONDS)
+
+    async def run_one(test_id):
+        async with semaphore:
+            await wait_for_headroom()
+            running[0] += 1
+            try:
+                return await loop.run_in_executor(executor, run_isolated_test, test_id)
+            finally:
+                running[0] -= 1
+
+    # Longest tests first, so a long test does not start last and set the finish time
+    estimate = history.get("tests", {}) if history else {}
+    ordered = sorted(test_ids, key=lambda t: -estimate.get(t, timings.DEFAULT_TEST_SECONDS))
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="b2c-test") as executor:
+        results = await asyncio.gather(*(run_one(t) for t in ordered))
+    by_id = dict(zip(ordered, results))
+    return [by_id[t] for t in test_ids]
+
+
+def run(test_ids, sessions=None, history=None):
+    """Run the tests concurrently. Returns one runner summary per test, in `test_ids` order."""
+    limit = max_sessions(sessions)
+    logging.info("Async executor: up to %d concurrent browser sessions (%d CPUs, %s MB available)",
+                 limit, os.cpu_count() or 1, "%.0f" % mem_available_mb() if mem_available_mb() else "unknown")
+    browser_pool.get_pool().expect_leases(len(test_ids))  # one isolated class per test
+    summaries = asyncio.run(_run_all(test_ids, limit, history))
+    waits.log_report("async run")
+    otp_limiter.log_report("async run")
+    state_reset.log_report("async run")
+    command_stats.log_report("async run", "")
+    resource_policy.save_sizes()
+    return summaries
@@ -0,0 +1,108 @@
+# benchmark.py
+# Headed vs headless Chrome on this machine: driver start, first open_site,
+# and (optionally) the wall-clock time of whole suites.
+#
+# Usage:
+#   python benchmark.py                                   # 3 starts per mode
+#   python benchmark.py --repeat 5 --modes headless
+#   python benchmark.py --suite test_suites.Login_Home.TestLoginHome
+#
+# Each suite run happens in a fresh worker process so the two modes never
+# share a warm browser.
+
+import os
+import sys
+import argparse
+import statistics
+import time as _time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_suites"))
+
+import browser_pool
+import driver_cache
+import main
+import methods
+import runner
+
+MODES = ("headed", "headless")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare headed and headless Chrome timings.")
+    parser.add_argument("--repeat", type=int, default=3, help="driver starts per mode (default: 3)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument(
+        "--suite", action="append", default=[], metavar="NAME",
+        help="dotted suite name to time end-to-end in each mode (repeatable, or 'all')",
+    )
+    return parser.parse_args(argv)
+
+
+def measure_startup(headless, repeat):
+    """Seconds for driver start and first open_site, one pair per repetition."""
+    starts, opens = [], []
+    for _ in range(repeat):
+        t0 = _time.perf_counter()
+        driver = browser_pool.new_driver(headless=headless)
+        t1 = _time.perf_counter()
+        try:
+            methods.open_site(driver)
+            opens.append(_time.perf_counter() - t1)
+        finally:
+            driver.quit()
+        starts.append(t1 - t0)
+    return starts, opens
+
+
+def measure_suites(headless, suites):
+    """Wall-clock seconds and pass/fail counts for the suites, run in one fresh worker."""
+    os.environ["B2C_HEADLESS"] = "1" if headless else "0"
+    test_ids = main.collect_test_ids(suites)
+    start = _time.perf_counter()
+    summary = runner.run_parallel([test_ids], 1)[0]
+    return _time.perf_counter() - start, summary
+
+
+def describe(samples):
+    if not samples:
+        return "n/a"
+    return "median %6.2fs  min %6.2fs  max %6.2fs" % (
+        statistics.median(samples), min(samples), max(samples))
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    suites = main.SUITES if "all" in args.suite else args.suite
+
+    t0 = _time.perf_counter()
+    driver_cache.export_for_workers()
+    print("chromedriver resolution: %.2fs (not counted below)" % (_time.perf_counter() - t0))
+    print("window size: %s" % browser_pool.WINDOW_SIZE)
+
+    results = {}
+    for mode in args.modes:
+        headless = mode == "headless"
+        starts, opens = measure_startup(headless, args.repeat)
+        results[mode] = {"start": starts, "open": opens}
+        if suites:
+            elapsed, summary = measure_suites(headless, suites)
+            results[mode]["suite"] = elapsed
+            results[mode]["summary"] = summary
+
+    print()
+    for mode in args.modes:
+        r = results[mode]
+        print("%-9s driver start     %s" % (mode, describe(r["start"])))
+        print("%-9s first open_site  %s" % (mode, describe(r["open"])))
+        if "suite" in r:
+            s = r["summary"]
+            print("%-9s suites           %6.1fs  (%d tests, %d failures, %d errors)" % (
+                mode, r["suite"], s["tests_run"], len(s["failures"]), len(s["errors"])))
+    if len(args.modes) == 2:
+        headed, headless = results["headed"], results["headless"]
+        print()
+        print("headless vs headed: driver start %+.2fs, first open_site %+.2fs" % (
+            statistics.median(headless["start"]) - statistics.median(headed["start"]),
+            statistics.median(headless["open"]) - statistics.median(headed["open"])))
+        if "suite" in headed:
+            print("headless vs headed: suites %+.1fs" % (headless["suite"] - headed["suite"]))
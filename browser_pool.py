@@ -0,0 +1,274 @@
+# browser_pool.py
+# Warm Chrome session pool shared by all TestCase classes in a process.
+# Sessions are pre-spawned in the background, leased to a class, reset to a
+# clean state on release and reused until unhealthy or over an age/memory budget.
+# Runners tell the pool how many leases to expect (expect_leases), so no spare
+# is started once the last expected lease has been made.
+
+import os
+import atexit
+import logging
+import threading
+import time as _time
+from multiprocessing import util as _mp_util
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+import command_stats
+import driver_cache
+import resource_policy
+import state_reset
+import waits
+
+# Idle sessions kept warm in the background (B2C_POOL_SPARES=0 disables pre-spawning)
+POOL_SPARES = int(os.environ.get("B2C_POOL_SPARES", "1"))
+# Reuse sessions across classes at all (B2C_BROWSER_POOL=0 quits on release like before)
+POOL_REUSE = os.environ.get("B2C_BROWSER_POOL", "1") != "0"
+# Recycle budgets
+MAX_AGE_SECONDS = float(os.environ.get("B2C_POOL_MAX_AGE", "1800"))
+MAX_HEAP_MB = float(os.environ.get("B2C_POOL_MAX_HEAP_MB", "512"))
+
+# How long lease() waits for an in-flight pre-spawn before starting its own
+SPAWN_WAIT_SECONDS = 60
+
+# Viewport for both profiles (headless has no screen to maximize to)
+WINDOW_SIZE = os.environ.get("B2C_WINDOW_SIZE", "1920,1080")
+
+# Headless profile (B2C_HEADLESS=1 or main.py --headless): no UI, and none
+# of the background work a fresh profile does on its own
+HEADLESS_FLAGS = [
+    "--headless=new",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--no-first-run",
+    "--hide-scrollbars",
+]
+
+
+def headless_enabled():
+    return os.environ.get("B2C_HEADLESS") == "1"
+
+
+def chrome_options(headless=None):
+    headless = headless_enabled() if headless is None else headless
+    options = webdriver.ChromeOptions()
+    if headless:
+        for flag in HEADLESS_FLAGS:
+            options.add_argument(flag)
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument(f"--window-size={WINDOW_SIZE}")
+    resource_policy.enable_reporting(options)
+    return options
+
+
+def new_driver(headless=None):
+    """Start a fresh Chrome session (cold start) with the fetch/XHR tracker and command counter installed."""
+    driver = webdriver.Chrome(
+        service=ChromeService(driver_cache.resolve()),
+        options=chrome_options(headless),
+    )
+    command_stats.install(driver)
+    try:
+        waits.install_network_tracker(driver)
+    except Exception as e:
+        logging.warning("Could not install network tracker, falling back to resource timing: %s", e)
+    return driver
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+        self.created = _time.monotonic()
+        self.leases = 0
+
+
+class BrowserPool:
+    """Thread-safe pool of warm Chrome sessions for one process."""
+
+    def __init__(self, spares=POOL_SPARES, reuse=POOL_REUSE,
+                 max_age=MAX_AGE_SECONDS, max_heap_mb=MAX_HEAP_MB):
+        self.spares = spares
+        self.reuse = reuse
+        self.max_age = max_age
+        self.max_heap_mb = max_heap_mb
+        self._idle = []
+        self._leased = {}
+        self._spawning = 0
+        self._expected = None  # leases still expected (None = unknown: always keep the spares)
+        self._closed = False
+        self._cond = threading.Condition()
+
+    # ── Spawning ─────────────────────────────────────────────────────
+
+    def expect_leases(self, count):
+        """Add `count` upcoming leases; spares are only kept for leases still expected."""
+        with self._cond:
+            self._expected = (self._expected or 0) + count
+
+    def prespawn(self, count=None):
+        """Start background spawns until `count` sessions are idle or on the way."""
+        with self._cond:
+            if count is None:
+                count = self.spares if self._expected is None else min(self.spares, self._expected)
+            missing = count - len(self._idle) - self._spawning
+            self._spawning += max(0, missing)
+        for _ in range(max(0, missing)):
+            threading.Thread(target=self._spawn_in_background, daemon=True).start()
+
+    def _spawn_in_background(self):
+        session = None
+        try:
+            start = _time.perf_counter()
+            session = _Session(new_driver())
+            logging.info("Pre-spawned Chrome session ready in %.1fs", _time.perf_counter() - start)
+        except Exception as e:
+            logging.warning("Background Chrome spawn failed: %s", e)
+        with self._cond:
+            self._spawning -= 1
+            if session is not None:
+                if self._closed:
+                    self._quit(session)
+                else:
+                    self._idle.append(session)
+            self._cond.notify_all()
+
+    # ── Lease / release ──────────────────────────────────────────────
+
+    def lease(self):
+        """Return a clean, healthy driver. Prefers a warm idle session over a cold start."""
+        while True:
+            with self._cond:
+                if not self._idle and self._spawning:
+                    self._cond.wait_for(lambda: self._idle or not self._spawning, timeout=SPAWN_WAIT_SECONDS)
+                session = self._idle.pop(0) if self._idle else None
+
+            if session is None:
+                start = _time.perf_counter()
+                session = _Session(new_driver())
+                logging.info("Cold-started Chrome session in %.1fs", _time.perf_counter() - start)
+            elif not self._is_healthy(session):
+                logging.warning("Idle Chrome session is unhealthy — discarding it")
+                self._quit(session)
+                continue
+            break
+
+        session.leases += 1
+        with self._cond:
+            self._leased[id(session.driver)] = session
+            if self._expected is not None:
+                self._expected = max(0, self._expected - 1)
+        if self.reuse:
+            self.prespawn()
+        return session.driver
+
+    def release(self, driver):
+        """Give a driver back. Resets it for the next lease, or quits it if it should be recycled."""
+        with self._cond:
+            session = self._leased.pop(id(driver), None)
+        if session is None:
+            session = _Session(driver)
+        try:
+            driver.switch_to.alert.accept()  # a leftover alert would fail the health check
+        except Exception:
+            pass
+
+        reason = self._recycle_reason(session) if self.reuse else "pool reuse disabled"
+        if reason is None:
+            try:
+                start = _time.perf_counter()
+                self._reset(driver)
+                logging.info("Chrome session reset in %.2fs and returned to pool (lease #%d)",
+                             _time.perf_counter() - start, session.leases)
+            except Exception as e:
+                reason = f"reset failed: {e}"
+
+        if reason is not None:
+            logging.info("Recycling Chrome session: %s", reason)
+            self._quit(session)
+            if self.reuse:
+                self.prespawn()
+            return
+
+        with self._cond:
+            unneeded = self._expected is not None and len(self._idle) >= self._expected
+            if self._closed or unneeded:
+                self._quit(session)  # no lease left to hand it to
+            else:
+                self._idle.append(session)
+                self._cond.notify_all()
+
+    def close(self):
+        """Quit every session the pool knows about."""
+        with self._cond:
+            self._closed = True
+            sessions = self._idle + list(self._leased.values())
+            self._idle, self._leased = [], {}
+        for session in sessions:
+            self._quit(session)
+
+    # ── Health and reset ─────────────────────────────────────────────
+
+    def _is_healthy(self, session):
+        try:
+            session.driver.title  # quick session health check
+            return True
+        except Exception:
+            return False
+
+    def _recycle_reason(self, session):
+        if not self._is_healthy(session):
+            return "session is unhealthy"
+        age = _time.monotonic() - session.created
+        if age > self.max_age:
+            return f"age {age:.0f}s over budget {self.max_age:.0f}s"
+        try:
+            heap = session.driver.execute_script(
+                "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0;"
+            ) or 0
+        except Exception:
+            heap = 0
+        heap_mb = heap / (1024 * 1024)
+        if heap_mb > self.max_heap_mb:
+            return f"JS heap {heap_mb:.0f} MB over budget {self.max_heap_mb:.0f} MB"
+        return None
+
+    def _reset(self, driver):
+        """Clear cookies and storage and land on a blank page."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        state_reset.clear_state(driver)
+        try:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})  # next lease applies its own policy
+        except Exception:
+            pass
+        driver.get("about:blank")
+
+    def _quit(self, session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process-wide pool, created on first use (so each worker process gets its own)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+            # Pool worker processes leave through os._exit(), which skips atexit
+            _mp_util.Finalize(_pool, _pool.close, exitpriority=10)
+        return _pool
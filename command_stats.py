@@ -0,0 +1,140 @@
+# command_stats.py
+# Counts the WebDriver commands (HTTP round trips to chromedriver) each test
+# sends, and how long they take, grouped by the methods.* helper that sent
+# them (or, outside methods.py, the calling function).
+#
+# install() wraps a driver's command executor; BaseTestCase tags every
+# command with the running test and logs a report at tearDownClass. A test
+# can declare a ceiling with @command_budget(n) so that a refactor which
+# multiplies the round trips fails the run:
+#
+#     @command_budget(120)
+#     def to_verify_something(self): ...
+#
+# B2C_COMMAND_STATS=0 turns counting (and budgets) off.
+
+import os
+import sys
+import logging
+import functools
+import threading
+import time as _time
+
+ENABLED = os.environ.get("B2C_COMMAND_STATS", "1") != "0"
+# Callers listed per test in the report, and in a budget failure
+TOP_CALLERS = 5
+
+_current = threading.local()
+_stats = {}  # (test id, caller, command) -> [count, seconds]; reported tests are cleared
+_totals = {}  # test id -> commands; never cleared, so budgets are immune to reports
+_running = set()  # test ids set on some thread right now
+_stats_lock = threading.Lock()
+
+
+def set_test(test_id):
+    """Attribute commands sent from this thread to `test_id` (None to stop)."""
+    with _stats_lock:
+        _running.discard(getattr(_current, "test_id", None))
+        if test_id is not None:
+            _running.add(test_id)
+    _current.test_id = test_id
+
+
+def _caller():
+    """Innermost methods.* function on the stack, else the nearest non-Selenium caller."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "methods":
+            return "methods." + frame.f_code.co_name
+        if fallback is None and not module.startswith("selenium") and module != __name__:
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback or "?"
+
+
+def _record(command, seconds):
+    key = (getattr(_current, "test_id", None), _caller(), command)
+    with _stats_lock:
+        entry = _stats.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        _totals[key[0]] = _totals.get(key[0], 0) + 1
+
+
+def install(driver):
+    """Count every command `driver` sends from now on."""
+    if not ENABLED:
+        return
+    executor = driver.command_executor
+    send = executor.execute
+
+    def execute(command, params):
+        start = _time.perf_counter()
+        try:
+            return send(command, params)
+        finally:
+            _record(command, _time.perf_counter() - start)
+
+    executor.execute = execute
+
+
+def count(test_id):
+    """Commands sent for `test_id` so far (not affected by log_report resets)."""
+    with _stats_lock:
+        return _totals.get(test_id, 0)
+
+
+def by_caller(test_id):
+    """[(caller, commands, seconds)] for `test_id`, most commands first."""
+    totals = {}
+    with _stats_lock:
+        for (t, caller, _), (c, s) in _stats.items():
+            if t == test_id:
+                n, secs = totals.get(caller, (0, 0.0))
+                totals[caller] = (n + c, secs + s)
+    return sorted(((caller, n, s) for caller, (n, s) in totals.items()), key=lambda row: -row[1])
+
+
+def _describe(rows):
+    return ", ".join(f"{caller} {n} ({s:.2f}s)" for caller, n, s in rows[:TOP_CALLERS])
+
+
+def command_budget(limit):
+    """Fail the decorated test if its body sends more than `limit` WebDriver commands."""
+    def decorate(test):
+        @functools.wraps(test)
+        def wrapper(self, *args, **kwargs):
+            before = count(self.id())
+            before_rows = {caller: n for caller, n, _ in by_caller(self.id())}
+            result = test(self, *args, **kwargs)
+            used = count(self.id()) - before
+            if ENABLED and used > limit:
+                rows = [(caller, n - before_rows.get(caller, 0), s) for caller, n, s in by_caller(self.id())]
+                rows.sort(key=lambda row: -row[1])
+                self.fail(f"{used} WebDriver commands, over the budget of {limit}. Top callers: {_describe(rows)}")
+            return result
+        wrapper.command_budget = limit
+        return wrapper
+    return decorate
+
+
+def log_report(title, prefix, reset=True):
+    """Log commands per finished test whose id starts with `prefix` (e.g. one TestCase class).
+
+    Tests still running on another thread are left for a later report;
+    `reset` only clears the tests reported here.
+    """
+    with _stats_lock:
+        tests = sorted({t for t, _, _ in _stats if t and t.startswith(prefix) and t not in _running})
+    for test_id in tests:
+        rows = by_caller(test_id)
+        total = sum(n for _, n, _ in rows)
+        seconds = sum(s for _, _, s in rows)
+        logging.info("WebDriver commands for %s: %s — %d commands, %.2fs. Top: %s",
+                     title, test_id[len(prefix):], total, seconds, _describe(rows))
+    if reset:
+        with _stats_lock:
+            for key in [k for k in _stats if k[0] in tests]:
+                del _stats[key]
@@ -0,0 +1,142 @@
+# driver_cache.py
+# Offline chromedriver resolution. The driver path is cached on disk keyed by
+# the installed Chrome version, resolved once per run and handed to worker
+# processes through the B2C_CHROMEDRIVER environment variable.
+
+import os
+import re
+import sys
+import json
+import shutil
+import logging
+import threading
+import subprocess
+import time as _time
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+ENV_VAR = "B2C_CHROMEDRIVER"
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "b2c-selenium", "chromedriver.json")
+
+# B2C_OFFLINE=1 never asks webdriver-manager (which may hit the network)
+OFFLINE = os.environ.get("B2C_OFFLINE") == "1"
+
+_CHROME_BINARIES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+_VERSION_RE = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+
+_lock = threading.Lock()
+_resolved = False
+_resolved_path = None
+
+
+def installed_chrome_version():
+    """Return the installed Chrome version string (e.g. '124.0.6367.91') or None."""
+    override = os.environ.get("B2C_CHROME_VERSION")
+    if override:
+        return override
+
+    if sys.platform.startswith("win"):
+        import winreg
+        for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                continue
+        return None
+
+    for binary in _CHROME_BINARIES:
+        exe = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+        if not exe:
+            continue
+        try:
+            out = subprocess.run([exe, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION_RE.search(out)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    tmp = CACHE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, CACHE_FILE)
+
+
+def _from_cache(cache, version):
+    """Exact version hit first, then any cached driver for the same major version."""
+    path = cache.get(version)
+    if path and os.path.isfile(path):
+        return path
+    major = version.split(".")[0] + "."
+    for cached_version, path in sorted(cache.items(), reverse=True):
+        if cached_version.startswith(major) and os.path.isfile(path):
+            return path
+    return None
+
+
+def _resolve_uncached():
+    env_path = os.environ.get(ENV_VAR)
+    if env_path and os.path.isfile(env_path):
+        return env_path, "environment"
+
+    version = installed_chrome_version()
+    cache = _load_cache()
+    if version:
+        path = _from_cache(cache, version)
+        if path:
+            return path, f"cache (Chrome {version})"
+
+    if not OFFLINE:
+        try:
+            path = ChromeDriverManager().install()
+            if version:
+                cache[version] = path
+                _save_cache(cache)
+            return path, f"webdriver-manager (Chrome {version or 'unknown'})"
+        except Exception as e:
+            logging.warning("webdriver-manager could not provide chromedriver: %s", e)
+
+    path = shutil.which("chromedriver")
+    if path:
+        return path, "PATH"
+    return None, "Selenium Manager"
+
+
+def resolve():
+    """Return the chromedriver path for this machine, or None to let Selenium pick one.
+
+    Memoized for the lifetime of the process.
+    """
+    global _resolved, _resolved_path
+    with _lock:
+        if not _resolved:
+            start = _time.perf_counter()
+            _resolved_path, source = _resolve_uncached()
+            _resolved = True
+            logging.info("chromedriver resolved from %s in %.0f ms: %s",
+                         source, (_time.perf_counter() - start) * 1000, _resolved_path)
+        return _resolved_path
+
+
+def export_for_workers():
+    """Resolve once in the parent and publish the path so worker processes skip resolution."""
+    path = resolve()
+    if path:
+        os.environ[ENV_VAR] = path
+    return path
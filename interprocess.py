@@ -0,0 +1,84 @@
+# interprocess.py
+# Small cross-process coordination helpers: an exclusive file lock and
+# lock-protected JSON state files, shared by every worker process on the
+# machine (and by threads within one process).
+
+import os
+import sys
+import json
+import tempfile
+from contextlib import contextmanager
+
+# Shared by all runs on this machine (B2C_STATE_DIR to separate them)
+STATE_DIR = os.environ.get("B2C_STATE_DIR", os.path.join(tempfile.gettempdir(), "b2c-selenium"))
+
+if sys.platform.startswith("win"):
+    import msvcrt
+
+    def _lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10 s, then raises
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def state_path(name):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    return os.path.join(STATE_DIR, name)
+
+
+class FileLock:
+    """Exclusive lock on `path` + '.lock'. Each `with` opens its own handle,
+    so it also excludes other threads of the same process."""
+
+    def __init__(self, path):
+        self.path = path + ".lock"
+        self._file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a+")
+        try:
+            _lock(self._file)
+        except BaseException:
+            self._file.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            _unlock(self._file)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+@contextmanager
+def locked_json(name, default=None):
+    """Read-modify-write a JSON state file under its lock.
+
+    Yields the loaded object (or `default`); whatever it holds when the block
+    ends is written back.
+    """
+    path = state_path(name)
+    with FileLock(path):
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {} if default is None else default
+        yield state
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
@@ -7,7 +7,7 @@ URL = "https://b2c.ecoserp.in/"
 # TAB SELECTORS
 # ════════════════════════════════════════════════════════════════
 
-AIRPORT_TRANSFER_TAB_XPATH = '//*[@id="myTab"]/li[1]/a/img[2]'
+AIRPORT_TRANSFER_TAB_XPATH = '//*[@id="myTab"]/li[1]/a'  # the link, not its icon: icons may be blocked (resource_policy)
 LOCAL_RENTAL_TAB_XPATH = '//*[@id="myTab"]/li[2]'
 OUTSTATION_TRIP_TAB_XPATH = '//*[@id="myTab"]/li[3]'
 SELF_DRIVE_TAB_XPATH = '//*[@id="myTab"]/li[4]/a'
@@ -1,28 +1,116 @@
 # main.py
 # Runs all test suites: Airport Transfer Pickup, Drop, Local Rental,
 # Outstation Trip, Login Home, Login BookNow, Modify Search.
+#
+# Usage:
+#   python main.py                # serial run, one browser at a time
+#   python main.py --workers 4    # tests balanced over 4 worker processes, one browser each
+#   python main.py --shard 2/3    # run the 2nd of 3 duration-balanced slices (for CI boxes)
+#   python main.py --headless     # headless Chrome profile (see browser_pool.HEADLESS_FLAGS)
+#   python main.py --async        # one process, many concurrent browser sessions (capped by CPU/memory)
+#   python main.py --async 6      # same, at most 6 sessions
+#
+# Every run updates the per-test timing history (test_timings.json) that the
+# --workers and --shard planners use to balance expected wall-clock time.
 
+import os
+import sys
+import argparse
+import time as _time
 import unittest
 
-from test_suites.Airport_Transfer_pick import TestAirportTransferPickup
-from test_suites.Airport_Transfer_Drop import TestAirportTransferDrop
-from test_suites.Local_Rental import TestLocalRental
-from test_suites.Outstation_Trip import TestOutstationTrip
-from test_suites.Login_Home import TestLoginHome
-from test_suites.Login_BookNow import TestLoginBookNow
-from test_suites.Modify_Search import TestModifySearch
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_suites"))
+
+import async_runner
+import driver_cache
+import runner
+import timings
+
+unittest.TestLoader.testMethodPrefix = "to_"
+
+# Suites are referenced by name so worker processes can import them on their own.
+SUITES = [
+    "test_suites.Airport_Transfer_pick.TestAirportTransferPickup",
+    "test_suites.Airport_Transfer_Drop.TestAirportTransferDrop",
+    "test_suites.Local_Rental.TestLocalRental",
+    "test_suites.Outstation_Trip.TestOutstationTrip",
+    "test_suites.Login_Home.TestLoginHome",
+    "test_suites.Login_BookNow.TestLoginBookNow",
+    "test_suites.Modify_Search.TestModifySearch",
+]
+
+
+def _shard(value):
+    try:
+        return timings.parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the B2C Selenium test suites.")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of worker processes, each with its own browser (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--shard", type=_shard, default=None, metavar="I/N",
+        help="run only the I-th of N duration-balanced slices of the tests, e.g. 2/4",
+    )
+    parser.add_argument(
+        "--async", dest="async_sessions", type=int, nargs="?", const=0, default=None, metavar="N",
+        help="run tests concurrently in this process, each with its own browser "
+             "(at most N sessions; without N, as many as CPU and memory allow)",
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="run Chrome headless (same as B2C_HEADLESS=1)",
+    )
+    parser.add_argument(
+        "--timings", default=timings.TIMINGS_FILE,
+        help="timing history file used for balancing and updated after the run",
+    )
+    return parser.parse_args(argv)
+
+
+def collect_test_ids(names):
+    """Expand suite names to individual test ids, in loader order."""
+    ids = []
+
+    def walk(suite):
+        for item in suite:
+            if isinstance(item, unittest.TestSuite):
+                walk(item)
+            else:
+                ids.append(item.id())
+
+    walk(unittest.TestLoader().loadTestsFromNames(names))
+    return ids
+
 
 if __name__ == '__main__':
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-
-    suite.addTests(loader.loadTestsFromTestCase(TestAirportTransferPickup))
-    suite.addTests(loader.loadTestsFromTestCase(TestAirportTransferDrop))
-    suite.addTests(loader.loadTestsFromTestCase(TestLocalRental))
-    suite.addTests(loader.loadTestsFromTestCase(TestOutstationTrip))
-    suite.addTests(loader.loadTestsFromTestCase(TestLoginHome))
-    suite.addTests(loader.loadTestsFromTestCase(TestLoginBookNow))
-    suite.addTests(loader.loadTestsFromTestCase(TestModifySearch))
-
-    runner = unittest.TextTestRunner(verbosity=2)
-    runner.run(suite)
+    args = parse_args()
+    history = timings.load_history(args.timings)
+
+    test_ids = collect_test_ids(SUITES)
+    if args.shard:
+        index, total = args.shard
+        test_ids = timings.plan_shards(test_ids, total, history)[index - 1]
+
+    if args.headless:
+        os.environ["B2C_HEADLESS"] = "1"  # inherited by worker processes
+    driver_cache.export_for_workers()
+
+    start = _time.perf_counter()
+    if args.async_sessions is not None:
+        summaries = async_runner.run(test_ids, args.async_sessions or None, history)
+    elif args.workers > 1:
+        os.environ["B2C_SCREENSHOT_PER_SUITE"] = "1"
+        groups = [g for g in timings.plan_shards(test_ids, args.workers, history) if g]
+        summaries = runner.run_parallel(groups, args.workers)
+    else:
+        summaries = [runner.run_tests_in_worker(test_ids, stream=sys.stderr)]
+    ok = runner.print_report(summaries, _time.perf_counter() - start)
+
+    timings.save_history(timings.record(history, summaries), args.timings)
+    sys.exit(0 if ok else 1)
@@ -3,6 +3,7 @@
 
 import os
 import logging
+from collections import namedtuple
 from datetime import datetime
 
 from selenium.webdriver.common.by import By
@@ -16,6 +17,8 @@ from selenium.common.exceptions import (
 )
 
 import locators
+import otp_limiter
+import waits
 
 # screenshots directory
 SCREENSHOT_DIR = os.path.join(os.getcwd(), "screenshots")
@@ -67,6 +70,41 @@ def safe_type(driver, by, locator, text, clear=True, timeout=15):
     elem.send_keys(text)
 
 
+_FIND_BY_XPATHS_JS = """
+return arguments[0].map(function (xpath) {
+    var el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return el && el.offsetParent !== null && !el.disabled ? el : null;
+});
+"""
+
+# Uses the prototype's value setter so framework-controlled inputs (React,
+# Vue) see the change, then fires the events a user's typing would.
+_SET_INPUT_VALUES_JS = """
+var elements = arguments[0], values = arguments[1];
+var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+return elements.map(function (el, i) {
+    el.focus();
+    setter.call(el, values[i]);
+    ['input', 'change'].forEach(function (type) { el.dispatchEvent(new Event(type, {bubbles: true})); });
+    el.dispatchEvent(new FocusEvent('blur'));
+    el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+    return el.value;
+});
+"""
+
+
+def find_present(driver, xpaths):
+    """One round trip: the visible, enabled element for each xpath, or None."""
+    return driver.execute_script(_FIND_BY_XPATHS_JS, list(xpaths))
+
+
+def set_input_values(driver, elements, values):
+    """One round trip: set several inputs and return the values they now hold."""
+    if not elements:
+        return []
+    return driver.execute_script(_SET_INPUT_VALUES_JS, list(elements), list(values))
+
+
 def click_if_present(driver, by, locator, timeout=5):
     try:
         safe_click(driver, by, locator, timeout=timeout)
@@ -103,32 +141,135 @@ def type_and_select_first_option(driver, input_xpath, value, first_option_xpath=
         raise
 
 
-def set_date(driver, date_xpath, date_value, timeout=15):
-    import time as _time
-
-    parts = date_value.split("-")
-    day = int(parts[0])
-    month = int(parts[1]) - 1
-    year = int(parts[2])
+# B2C_FAST_DATE=0 always uses month-by-month clicking in the date picker
+FAST_DATE = os.environ.get("B2C_FAST_DATE", "1") != "0"
+
+# Moves the xdsoft picker straight to the target month through its own
+# datetime object, the same way its next/prev buttons do. Returns false when
+# jQuery or the picker API is not there.
+_XDSOFT_GOTO_MONTH_JS = """
+var picker = arguments[0], year = arguments[1], month = arguments[2];
+var $ = window.jQuery;
+var dt = $ && $(picker).data('xdsoft_datetime');
+if (!dt || !dt.currentTime) { return false; }
+var target = new Date(dt.currentTime.getTime());
+target.setFullYear(year, month, 1);
+dt.currentTime = target;
+$(picker).trigger('xchange.xdsoft');
+return true;
+"""
+
+_XDSOFT_STATE_JS = """
+var picker = arguments[0], input = arguments[1];
+var cell = picker.querySelector('td.xdsoft_date.xdsoft_current');
+return {
+    value: input.value === undefined ? null : input.value,
+    cell: cell ? [cell.getAttribute('data-date'), cell.getAttribute('data-month'), cell.getAttribute('data-year')] : null
+};
+"""
+
+_DATE_INPUT_FORMATS = ["%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y-%m-%d", "%Y/%m/%d",
+                       "%d %b %Y", "%d-%b-%Y", "%d %B %Y", "%b %d, %Y", "%B %d, %Y"]
+
+
+def _date_state_matches(state, day, month, year):
+    """True if the picker's selected cell and the input value both show the target date."""
+    if not state or state["cell"] != [str(day), str(month), str(year)]:
+        return False
+    value = state["value"]
+    if value is None:  # date_xpath is not an <input>; the cell is all we can check
+        return True
+    for candidate in (value.strip(), value.strip().split(" ")[0]):
+        for fmt in _DATE_INPUT_FORMATS:
+            try:
+                parsed = datetime.strptime(candidate, fmt)
+            except ValueError:
+                continue
+            return (parsed.day, parsed.month - 1, parsed.year) == (day, month, year)
+    return False
 
-    wait = get_wait(driver, timeout)
-    elem = wait.until(EC.element_to_be_clickable((By.XPATH, date_xpath)))
-    scroll_into_view(driver, elem)
 
+def _open_date_picker(driver, elem):
     picker = None
     for attempt in range(3):
         elem.click()
-        _time.sleep(0.5)
         try:
-            picker = WebDriverWait(driver, 5).until(EC.visibility_of_element_located(
+            picker = WebDriverWait(driver, 5, poll_frequency=0.1).until(EC.visibility_of_element_located(
                 (By.CSS_SELECTOR, "div.xdsoft_datetimepicker[style*='display: block']")
             ))
+            waits.element_stable(driver, "set_date.open_picker", picker, ceiling=0.5)
             break
         except TimeoutException:
             logging.warning("Date picker did not open on attempt %d, retrying...", attempt + 1)
     if not picker:
         raise Exception("Date picker failed to open after 3 attempts")
     logging.info("xdsoft datepicker opened")
+    return picker
+
+
+def _day_cell_selector(day, month, year):
+    return f"td.xdsoft_date[data-date='{day}'][data-month='{month}'][data-year='{year}']"
+
+
+def _set_date_fast(driver, elem, picker, day, month, year):
+    """Jump to the target month in one script call, click the day and verify.
+
+    Returns True when the date is selected and verified, False to fall back
+    to month-by-month navigation for this call only (the picker may simply
+    not be initialised yet).
+    """
+    if not driver.execute_script(_XDSOFT_GOTO_MONTH_JS, picker, year, month):
+        logging.warning("xdsoft picker API not available — using month-by-month navigation for this date")
+        return False
+
+    selector = _day_cell_selector(day, month, year)
+    day_cell = waits.until(
+        driver, "set_date.fast_month",
+        lambda d: picker.find_element(By.CSS_SELECTOR, selector),
+        ceiling=0.5,
+    )
+    if not day_cell:
+        logging.warning("Date picker did not render %02d-%d after the month jump", month + 1, year)
+        return False
+
+    disabled = "xdsoft_disabled" in (day_cell.get_attribute("class") or "")
+    day_cell.click()
+    if disabled:
+        # Past/blocked dates: the click is the test (same as the click path)
+        logging.info("Clicked disabled date cell %s-%s-%s", day, month + 1, year)
+        return True
+
+    verified = waits.until(
+        driver, "set_date.fast_verify",
+        lambda d: _date_state_matches(d.execute_script(_XDSOFT_STATE_JS, picker, elem), day, month, year),
+        ceiling=0.5,
+    )
+    if not verified:
+        state = driver.execute_script(_XDSOFT_STATE_JS, picker, elem)
+        logging.warning("Fast date selection not confirmed (input=%r, selected cell=%s)",
+                        state["value"], state["cell"])
+    return bool(verified)
+
+
+def set_date(driver, date_xpath, date_value, timeout=15):
+    parts = date_value.split("-")
+    day = int(parts[0])
+    month = int(parts[1]) - 1
+    year = int(parts[2])
+
+    wait = get_wait(driver, timeout)
+    elem = wait.until(EC.element_to_be_clickable((By.XPATH, date_xpath)))
+    scroll_into_view(driver, elem)
+
+    picker = _open_date_picker(driver, elem)
+
+    if FAST_DATE:
+        if _set_date_fast(driver, elem, picker, day, month, year):
+            logging.info("Date selected: %s", date_value)
+            return
+        logging.info("Falling back to month-by-month navigation for %s", date_value)
+        if not picker.is_displayed():
+            picker = _open_date_picker(driver, elem)
 
     max_clicks = 24
     month_names = [
@@ -145,24 +286,93 @@ def set_date(driver, date_xpath, date_value, timeout=15):
             break
         elif (current_year, current_month_idx) < (year, month):
             picker.find_element(By.CSS_SELECTOR, "button.xdsoft_next").click()
-            _time.sleep(0.3)
         else:
             picker.find_element(By.CSS_SELECTOR, "button.xdsoft_prev").click()
-            _time.sleep(0.3)
+        waits.until(
+            driver, "set_date.change_month",
+            lambda d: picker.find_element(By.CSS_SELECTOR, ".xdsoft_label.xdsoft_month span").text != current_month_text,
+            ceiling=0.3,
+        )
     else:
         raise Exception(f"Could not navigate to {date_value} in datepicker after {max_clicks} clicks")
 
-    day_cell = picker.find_element(
-        By.CSS_SELECTOR,
-        f"td.xdsoft_date[data-date='{day}'][data-month='{month}'][data-year='{year}']"
-    )
+    day_cell = picker.find_element(By.CSS_SELECTOR, _day_cell_selector(day, month, year))
     scroll_into_view(driver, day_cell)
     day_cell.click()
     logging.info("Date selected: %s", date_value)
 
 
+# B2C_FAST_TIME=0 always picks the time through the dropdown UI
+FAST_TIME = os.environ.get("B2C_FAST_TIME", "1") != "0"
+
+# Finds the hour/minute selects belonging to a time field: inside the field
+# or up to two ancestors above it (the dropdown menu is a sibling of the input).
+_FIND_TIME_SELECTS_JS = """
+var node = arguments[0], hourSel = null, minSel = null;
+for (var i = 0; node && i < 3 && !(hourSel && minSel); i++, node = node.parentElement) {
+    hourSel = node.querySelector('select.select_hour');
+    minSel = node.querySelector('select.select_minute');
+}
+"""
+
+_SET_TIME_JS = _FIND_TIME_SELECTS_JS + """
+if (!hourSel || !minSel) { return false; }
+var setter = Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value').set;
+[[hourSel, arguments[1]], [minSel, arguments[2]]].forEach(function (pair) {
+    setter.call(pair[0], pair[1]);
+    pair[0].dispatchEvent(new Event('input', {bubbles: true}));
+    pair[0].dispatchEvent(new Event('change', {bubbles: true}));
+});
+return true;
+"""
+
+_READ_TIME_JS = _FIND_TIME_SELECTS_JS + """
+var input = arguments[0].querySelector('input');
+return {
+    hour: hourSel ? hourSel.value : null,
+    minute: minSel ? minSel.value : null,
+    rendered: input ? input.value : null
+};
+"""
+
+_TIME_RENDER_FORMATS = ["%H:%M", "%I:%M %p", "%I:%M%p", "%H:%M:%S", "%I:%M:%S %p"]
+
+
+def _time_state_matches(state, hour_str, minute_str):
+    """True if both selects hold the target and the field renders the same clock time."""
+    if not state or (state["hour"], state["minute"]) != (hour_str, minute_str):
+        return False
+    rendered = (state["rendered"] or "").strip().upper()
+    for fmt in _TIME_RENDER_FORMATS:
+        try:
+            parsed = datetime.strptime(rendered, fmt)
+        except ValueError:
+            continue
+        return (parsed.hour, parsed.minute) == (int(hour_str), int(minute_str))
+    return False
+
+
+def _set_time_fast(driver, time_div, hour_str, minute_str):
+    """Set hour and minute in one script call, then read the field back.
+
+    Returns True when verified, False to fall back to the dropdown UI for
+    this call only.
+    """
+    if not driver.execute_script(_SET_TIME_JS, time_div, hour_str, minute_str):
+        logging.warning("Hour/minute selects not found next to the time field — using the dropdown for this time")
+        return False
+
+    verified = waits.until(
+        driver, "set_time.fast_verify",
+        lambda d: _time_state_matches(d.execute_script(_READ_TIME_JS, time_div), hour_str, minute_str),
+        ceiling=0.5,
+    )
+    if not verified:
+        logging.warning("Fast time selection not confirmed: %s", driver.execute_script(_READ_TIME_JS, time_div))
+    return bool(verified)
+
+
 def set_time(driver, time_xpath, time_value, timeout=15):
-    import time as _time
     from selenium.webdriver.support.ui import Select
 
     # Convert 12h format (e.g. "10:30 PM") to 24h for the site's dropdown
@@ -180,18 +390,26 @@ def set_time(driver, time_xpath, time_value, timeout=15):
 
     try:
         driver.find_element(By.TAG_NAME, "body").click()
-        _time.sleep(0.3)
+        waits.settle(driver, "set_time.close_open_dropdown", ceiling=0.3)
     except Exception:
         pass
 
     time_div = wait.until(EC.element_to_be_clickable((By.XPATH, time_xpath)))
+
+    if FAST_TIME:
+        if _set_time_fast(driver, time_div, hour_str, minute_str):
+            logging.info("Time selected: %s", time_value)
+            return
+        logging.info("Falling back to the time dropdown for %s", time_value)
+
     scroll_into_view(driver, time_div)
     try:
         time_input = time_div.find_element(By.TAG_NAME, "input")
         time_input.click()
     except Exception:
         time_div.click()
-    _time.sleep(0.5)
+    waits.until(driver, "set_time.open_dropdown",
+                EC.visibility_of_element_located((By.CSS_SELECTOR, "div.dropdown-menu.show")), ceiling=0.5)
 
     dropdown = wait.until(EC.visibility_of_element_located(
         (By.CSS_SELECTOR, "div.dropdown-menu.show")
@@ -201,7 +419,7 @@ def set_time(driver, time_xpath, time_value, timeout=15):
     hour_select = dropdown.find_element(By.CSS_SELECTOR, "select.select_hour")
     Select(hour_select).select_by_value(hour_str)
     logging.info("Hour selected: %s", hour_str)
-    _time.sleep(0.5)
+    waits.settle(driver, "set_time.after_hour", ceiling=0.5)
 
     try:
         dropdown = driver.find_element(By.CSS_SELECTOR, "div.dropdown-menu.show")
@@ -214,7 +432,8 @@ def set_time(driver, time_xpath, time_value, timeout=15):
             time_input.click()
         except Exception:
             time_div.click()
-        _time.sleep(0.5)
+        waits.until(driver, "set_time.reopen_dropdown",
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, "div.dropdown-menu.show")), ceiling=0.5)
         dropdown = wait.until(EC.visibility_of_element_located(
             (By.CSS_SELECTOR, "div.dropdown-menu.show")
         ))
@@ -224,7 +443,7 @@ def set_time(driver, time_xpath, time_value, timeout=15):
 
     try:
         driver.find_element(By.TAG_NAME, "body").click()
-        _time.sleep(0.3)
+        waits.settle(driver, "set_time.close_dropdown", ceiling=0.3)
     except Exception:
         pass
 
@@ -251,19 +470,82 @@ def _dismiss_alert(driver):
         text = alert.text
         logging.warning("Alert detected: %s", text)
         alert.accept()
-        import time as _t; _t.sleep(0.5)
+        waits.settle(driver, "dismiss_alert", ceiling=0.5, alert_aware=True)
         return text
     except Exception:
         return None
 
 
+_NET_REQUESTS_JS = "var n = window.__b2cNet; return n ? [n.total, n.inflight] : null;"
+
+
+def click_send_otp(driver, site, ceiling=5):
+    """Click Send OTP and wait until the site has answered, so the caller can then check for an alert.
+
+    Answered means an alert is open (rate limit / error), or a request sent
+    after the click has completed and the OTP input is visible. The OTP input
+    alone proves nothing: it can be clickable before the error alert shows.
+    Without the network tracker this falls back to a 1s alert-aware settle.
+    """
+    try:
+        before = driver.execute_script(_NET_REQUESTS_JS)
+    except Exception:
+        before = None
+    safe_click(driver, By.XPATH, locators.LOGIN_SEND_OTP_BUTTON_XPATH)
+    if before is None:
+        waits.settle(driver, site, ceiling=1, alert_aware=True)
+        return
+
+    def answered(d):
+        state = d.execute_script(_NET_REQUESTS_JS)
+        return (bool(state) and state[0] > before[0] and state[1] == 0
+                and EC.visibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))(d))
+
+    if waits.until(driver, site, answered, ceiling=ceiling, alert_aware=True):
+        # A fetch() response handler runs just after the request is counted as done
+        waits.settle(driver, site + ".handler", ceiling=0.3, alert_aware=True)
+
+
+def _submit_otp_login(driver, login_mobile, mobile, otp, site):
+    """Type the mobile, send the OTP (paced by the shared limiter), type and verify the OTP."""
+    # Enter mobile
+    login_mobile.clear()
+    login_mobile.send_keys(mobile)
+    logging.info("Mobile entered: %s", mobile)
+
+    # Send OTP with retry, paced by the shared per-mobile limiter
+    for attempt in range(3):
+        otp_limiter.acquire(mobile)
+        click_send_otp(driver, site + ".send_otp")
+        alert_text = _dismiss_alert(driver)
+        if alert_text and "error" in alert_text.lower():
+            logging.warning("OTP rate limited (attempt %d)", attempt + 1)
+            otp_limiter.penalize(mobile)  # the next acquire() waits for a free slot
+            continue
+        break
+
+    # Enter OTP
+    otp_input = WebDriverWait(driver, 15).until(
+        EC.element_to_be_clickable((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))
+    )
+    otp_input.clear()
+    otp_input.send_keys(otp)
+    logging.info("OTP entered")
+
+    # Verify OTP
+    safe_click(driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
+    waits.until(driver, site + ".verify_otp",
+                EC.invisibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH)),
+                ceiling=1, alert_aware=True)
+    _dismiss_alert(driver)
+    logging.info("Login completed")
+
+
 def click_book_now_and_login(driver, mobile, otp, timeout=10):
     """Click first Book Now button on results page. If login required, handle login flow.
 
     Returns True if Book Now was clicked, False if no results page / no Book Now button.
     """
-    import time as _time
-
     # Try to click Book Now — skip silently if not on results page
     try:
         wait = WebDriverWait(driver, timeout)
@@ -273,7 +555,12 @@ def click_book_now_and_login(driver, mobile, otp, timeout=10):
         scroll_into_view(driver, book_btn)
         book_btn.click()
         logging.info("Book Now clicked")
-        _time.sleep(1)
+        waits.until(
+            driver, "book_now.after_click",
+            lambda d: d.find_elements(By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH)
+            or d.find_elements(By.XPATH, locators.FIRST_NAME_XPATH),
+            ceiling=1, alert_aware=True,
+        )
     except TimeoutException:
         logging.info("No Book Now button found — not on results page, skipping")
         return False
@@ -285,43 +572,93 @@ def click_book_now_and_login(driver, mobile, otp, timeout=10):
         )
         logging.info("Login page detected — filling credentials")
 
-        # Enter mobile
-        login_mobile.clear()
-        login_mobile.send_keys(mobile)
-        logging.info("Mobile entered: %s", mobile)
-
-        # Send OTP with retry
-        for attempt in range(3):
-            safe_click(driver, By.XPATH, locators.LOGIN_SEND_OTP_BUTTON_XPATH)
-            _time.sleep(2)
-            alert_text = _dismiss_alert(driver)
-            if alert_text and "error" in alert_text.lower():
-                wait_sec = 15 * (attempt + 1)
-                logging.warning("OTP rate limited, waiting %ds...", wait_sec)
-                _time.sleep(wait_sec)
-                continue
-            break
+        _submit_otp_login(driver, login_mobile, mobile, otp, "book_now")
+    except TimeoutException:
+        logging.info("No login page — already logged in or direct booking")
 
-        # Enter OTP
-        otp_input = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))
-        )
-        otp_input.clear()
-        otp_input.send_keys(otp)
-        logging.info("OTP entered")
+    return True
 
-        # Verify OTP
-        safe_click(driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
-        _time.sleep(1)
-        _dismiss_alert(driver)
-        logging.info("Login completed")
 
-    except TimeoutException:
-        logging.info("No login page — already logged in or direct booking")
+def is_logged_in(driver):
+    return bool(driver.find_elements(By.XPATH, locators.LOGOUT_BUTTON_XPATH))
+
 
+def login_from_home(driver, mobile, otp, timeout=15):
+    """Log in through the home page navbar form. Returns True once the Logout link shows."""
+    open_site(driver)
+    if is_logged_in(driver):
+        return True
+    safe_click(driver, By.XPATH, locators.LOGIN_BUTTON_XPATH)
+    login_mobile = WebDriverWait(driver, timeout).until(
+        EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
+    )
+    _submit_otp_login(driver, login_mobile, mobile, otp, "home_login")
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, locators.LOGOUT_BUTTON_XPATH))
+        )
+    except TimeoutException:
+        return False
     return True
 
 
+# B2C_FAST_FORM=0 types every present field with send_keys
+FAST_FORM = os.environ.get("B2C_FAST_FORM", "1") != "0"
+
+
+def _type_into(driver, elem, text):
+    scroll_into_view(driver, elem)
+    try:
+        elem.clear()
+    except Exception:
+        pass
+    elem.send_keys(text)
+
+
+def _fill_form(driver, fields, timeout=15):
+    """Fill (label, xpath, value, needs_keys, required) fields.
+
+    Presence is checked in one query and the plain inputs are set in one
+    script call. Fields that need keystrokes, and any field whose value did
+    not stick, are typed with send_keys and read back. Absent optional
+    fields are skipped at no cost; an absent required field is waited for
+    up to `timeout` (TimeoutException if it never shows), and a required
+    field whose typed value still does not stick raises RuntimeError.
+    """
+    elements = find_present(driver, [field[1] for field in fields])
+    present = []
+    for field, el in zip(fields, elements):
+        label, xpath, _, _, required = field
+        if el is None and required:
+            logging.info("%s field not present yet — waiting for it", label)
+            el = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+        if el is None:
+            logging.info("%s field not present — skipping", label)
+        else:
+            present.append((field, el))
+
+    batched = [(field, el) for field, el in present if FAST_FORM and not field[3]]
+    typed = [(field, el) for field, el in present if not FAST_FORM or field[3]]
+
+    results = set_input_values(driver, [el for _, el in batched], [field[2] for field, _ in batched])
+    for (field, el), result in zip(batched, results):
+        if result == field[2]:
+            logging.info("%s entered: %s", field[0], field[2])
+        else:
+            logging.info("%s did not take the scripted value (got %r) — typing it", field[0], result)
+            typed.append((field, el))
+
+    for (label, _, value, _, required), el in typed:
+        _type_into(driver, el, value)
+        result = el.get_attribute("value")
+        if result == value:
+            logging.info("%s entered: %s", label, value)
+        elif required:
+            raise RuntimeError(f"{label} did not take the value {value!r} (got {result!r})")
+        else:
+            logging.warning("%s did not take the value %r (got %r)", label, value, result)
+
+
 def fill_traveller_details_and_pay(driver, first_name, last_name, mobile, email,
                                     pickup_location, pickup_address, flight_no=None, timeout=15):
     """Fill the Traveller Details form and click Pay.
@@ -329,58 +666,31 @@ def fill_traveller_details_and_pay(driver, first_name, last_name, mobile, email,
     Should be called after click_book_now_and_login() when the booking form is visible.
     Returns True if form was filled and Pay clicked, False if form not found.
     """
-    import time as _time
-
     try:
         wait = WebDriverWait(driver, timeout)
-        first_name_input = wait.until(
-            EC.element_to_be_clickable((By.XPATH, locators.FIRST_NAME_XPATH))
-        )
+        wait.until(EC.element_to_be_clickable((By.XPATH, locators.FIRST_NAME_XPATH)))
         logging.info("Traveller Details form detected — filling details")
     except TimeoutException:
         logging.info("No Traveller Details form found — skipping")
         return False
 
-    # First Name
-    first_name_input.clear()
-    first_name_input.send_keys(first_name)
-    logging.info("First Name entered: %s", first_name)
-
-    # Last Name
-    safe_type(driver, By.XPATH, locators.LAST_NAME_XPATH, last_name)
-    logging.info("Last Name entered: %s", last_name)
-
-    # Mobile Number
-    safe_type(driver, By.XPATH, locators.TRAVELLER_MOBILE_XPATH, mobile)
-    logging.info("Mobile entered: %s", mobile)
-
-    # Email ID
-    safe_type(driver, By.XPATH, locators.TRAVELLER_EMAIL_XPATH, email)
-    logging.info("Email entered: %s", email)
-
-    # Flight No (only on Pickup From Airport booking form)
+    # (label, xpath, value, needs real keystrokes, required). Pickup Location
+    # is a Places autocomplete input that only reacts to key events; it and
+    # Pickup Address are not on every booking form.
+    fields = [
+        ("First Name", locators.FIRST_NAME_XPATH, first_name, False, True),
+        ("Last Name", locators.LAST_NAME_XPATH, last_name, False, True),
+        ("Mobile", locators.TRAVELLER_MOBILE_XPATH, mobile, False, True),
+        ("Email", locators.TRAVELLER_EMAIL_XPATH, email, False, True),
+        ("Pickup Location", locators.TRAVELLER_PICKUP_LOCATION_XPATH, pickup_location, True, False),
+        ("Pickup Address", locators.TRAVELLER_PICKUP_ADDRESS_XPATH, pickup_address, False, False),
+    ]
     if flight_no:
-        try:
-            safe_type(driver, By.XPATH, locators.FLIGHT_NO_XPATH, flight_no, timeout=3)
-            logging.info("Flight No entered: %s", flight_no)
-        except Exception:
-            logging.info("Flight No field not present — skipping")
-
-    # Pickup Location (not present on all booking forms)
-    try:
-        safe_type(driver, By.XPATH, locators.TRAVELLER_PICKUP_LOCATION_XPATH, pickup_location, timeout=3)
-        logging.info("Pickup Location entered: %s", pickup_location)
-    except Exception:
-        logging.info("Pickup Location field not present — skipping")
-
-    # Pickup Address (not present on all booking forms)
-    try:
-        safe_type(driver, By.XPATH, locators.TRAVELLER_PICKUP_ADDRESS_XPATH, pickup_address, timeout=3)
-        logging.info("Pickup Address entered: %s", pickup_address)
-    except Exception:
-        logging.info("Pickup Address field not present — skipping")
+        # Only on the Pickup From Airport booking form
+        fields.insert(4, ("Flight No", locators.FLIGHT_NO_XPATH, flight_no, False, False))
+    _fill_form(driver, fields, timeout)
 
-    _time.sleep(0.5)
+    waits.settle(driver, "traveller_form.before_tnc", ceiling=0.5)
 
     # T&C checkbox
     try:
@@ -392,7 +702,7 @@ def fill_traveller_details_and_pay(driver, first_name, last_name, mobile, email,
     except Exception as e:
         logging.warning("T&C checkbox not found or click failed: %s", e)
 
-    _time.sleep(0.5)
+    waits.settle(driver, "traveller_form.before_pay", ceiling=0.5)
 
     # Click Pay button
     try:
@@ -402,7 +712,9 @@ def fill_traveller_details_and_pay(driver, first_name, last_name, mobile, email,
         scroll_into_view(driver, pay_btn)
         pay_btn.click()
         logging.info("Pay button clicked")
-        _time.sleep(1)
+        waits.until(driver, "traveller_form.after_pay",
+                    lambda d: "ccavenue" in d.current_url.lower() or "payment" in d.current_url.lower(),
+                    ceiling=1, alert_aware=True)
         _dismiss_alert(driver)
     except Exception as e:
         logging.warning("Pay button click failed: %s", e)
@@ -413,13 +725,107 @@ def fill_traveller_details_and_pay(driver, first_name, last_name, mobile, email,
             lambda d: "ccavenue" in d.current_url.lower() or "payment" in d.current_url.lower()
         )
         logging.info("Payment gateway loaded: %s", driver.current_url)
-        _time.sleep(1)
+        waits.settle(driver, "traveller_form.gateway_loaded", ceiling=1, network=True)
     except Exception:
         logging.info("Payment gateway page not detected (URL: %s)", driver.current_url)
 
     return True
 
 
+# ════════════════════════════════════════════════════════════════
+# Page read-back — every field of a summary in one script call
+# ════════════════════════════════════════════════════════════════
+
+ResultsSummary = namedtuple("ResultsSummary", ["location", "date", "time"])
+OrderSummary = namedtuple("OrderSummary", ["service_type", "pickup_city", "date_time"])
+
+_RESULTS_SUMMARY_XPATHS = ResultsSummary(
+    locators.RESULTS_LOCATION_XPATH, locators.RESULTS_DATE_XPATH, locators.RESULTS_TIME_XPATH,
+)
+_ORDER_SUMMARY_XPATHS = OrderSummary(
+    locators.ORDER_SUMMARY_SERVICE_TYPE_XPATH, locators.ORDER_SUMMARY_PICKUP_CITY_XPATH,
+    locators.ORDER_SUMMARY_DATE_TIME_XPATH,
+)
+
+# Rendered text (what WebElement.text returns) for each xpath, or null
+_EXTRACT_TEXTS_JS = """
+return arguments[0].map(function (xpath) {
+    var el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return el ? (el.innerText || el.textContent || '').trim() : null;
+});
+"""
+
+
+def extract_texts(driver, record_xpaths):
+    """Read every field of a namedtuple of xpaths in one round trip; absent fields are None."""
+    texts = driver.execute_script(_EXTRACT_TEXTS_JS, list(record_xpaths))
+    return type(record_xpaths)(*texts)
+
+
+def read_results_summary(driver):
+    return extract_texts(driver, _RESULTS_SUMMARY_XPATHS)
+
+
+def read_order_summary(driver):
+    return extract_texts(driver, _ORDER_SUMMARY_XPATHS)
+
+
+def results_mismatches(summary, expected_city, expected_date, expected_time):
+    """Compare a ResultsSummary with the search input. `expected_time` is in the site's display format.
+
+    Returns a list of mismatch messages (empty when everything matches).
+    """
+    problems = []
+    if summary.location is None:
+        problems.append("Location element not found")
+    elif expected_city.lower() not in summary.location.lower():
+        problems.append(f"Location mismatch: expected '{expected_city}' in '{summary.location}'")
+    if summary.date is None:
+        problems.append("Date element not found")
+    elif summary.date != expected_date:
+        problems.append(f"Date mismatch: expected '{expected_date}', got '{summary.date}'")
+    if summary.time is None:
+        problems.append("Time element not found")
+    elif summary.time != expected_time:
+        problems.append(f"Time mismatch: expected '{expected_time}', got '{summary.time}'")
+    return problems
+
+
+def order_summary_mismatches(summary, expected_city, expected_date, expected_time, expected_service_type=None):
+    """Compare an OrderSummary with the search input (date dd-mm-yyyy, time 12h).
+
+    The site shows date and time together, e.g. "Wednesday, Mar 18, 2026, 2:00 PM".
+    """
+    problems = []
+    if expected_service_type:
+        if summary.service_type is None:
+            problems.append("Service Type element not found")
+        elif expected_service_type.lower() not in summary.service_type.lower():
+            problems.append(f"Service Type mismatch: expected '{expected_service_type}' in '{summary.service_type}'")
+
+    if summary.pickup_city is None:
+        problems.append("Pickup City element not found")
+    elif expected_city.lower() not in summary.pickup_city.lower():
+        problems.append(f"Pickup City mismatch: expected '{expected_city}' in '{summary.pickup_city}'")
+
+    if summary.date_time is None:
+        problems.append("Date & Time element not found")
+        return problems
+    actual_dt = summary.date_time
+    expected_date_obj = datetime.strptime(expected_date, "%d-%m-%Y")
+    month_abbr = expected_date_obj.strftime("%b")
+    day_num = str(expected_date_obj.day)
+    year_str = str(expected_date_obj.year)
+    if not (month_abbr in actual_dt and day_num in actual_dt and year_str in actual_dt):
+        problems.append(f"Date mismatch: expected {month_abbr} {day_num}, {year_str} in '{actual_dt}'")
+
+    # Windows has no %-I, so strip the leading zero by hand
+    time_12h = datetime.strptime(expected_time.strip(), "%I:%M %p").strftime("%I:%M %p").lstrip("0")
+    if time_12h.lower().replace(" ", "") not in actual_dt.lower().replace(" ", ""):
+        problems.append(f"Time mismatch: expected '{time_12h}' in '{actual_dt}'")
+    return problems
+
+
 def validate_order_summary(driver, expected_city, expected_date, expected_time,
                            expected_service_type=None, timeout=10):
     """Validate Order Summary on booking page matches search values.
@@ -430,81 +836,28 @@ def validate_order_summary(driver, expected_city, expected_date, expected_time,
         expected_time: Time in 12h format (e.g. "10:30 AM")
         expected_service_type: Optional partial text match for Service type
     Returns:
-        True if validation passed, False if Order Summary not found.
+        True if the Order Summary was found (mismatches are logged together), False if not found.
     """
-    import time as _time
-
     wait = WebDriverWait(driver, timeout)
     logging.info("========== VALIDATING ORDER SUMMARY ==========")
 
     # Check if we're on the booking page (look for Order Summary section)
     try:
-        service_el = wait.until(
-            EC.visibility_of_element_located((By.XPATH, locators.ORDER_SUMMARY_SERVICE_TYPE_XPATH))
-        )
+        wait.until(EC.visibility_of_element_located((By.XPATH, locators.ORDER_SUMMARY_SERVICE_TYPE_XPATH)))
         logging.info("Order Summary page detected")
     except TimeoutException:
         logging.warning("Order Summary not found — may not be on booking page")
         return False
 
-    # --- Service Type ---
-    if expected_service_type:
-        actual_service = service_el.text.strip()
-        logging.info("  Service Type — Expected: '%s' | Actual: '%s'", expected_service_type, actual_service)
-        if expected_service_type.lower() not in actual_service.lower():
-            logging.error("  SERVICE TYPE MISMATCH")
-        else:
-            logging.info("  SERVICE TYPE MATCHED")
-
-    # --- Pickup City ---
-    try:
-        city_el = driver.find_element(By.XPATH, locators.ORDER_SUMMARY_PICKUP_CITY_XPATH)
-        actual_city = city_el.text.strip()
-        logging.info("  Pickup City — Expected: '%s' | Actual: '%s'", expected_city, actual_city)
-        if expected_city.lower() not in actual_city.lower():
-            logging.error("  PICKUP CITY MISMATCH: expected '%s' in '%s'", expected_city, actual_city)
-        else:
-            logging.info("  PICKUP CITY MATCHED")
-    except NoSuchElementException:
-        logging.warning("  Pickup City element not found")
-
-    # --- Date & Time ---
-    try:
-        dt_el = driver.find_element(By.XPATH, locators.ORDER_SUMMARY_DATE_TIME_XPATH)
-        actual_dt = dt_el.text.strip()
-        logging.info("  Date & Time — Actual: '%s'", actual_dt)
-
-        # Parse expected date (dd-mm-yyyy) to match site format (e.g. "Wednesday, Mar 18, 2026, 2:00 PM")
-        from datetime import datetime as _dt
-        parts = expected_date.split("-")
-        expected_date_obj = _dt(int(parts[2]), int(parts[1]), int(parts[0]))
-        # Check date parts in the displayed string
-        month_abbr = expected_date_obj.strftime("%b")  # "May", "Mar", etc.
-        day_num = str(expected_date_obj.day)
-        year_str = str(expected_date_obj.year)
-
-        date_ok = (month_abbr in actual_dt and day_num in actual_dt and year_str in actual_dt)
-        logging.info("  Date check — month='%s', day='%s', year='%s' in '%s': %s",
-                     month_abbr, day_num, year_str, actual_dt, date_ok)
-        if not date_ok:
-            logging.error("  DATE MISMATCH in Order Summary")
-        else:
-            logging.info("  DATE MATCHED")
-
-        # Check time — convert "10:30 AM" to parts and check in string
-        time_clean = expected_time.strip()
-        # Site shows "2:00 PM" style — parse and compare
-        t = _dt.strptime(time_clean, "%I:%M %p")
-        time_no_pad = t.strftime("%-I:%M %p") if hasattr(t, 'strftime') else time_clean
-        # Windows doesn't support %-I, use manual strip
-        time_12h = t.strftime("%I:%M %p").lstrip("0")
-        logging.info("  Time check — looking for '%s' in '%s'", time_12h, actual_dt)
-        if time_12h.lower().replace(" ", "") in actual_dt.lower().replace(" ", ""):
-            logging.info("  TIME MATCHED")
-        else:
-            logging.error("  TIME MISMATCH: expected '%s' in '%s'", time_12h, actual_dt)
-    except NoSuchElementException:
-        logging.warning("  Date & Time element not found")
+    summary = read_order_summary(driver)
+    logging.info("  Service Type: '%s' | Pickup City: '%s' | Date & Time: '%s'",
+                 summary.service_type, summary.pickup_city, summary.date_time)
+    problems = order_summary_mismatches(summary, expected_city, expected_date, expected_time,
+                                        expected_service_type)
+    if problems:
+        logging.error("  ORDER SUMMARY MISMATCHES (%d):\n    %s", len(problems), "\n    ".join(problems))
+    else:
+        logging.info("  SERVICE TYPE, PICKUP CITY, DATE AND TIME MATCHED")
 
     logging.info("========== ORDER SUMMARY VALIDATION COMPLETE ==========")
     return True
@@ -512,10 +865,9 @@ def validate_order_summary(driver, expected_city, expected_date, expected_time,
 
 def navigate_back_to_site(driver):
     """Navigate back to original site after payment gateway. Keeps session valid for next test."""
-    import time as _time
     try:
         driver.get(locators.URL)
-        _time.sleep(1)
+        waits.network_idle(driver, "navigate_back_to_site", ceiling=1)
         logging.info("Navigated back to %s", locators.URL)
     except Exception:
         logging.warning("Could not navigate back to original site")
@@ -0,0 +1,102 @@
+# otp_limiter.py
+# Cross-process token bucket for OTP sends, one bucket per mobile number.
+#
+# Every worker asks acquire(mobile) before clicking Send OTP. A caller that
+# finds the bucket empty reserves the next free slot and sleeps until then,
+# so concurrent workers are spaced out instead of all hitting the site's
+# rate limit and backing off blindly. If the site still reports a rate limit,
+# penalize() empties the bucket for everyone.
+#
+# The site does not publish its OTP limit, so nothing is paced up front by
+# default: a mobile's bucket only exists once the site has rate-limited it,
+# and then allows one send per B2C_OTP_INTERVAL seconds (default 15, the
+# backoff step the retry loops used before this module) until
+# B2C_OTP_PACE_WINDOW seconds pass without another rate limit. Where the
+# limit is known, B2C_OTP_BURST (sends back to back) and B2C_OTP_INTERVAL
+# (seconds per extra send) pace every send from the start.
+
+import os
+import logging
+import threading
+import time as _time
+
+import interprocess
+
+# Sends allowed back to back (unset: only pace a mobile after the site rate-limited it)
+BURST = float(os.environ["B2C_OTP_BURST"]) if os.environ.get("B2C_OTP_BURST") else None
+# Seconds for one more send to become available
+INTERVAL_SECONDS = float(os.environ.get("B2C_OTP_INTERVAL", "15"))
+# Without B2C_OTP_BURST, how long a rate limit keeps the mobile paced
+PACE_WINDOW_SECONDS = float(os.environ.get("B2C_OTP_PACE_WINDOW", "600"))
+
+STATE_FILE = "otp_buckets.json"
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _capacity():
+    return BURST if BURST is not None else 1.0
+
+
+def _refill(bucket, now):
+    elapsed = max(0.0, now - bucket["updated"])
+    bucket["tokens"] = min(_capacity(), bucket["tokens"] + elapsed / INTERVAL_SECONDS)
+    bucket["updated"] = now
+
+
+def acquire(mobile):
+    """Block until `mobile` may be sent another OTP. Returns the seconds waited."""
+    if not mobile:
+        return 0.0
+    wait = 0.0
+    with interprocess.locked_json(STATE_FILE) as buckets:
+        now = _time.time()
+        bucket = buckets.get(mobile)
+        if bucket is not None and BURST is None and now - bucket.get("penalized", 0.0) > PACE_WINDOW_SECONDS:
+            del buckets[mobile]  # no rate limit for a while: stop pacing
+            bucket = None
+        if bucket is None and BURST is not None:
+            bucket = buckets[mobile] = {"tokens": BURST, "updated": now, "penalized": 0.0}
+        if bucket is not None:
+            _refill(bucket, now)
+            bucket["tokens"] -= 1  # below zero = slots already promised to waiting callers
+            wait = max(0.0, -bucket["tokens"] * INTERVAL_SECONDS)
+
+    if wait:
+        logging.info("OTP limiter: waiting %.1fs before sending an OTP to %s", wait, mobile)
+        _time.sleep(wait)
+    with _stats_lock:
+        sends, waited = _stats.get(mobile, (0, 0.0))
+        _stats[mobile] = (sends + 1, waited + wait)
+    return wait
+
+
+def penalize(mobile):
+    """The site rate-limited `mobile` anyway: empty its bucket so every worker backs off."""
+    if not mobile:
+        return
+    with interprocess.locked_json(STATE_FILE) as buckets:
+        now = _time.time()
+        bucket = buckets.setdefault(mobile, {"tokens": 0.0, "updated": now})
+        _refill(bucket, now)
+        bucket["tokens"] = min(bucket["tokens"], 0.0)
+        bucket["penalized"] = now
+    logging.warning("OTP limiter: site rate-limited %s — bucket emptied for all workers", mobile)
+
+
+def report():
+    """Per mobile in this process: (mobile, sends, seconds waited on the limiter)."""
+    with _stats_lock:
+        return sorted((m, s, w) for m, (s, w) in _stats.items())
+
+
+def log_report(title, reset=True):
+    rows = report()
+    if not rows:
+        return
+    for mobile, sends, waited in rows:
+        logging.info("OTP limiter for %s: %s — %d sends, waited %.1fs", title, mobile, sends, waited)
+    if reset:
+        with _stats_lock:
+            _stats.clear()
@@ -0,0 +1,150 @@
+# resource_policy.py
+# Per-suite resource blocking through CDP Network.setBlockedURLs, plus an
+# opt-in (B2C_RESOURCE_REPORT=1) per-test report of what was loaded and what
+# was blocked (read from chromedriver's performance log).
+#
+# Bytes saved are estimated from resource_sizes.json: the size of every URL
+# seen loading un-blocked in earlier runs (run once with B2C_RESOURCE_POLICY=none
+# and B2C_RESOURCE_REPORT=1 to build the baseline).
+
+import os
+import json
+import logging
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+IMAGES = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"]
+FONTS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+MEDIA = ["*.mp4", "*.webm", "*.mp3"]
+TRACKERS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*",
+]
+MAPS = ["*maps.googleapis.com*", "*maps.gstatic.com*"]
+
+PRESETS = {
+    "none": [],
+    # Login and other form-only flows: nothing but the app's own HTML/JS/CSS/XHR
+    "forms-only": IMAGES + FONTS + MEDIA + TRACKERS + MAPS,
+    # Flows that type into Google Places Autocomplete inputs
+    "keep-places": IMAGES + FONTS + MEDIA + TRACKERS,
+}
+
+# Force one preset for every suite (e.g. "none" to build the size baseline)
+POLICY_OVERRIDE = os.environ.get("B2C_RESOURCE_POLICY")
+# B2C_RESOURCE_REPORT=1 turns on the performance log and the per-test report
+# (off by default: the log and its per-test drain cost time on every session)
+REPORT = os.environ.get("B2C_RESOURCE_REPORT", "0") == "1"
+
+SIZES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resource_sizes.json")
+
+ResourceUsage = namedtuple("ResourceUsage", ["requests", "bytes", "blocked_urls", "loaded_sizes"])
+
+_sizes = None
+
+
+def enable_reporting(options):
+    """Turn on chromedriver's network performance log in ChromeOptions (if reporting is on)."""
+    if not REPORT:
+        return
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def apply(driver, name):
+    """Block the preset's URL patterns in this browser. Returns the preset name in effect."""
+    name = POLICY_OVERRIDE or name or "none"
+    if name not in PRESETS:
+        raise ValueError(f"Unknown resource policy {name!r} (known: {', '.join(PRESETS)})")
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": PRESETS[name]})
+    logging.info("Resource policy '%s' applied (%d blocked patterns)", name, len(PRESETS[name]))
+    return name
+
+
+def _url_key(url):
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def drain(driver):
+    """Read and clear the performance log. Returns a ResourceUsage, or None if unavailable."""
+    if not REPORT:
+        return None
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+
+    urls, sizes, blocked = {}, {}, []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+        elif method == "Network.loadingFinished":
+            sizes[params["requestId"]] = params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked.append(urls.get(params["requestId"], "?"))
+
+    loaded = {}
+    for request_id, size in sizes.items():
+        if request_id in urls:
+            loaded[_url_key(urls[request_id])] = size
+    return ResourceUsage(len(sizes), int(sum(sizes.values())), blocked, loaded)
+
+
+def _load_sizes():
+    global _sizes
+    if _sizes is None:
+        try:
+            with open(SIZES_FILE) as f:
+                _sizes = json.load(f)
+        except (OSError, ValueError):
+            _sizes = {}
+    return _sizes
+
+
+def remember_sizes(usage):
+    """Add the sizes of URLs loaded un-blocked to the baseline."""
+    sizes = _load_sizes()
+    for url, size in usage.loaded_sizes.items():
+        if size:
+            sizes[url] = size
+
+
+def save_sizes():
+    if not _sizes:
+        return
+    tmp = SIZES_FILE + f".{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(_sizes, f, indent=0, sort_keys=True)
+        os.replace(tmp, SIZES_FILE)
+    except OSError as e:
+        logging.warning("Could not save resource size baseline: %s", e)
+
+
+def estimated_saving(usage):
+    """(bytes saved, blocked URLs with no baseline size) for a test's blocked requests."""
+    sizes = _load_sizes()
+    saved, unknown = 0, 0
+    for url in usage.blocked_urls:
+        size = sizes.get(_url_key(url))
+        if size is None:
+            unknown += 1
+        else:
+            saved += size
+    return saved, unknown
+
+
+def describe(usage):
+    saved, unknown = estimated_saving(usage)
+    line = "%d requests / %.1f KB loaded, %d blocked (~%.1f KB saved vs. baseline" % (
+        usage.requests, usage.bytes / 1024, len(usage.blocked_urls), saved / 1024)
+    if unknown:
+        line += f", {unknown} blocked URLs without a baseline size"
+    return line + ")"
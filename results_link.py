@@ -0,0 +1,101 @@
+# results_link.py
+# Deep links to results pages, for tests that need a results page but are
+# not testing the search form (e.g. Book Now login).
+#
+# The first time a search is run through the form, capture() saves the URL
+# it landed on plus the page's localStorage/sessionStorage, keyed by backend
+# and search parameters. open() later clears the session state and loads
+# that URL once, with the storage seeded before the site's scripts run, then
+# checks the results really rendered. A page that does not render in time
+# only sends that test through the form (it may just be a slow load); a link
+# whose page is shown to be wrong (the caller finds the summary does not
+# match, mark_failed()) is remembered as unusable for a while, so the form
+# is used without trying it again on every test.
+#
+# B2C_RESULTS_NAV=ui always uses the search form.
+
+import os
+import logging
+import time as _time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+import accounts
+import interprocess
+import locators
+import state_reset
+import waits
+
+MODE = os.environ.get("B2C_RESULTS_NAV", "deep")
+# How long after a failure capture() leaves the link alone before saving a new one
+RETRY_FAILED_SECONDS = float(os.environ.get("B2C_RESULTS_LINK_RETRY", "86400"))
+# Same as the suites' results page wait
+READY_SECONDS = 20
+
+STATE_FILE = "results_links.json"
+
+
+def enabled():
+    return MODE != "ui"
+
+
+def _key(params):
+    return "|".join([accounts.BACKEND] + [str(p) for p in params])
+
+
+def capture(driver, params):
+    """Save the current results page (URL and storage) as the deep link for `params`."""
+    if not enabled():
+        return
+    try:
+        url = driver.current_url
+        local, session = state_reset.read_storage(driver)
+    except Exception as e:
+        logging.warning("Could not capture a results link: %s", e)
+        return
+    with interprocess.locked_json(STATE_FILE) as links:
+        entry = links.get(_key(params), {})
+        if entry.get("failed_at") and _time.time() - entry["failed_at"] < RETRY_FAILED_SECONDS:
+            return
+        links[_key(params)] = {"url": url, "local": local, "session": session, "created": _time.time()}
+    logging.info("Saved results link %s", url)
+
+
+def mark_failed(params):
+    """Stop using the link for `params` (e.g. it restored the wrong search)."""
+    with interprocess.locked_json(STATE_FILE) as links:
+        entry = links.setdefault(_key(params), {})
+        entry["failed_at"] = _time.time()
+
+
+def open_results(driver, params, ready_xpath=locators.RESULTS_PAGE_UNIQUE_XPATH, ceiling=READY_SECONDS):
+    """Open the results page for `params` from its saved link, logged out and with fresh state.
+
+    Returns True when `ready_xpath` showed up; False when there is no usable
+    link or the page did not load in time (the caller then runs the search
+    form and capture()s the result). A slow or failed load does not mark the
+    link failed: only the caller can tell the page is wrong (mark_failed()).
+    """
+    if not enabled():
+        return False
+    with interprocess.locked_json(STATE_FILE) as links:
+        entry = links.get(_key(params))
+    if not entry or "url" not in entry or entry.get("failed_at"):
+        return False  # a failed link stays unused until capture() replaces it
+
+    start = _time.monotonic()
+    try:
+        state_reset.clear_state(driver)
+        state_reset.load_with_storage(driver, entry["url"], entry["local"], entry["session"])
+    except Exception as e:
+        logging.warning("Results link failed to load (%s) — using the search form this time", e)
+        return False
+    if not waits.until(driver, "results_link.ready",
+                       EC.presence_of_element_located((By.XPATH, ready_xpath)),
+                       ceiling=ceiling, alert_aware=True):
+        logging.warning("Results link %s did not show the results page within %ss — using the search form this time",
+                        entry["url"], ceiling)
+        return False
+    logging.info("Results page opened from saved link in %.2fs", _time.monotonic() - start)
+    return True
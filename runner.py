@@ -0,0 +1,161 @@
+# runner.py
+# Parallel execution helpers used by main.py: run a group of tests in a worker
+# process, collect a picklable summary, and merge summaries into one report
+# that matches unittest.TextTestRunner's output.
+
+import io
+import sys
+import time as _time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import browser_pool
+import scenario_tree
+
+SEPARATOR1 = "=" * 70
+SEPARATOR2 = "-" * 70
+
+
+class _TimedTextTestResult(unittest.TextTestResult):
+    """TextTestResult that also records how long each test and each class setup took."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.test_durations = {}
+        self.class_overheads = {}
+        self._last_stop = _time.perf_counter()
+        self._last_class = None
+        self._started = None
+
+    def startTest(self, test):
+        now = _time.perf_counter()
+        cls = type(test)
+        if cls is not self._last_class:
+            # Time since the previous test is tearDownClass + setUpClass — charge it to the new class
+            class_id = f"{cls.__module__}.{cls.__qualname__}"
+            self.class_overheads[class_id] = self.class_overheads.get(class_id, 0.0) + now - self._last_stop
+            self._last_class = cls
+        self._started = now
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self._last_stop = _time.perf_counter()
+        if self._started is not None:
+            self.test_durations[test.id()] = round(self._last_stop - self._started, 3)
+            self._started = None
+
+
+def run_tests_in_worker(test_names, stream=None):
+    """Load and run the given dotted test/class names in this process.
+
+    Returns a plain dict so it can travel back through the process pool. When
+    `stream` is given the per-test lines are written there live instead of
+    being buffered into the summary.
+    """
+    test_names = scenario_tree.order(test_names)  # tests sharing form steps back to back
+    suite = unittest.TestLoader().loadTestsFromNames(test_names)
+    browser_pool.get_pool().expect_leases(len(_test_classes(suite)))  # one lease per class
+    return run_suite(suite, test_names, stream)
+
+
+def _test_classes(suite):
+    classes = set()
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            classes |= _test_classes(item)
+        else:
+            classes.add(type(item))
+    return classes
+
+
+def run_suite(suite, test_names, stream=None):
+    """Run an already-built suite and summarize it like run_tests_in_worker()."""
+    buffer = io.StringIO() if stream is None else None
+    result = _TimedTextTestResult(unittest.runner._WritelnDecorator(stream or buffer), True, 2)
+    start = _time.perf_counter()
+    result.startTestRun()
+    try:
+        suite(result)
+    finally:
+        result.stopTestRun()
+
+    return {
+        "names": list(test_names),
+        "output": buffer.getvalue() if buffer else "",
+        "tests_run": result.testsRun,
+        "failures": [(result.getDescription(t), tb) for t, tb in result.failures],
+        "errors": [(result.getDescription(t), tb) for t, tb in result.errors],
+        "skipped": len(result.skipped),
+        "expected_failures": len(result.expectedFailures),
+        "unexpected_successes": [result.getDescription(t) for t in result.unexpectedSuccesses],
+        "duration": _time.perf_counter() - start,
+        "test_durations": result.test_durations,
+        "class_overheads": result.class_overheads,
+    }
+
+
+def run_parallel(groups, workers):
+    """Run each group of test names in its own worker process.
+
+    Summaries are returned in the same order as `groups`, regardless of
+    which worker finished first, so the merged report is deterministic.
+    """
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(groups)))) as pool:
+        futures = [pool.submit(run_tests_in_worker, group) for group in groups]
+        return [f.result() for f in futures]
+
+
+def print_report(summaries, elapsed, stream=None):
+    """Print merged worker summaries in TextTestRunner's format. Returns True if all passed."""
+    stream = stream or sys.stderr
+
+    for summary in summaries:
+        stream.write(summary["output"])
+    stream.write("\n")
+    stream.flush()
+
+    errors = [e for s in summaries for e in s["errors"]]
+    failures = [f for s in summaries for f in s["failures"]]
+    unexpected = [u for s in summaries for u in s["unexpected_successes"]]
+    for flavour, entries in (("ERROR", errors), ("FAIL", failures)):
+        for description, tb in entries:
+            stream.write(SEPARATOR1 + "\n")
+            stream.write("%s: %s\n" % (flavour, description))
+            stream.write(SEPARATOR2 + "\n")
+            stream.write("%s\n" % tb)
+    if unexpected:
+        stream.write(SEPARATOR1 + "\n")
+        for description in unexpected:
+            stream.write("UNEXPECTED SUCCESS: %s\n" % description)
+
+    run = sum(s["tests_run"] for s in summaries)
+    skipped = sum(s["skipped"] for s in summaries)
+    expected_failures = sum(s["expected_failures"] for s in summaries)
+
+    stream.write(SEPARATOR2 + "\n")
+    stream.write("Ran %d test%s in %.3fs\n" % (run, run != 1 and "s" or "", elapsed))
+    stream.write("\n")
+
+    infos = []
+    success = not errors and not failures and not unexpected
+    if not success:
+        stream.write("FAILED")
+        if failures:
+            infos.append("failures=%d" % len(failures))
+        if errors:
+            infos.append("errors=%d" % len(errors))
+    else:
+        stream.write("OK")
+    if skipped:
+        infos.append("skipped=%d" % skipped)
+    if expected_failures:
+        infos.append("expected failures=%d" % expected_failures)
+    if unexpected:
+        infos.append("unexpected successes=%d" % len(unexpected))
+    if infos:
+        stream.write(" (%s)\n" % (", ".join(infos),))
+    else:
+        stream.write("\n")
+    stream.flush()
+    return success
@@ -0,0 +1,155 @@
+# scenario_tree.py
+# Share the common prefix of form steps between tests.
+#
+# Service tests fill the same search form with step lists such as
+#   open -> tab -> direction -> city -> date -> time
+# and usually only differ near the end (time, payment or not). Each test's
+# steps are recorded in a shared state file; the next run orders the tests
+# of a class depth-first through the trie of those step lists, so tests with
+# the longest common prefix run back to back.
+#
+# Between two such tests the browser page is the checkpoint. When the next
+# test starts, its steps are compared with the ones the page was left in; if
+# the browser is still on the form page (no history navigation: a page
+# restored with back() can show old input values over stale app state) and
+# its field values, hidden ones included, are exactly as recorded, only the
+# steps after the shared prefix are run. Any doubt means a full run from the first step: a later
+# step with an empty value (it would leave the field as it was), or a later
+# step that fails to write its field (see ServiceBaseTestCase._fill_form_steps).
+#
+# Off by default; B2C_SCENARIO_REUSE=1 turns on the reuse and the ordering.
+
+import os
+import logging
+from collections import namedtuple
+
+import interprocess
+import timings
+
+ENABLED = os.environ.get("B2C_SCENARIO_REUSE", "0") == "1"
+# Fewer shared steps than this are not worth a checkpoint (open + tab are cheap)
+MIN_SHARED_STEPS = 3
+
+STATE_FILE = "scenarios.json"
+
+Checkpoint = namedtuple("Checkpoint", ["steps", "url", "values"])
+
+# Values of the visible form controls and of the hidden inputs (where the app
+# keeps e.g. the selected place's id and lat/lng), keyed by name/id/placeholder
+# and position
+_FORM_VALUES_JS = """
+var out = {};
+document.querySelectorAll('input, select, textarea').forEach(function (el, i) {
+    if (el.type === 'password' || (el.type !== 'hidden' && !el.offsetParent)) { return; }
+    var key = (el.name || el.id || el.placeholder || el.tagName) + '#' + i;
+    out[key] = (el.type === 'checkbox' || el.type === 'radio') ? String(el.checked) : el.value;
+});
+return out;
+"""
+
+
+def normalize(steps):
+    """[(name, value), ...] -> [[name, value], ...] with JSON-safe values, for comparing and storing."""
+    return [[str(name), value if isinstance(value, (bool, type(None))) else str(value)] for name, value in steps]
+
+
+def shared_prefix(a, b):
+    n = 0
+    for x, y in zip(normalize(a), normalize(b)):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class ScenarioTree:
+    """Trie of step lists; each node remembers the tests whose steps end there."""
+
+    def __init__(self):
+        self.children = {}
+        self.tests = []
+
+    def add(self, test_id, steps):
+        node = self
+        for name, value in normalize(steps):
+            node = node.children.setdefault((name, str(value)), ScenarioTree())
+        node.tests.append(test_id)
+
+    def depth_first(self):
+        """Test ids in depth-first order; siblings keep the order they were added in."""
+        yield from self.tests
+        for child in self.children.values():
+            yield from child.depth_first()
+
+
+def record(test_id, steps):
+    """Remember `test_id`'s form steps for ordering the next run."""
+    with interprocess.locked_json(STATE_FILE) as scenarios:
+        scenarios[test_id] = normalize(steps)
+
+
+def order(test_ids):
+    """Reorder each run of consecutive same-class test ids depth-first by their recorded steps.
+
+    Tests without recorded steps (and non-test names) keep their place
+    relative to each other, after the ordered ones of their class.
+    """
+    if not ENABLED:
+        return list(test_ids)
+    with interprocess.locked_json(STATE_FILE) as scenarios:
+        known = dict(scenarios)
+    ordered, group = [], []
+
+    def flush():
+        tree = ScenarioTree()
+        for test_id in group:
+            if test_id in known:
+                tree.add(test_id, known[test_id])
+        ordered.extend(tree.depth_first())
+        ordered.extend(t for t in group if t not in known)
+        group.clear()
+
+    for test_id in test_ids:
+        if group and timings.class_of(group[-1]) != timings.class_of(test_id):
+            flush()
+        group.append(test_id)
+    flush()
+    return ordered
+
+
+def take_checkpoint(driver, steps):
+    """The form page as left after running `steps`, for resume()."""
+    try:
+        return Checkpoint(normalize(steps), driver.current_url, driver.execute_script(_FORM_VALUES_JS))
+    except Exception:
+        return None
+
+
+def _page_matches(driver, checkpoint):
+    try:
+        return (driver.current_url == checkpoint.url
+                and driver.execute_script(_FORM_VALUES_JS) == checkpoint.values)
+    except Exception:
+        return False
+
+
+def resume(driver, checkpoint, steps):
+    """How many leading `steps` the page already holds (0 = run them all).
+
+    Only the page the previous test is still on counts: once the search has
+    left the form page, every step runs again.
+    """
+    if not ENABLED or checkpoint is None:
+        return 0
+    shared = shared_prefix(checkpoint.steps, steps)
+    if shared < MIN_SHARED_STEPS:
+        return 0
+    if any(value in ("", None) for _, value in steps[shared:]):
+        # An empty value skips its step, which would keep the checkpoint's value in that field
+        return 0
+    if not _page_matches(driver, checkpoint):
+        logging.info("Scenario checkpoint: not on the same form page — running all %d steps", len(steps))
+        return 0
+    logging.info("Scenario checkpoint: reusing %d of %d form steps (%s)",
+                 shared, len(steps), " -> ".join(name for name, _ in normalize(steps)[:shared]))
+    return shared
@@ -0,0 +1,160 @@
+# screenshots.py
+# Background screenshot writer. The test thread captures once and hands the
+# PNG bytes to a writer thread through a bounded queue, so disk writes never
+# block the next test step. flush() waits until everything queued is on disk.
+#
+# With B2C_SCREENSHOT_MODE=failure, step captures are kept in a small
+# in-memory ring instead and only written out when a test fails.
+
+import io
+import os
+import queue
+import atexit
+import logging
+import threading
+from collections import deque
+
+# Pending writes before submit() blocks the test thread (back-pressure)
+QUEUE_SIZE = int(os.environ.get("B2C_SCREENSHOT_QUEUE", "32"))
+
+# "always" writes every step; "failure" keeps the last RING_SIZE steps in memory
+MODE = os.environ.get("B2C_SCREENSHOT_MODE", "always")
+RING_SIZE = int(os.environ.get("B2C_SCREENSHOT_RING", "5"))
+# Scale factor for captures held in the ring (e.g. 0.5); 1 keeps them as captured
+RING_SCALE = float(os.environ.get("B2C_SCREENSHOT_SCALE", "1"))
+
+
+class ScreenshotWriter:
+    """Writes (path, png_bytes) jobs on a daemon thread."""
+
+    def __init__(self, maxsize=QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, data):
+        self._queue.put((path, data))
+
+    def flush(self):
+        """Block until every submitted screenshot has been written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            path, data = self._queue.get()
+            try:
+                with open(path, "wb") as f:
+                    f.write(data)
+            except Exception as e:
+                logging.error("Failed to write screenshot %s: %s", path, e)
+            finally:
+                self._queue.task_done()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Process-wide writer, started on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ScreenshotWriter()
+            atexit.register(_writer.flush)
+        return _writer
+
+
+def failure_only():
+    return MODE == "failure"
+
+
+def downscale(png, scale):
+    """Return the PNG resized by `scale` (PIL is already a suite dependency)."""
+    from PIL import Image
+    with Image.open(io.BytesIO(png)) as img:
+        size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        out = io.BytesIO()
+        img.resize(size).save(out, format="PNG", optimize=False)
+    return out.getvalue()
+
+
+class StepRing:
+    """The last `size` step captures of one test, kept in memory."""
+
+    def __init__(self, size=RING_SIZE, scale=RING_SCALE):
+        self.scale = scale
+        self._steps = deque(maxlen=size)
+
+    def add(self, label, step_name, png):
+        if self.scale != 1:
+            try:
+                png = downscale(png, self.scale)
+            except Exception as e:
+                logging.warning("Could not downscale screenshot, keeping it full size: %s", e)
+        self._steps.append((label, step_name, png))
+
+    def drain(self):
+        """Return the buffered (label, step_name, png) steps, oldest first, and empty the ring."""
+        steps = list(self._steps)
+        self._steps.clear()
+        return steps
+
+    def __len__(self):
+        return len(self._steps)
+
+
+def capture(driver):
+    """One capture of the current page as PNG bytes."""
+    return driver.get_screenshot_as_png()
+
+
+# Draws a stand-in for a native JS alert (which screenshots cannot show) on
+# top of the page, styled like Chrome's dialog.
+_ALERT_OVERLAY_JS = """
+var box = document.createElement('div');
+box.id = '__b2c_alert_overlay';
+box.style.cssText = 'position:fixed;top:12px;left:50%;transform:translateX(-50%);z-index:2147483647;'
+    + 'min-width:420px;max-width:560px;padding:20px 24px;background:#fff;color:#202124;border-radius:8px;'
+    + 'box-shadow:0 4px 16px rgba(0,0,0,.35);font:14px/1.4 Arial,sans-serif;';
+var title = document.createElement('div');
+title.style.cssText = 'font-weight:bold;margin-bottom:12px;';
+title.textContent = location.host + ' says';
+var body = document.createElement('div');
+body.style.cssText = 'white-space:pre-wrap;word-break:break-word;';
+body.textContent = arguments[0];
+var ok = document.createElement('div');
+ok.style.cssText = 'margin-top:16px;text-align:right;';
+ok.innerHTML = '<span style="display:inline-block;padding:6px 18px;border-radius:4px;background:#1a73e8;color:#fff;">OK</span>';
+box.appendChild(title); box.appendChild(body); box.appendChild(ok);
+document.documentElement.appendChild(box);
+"""
+
+_REMOVE_ALERT_OVERLAY_JS = """
+var box = document.getElementById('__b2c_alert_overlay');
+if (box) { box.remove(); }
+"""
+
+
+def capture_alert(driver, alert_text):
+    """Capture the page with an HTML replica of an already-accepted alert drawn on top.
+
+    Browser-side only, so it works headless and without a desktop display.
+    """
+    driver.execute_script(_ALERT_OVERLAY_JS, alert_text)
+    try:
+        return capture(driver)
+    finally:
+        try:
+            driver.execute_script(_REMOVE_ALERT_OVERLAY_JS)
+        except Exception:
+            pass
+
+
+def save_async(path, data):
+    get_writer().submit(path, data)
+
+
+def flush():
+    if _writer is not None:
+        _writer.flush()
@@ -0,0 +1,103 @@
+# session_cache.py
+# Logged-in session snapshots, so flows that only need to *be* logged in
+# (Book Now -> payment) skip the OTP login.
+#
+# The first time an account is needed it logs in through the home page form;
+# its cookies plus localStorage/sessionStorage are then saved in a shared
+# state file (keyed by backend and mobile). Later sessions, in any worker,
+# get the cookies through CDP and the storage through a one-shot
+# document-start script, so a single page load comes up logged in. If the
+# site no longer shows the Logout link, the snapshot has expired: it is
+# dropped and the account logs in again.
+#
+# The login UI suites never use this — they always run the real flow.
+# B2C_SESSION_CACHE=0 disables it (every payment flow logs in via Book Now).
+
+import os
+import logging
+import time as _time
+
+import accounts
+import interprocess
+import locators
+import methods
+import state_reset
+
+ENABLED = os.environ.get("B2C_SESSION_CACHE", "1") != "0"
+# Snapshots older than this are not even tried (the site's own session length is unknown)
+MAX_AGE_SECONDS = float(os.environ.get("B2C_SESSION_MAX_AGE", "21600"))
+
+STATE_FILE = "login_sessions.json"
+
+# Fields of a CDP Network.Cookie that Network.setCookies accepts back
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+def _key(account):
+    return f"{accounts.BACKEND}|{account.mobile}"
+
+
+def snapshot(driver):
+    """Cookies for the site origin and the current page's storage, as a JSON-able dict."""
+    cookies = driver.execute_cdp_cmd("Network.getCookies", {"urls": [state_reset.ORIGIN + "/"]}).get("cookies", [])
+    local, session = state_reset.read_storage(driver)
+    return {"created": _time.time(), "cookies": cookies, "local": local, "session": session}
+
+
+def _is_expired(snap, now):
+    if now - snap["created"] > MAX_AGE_SECONDS:
+        return True
+    # Session cookies report expires == -1; persistent ones carry an epoch time
+    return any(0 < c.get("expires", -1) < now for c in snap["cookies"])
+
+
+def restore(driver, snap):
+    """Load the site once with the snapshot's cookies and storage in place."""
+    cookies = [{k: c[k] for k in _COOKIE_FIELDS if k in c} for c in snap["cookies"]]
+    for c in cookies:
+        if c.get("expires", -1) <= 0:
+            c.pop("expires", None)
+    if cookies:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    state_reset.load_with_storage(driver, locators.URL, snap["local"], snap["session"])
+
+
+def _load(account):
+    with interprocess.locked_json(STATE_FILE) as sessions:
+        return sessions.get(_key(account))
+
+
+def _store(account, snap):
+    with interprocess.locked_json(STATE_FILE) as sessions:
+        if snap is None:
+            sessions.pop(_key(account), None)
+        else:
+            sessions[_key(account)] = snap
+
+
+def open_logged_in(driver, account):
+    """Open the site logged in as `account`. Returns "restored" or "logged in".
+
+    Tries the saved snapshot first; logs in through the UI (and saves a new
+    snapshot) when there is none or it has expired. Raises RuntimeError if
+    the UI login does not succeed either.
+    """
+    start = _time.monotonic()
+    snap = _load(account)
+    if snap and not _is_expired(snap, _time.time()):
+        restore(driver, snap)
+        if methods.is_logged_in(driver):
+            logging.info("Session cache: restored login for %s in %.2fs", account.mobile, _time.monotonic() - start)
+            return "restored"
+        logging.info("Session cache: snapshot for %s no longer logged in — logging in again", account.mobile)
+    elif snap:
+        logging.info("Session cache: snapshot for %s is too old — logging in again", account.mobile)
+    if snap:
+        _store(account, None)
+
+    if not methods.login_from_home(driver, account.mobile, account.otp):
+        raise RuntimeError(f"Login as {account.mobile} did not show the Logout link")
+    _store(account, snapshot(driver))
+    logging.info("Session cache: logged in %s through the UI in %.2fs and saved the session",
+                 account.mobile, _time.monotonic() - start)
+    return "logged in"
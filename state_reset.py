@@ -0,0 +1,140 @@
+# state_reset.py
+# Per-test reset to a logged-out home page.
+#
+# cdp (default): clear cookies and the site origin's storage through CDP and
+#   load the home page once.
+# ui: the old way — open the site, click Logout if it is there, wait for the
+#   logout to finish and open the site again.
+#
+# Every reset is timed. Averages per mode are kept in a shared state file,
+# so after one run in each mode (B2C_STATE_RESET=cdp|ui) log_report() shows
+# the saving per test.
+
+import os
+import json
+import logging
+import threading
+import time as _time
+from urllib.parse import urlsplit
+
+from selenium.webdriver.common.by import By
+
+import interprocess
+import locators
+import methods
+import waits
+
+MODE = os.environ.get("B2C_STATE_RESET", "cdp")
+
+_parts = urlsplit(locators.URL)
+ORIGIN = f"{_parts.scheme}://{_parts.netloc}"
+
+STATE_FILE = "state_reset_timings.json"
+
+_READ_STORAGE_JS = """
+function dump(s) {
+    var out = {};
+    for (var i = 0; i < s.length; i++) { var k = s.key(i); out[k] = s.getItem(k); }
+    return out;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+# Seeds the storage before the site's own scripts run; top frame on ORIGIN only
+_SEED_STORAGE_JS = """
+(function (origin, local, session) {
+    if (window.top !== window || location.origin !== origin) { return; }
+    try {
+        Object.keys(local).forEach(function (k) { localStorage.setItem(k, local[k]); });
+        Object.keys(session).forEach(function (k) { sessionStorage.setItem(k, session[k]); });
+    } catch (e) {}
+})(%s, %s, %s);
+"""
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def clear_state(driver):
+    """Drop cookies plus the origin's local storage, IndexedDB, service workers and caches.
+
+    sessionStorage is per tab and outside Storage.clearDataForOrigin, so it is
+    cleared by script when the tab is on the site.
+    """
+    try:
+        if driver.current_url.startswith(ORIGIN):
+            driver.execute_script("try { sessionStorage.clear(); } catch (e) {}")
+    except Exception:
+        pass
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": ORIGIN, "storageTypes": "all"})
+
+
+def read_storage(driver):
+    """(localStorage, sessionStorage) of the current page, as dicts."""
+    storage = driver.execute_script(_READ_STORAGE_JS) or {}
+    return storage.get("local") or {}, storage.get("session") or {}
+
+
+def load_with_storage(driver, url, local, session):
+    """Load `url` once, with `local`/`session` storage on ORIGIN seeded before the page's scripts run."""
+    source = _SEED_STORAGE_JS % (json.dumps(ORIGIN), json.dumps(local), json.dumps(session))
+    handle = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source}).get("identifier")
+    try:
+        logging.info("Opening %s with saved storage", url)
+        driver.get(url)
+    finally:
+        try:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": handle})
+        except Exception:
+            pass
+
+
+def _ui_logout(driver):
+    methods.open_site(driver)
+    try:
+        logout_btn = driver.find_element(By.XPATH, locators.LOGOUT_BUTTON_XPATH)
+    except Exception:
+        logging.info("User is not logged in")
+        return
+    driver.execute_script("arguments[0].click();", logout_btn)
+    logging.info("User was already logged in. Logging out first...")
+    waits.settle(driver, "login.logout", ceiling=1, network=True)
+    methods.open_site(driver)
+    logging.info("Logged out and reopened home page")
+
+
+def open_clean_site(driver):
+    """Land on the home page, logged out, with no state left by earlier tests. Returns seconds taken."""
+    start = _time.monotonic()
+    if MODE == "ui":
+        _ui_logout(driver)
+    else:
+        clear_state(driver)
+        methods.open_site(driver)
+    elapsed = _time.monotonic() - start
+    with _stats_lock:
+        count, total = _stats.get(MODE, (0, 0.0))
+        _stats[MODE] = (count + 1, total + elapsed)
+    return elapsed
+
+
+def log_report(title, reset=True):
+    """Log this process's resets, fold them into the shared per-mode history and show the saving."""
+    with _stats_lock:
+        rows = dict(_stats)
+        if reset:
+            _stats.clear()
+    if not rows:
+        return
+    with interprocess.locked_json(STATE_FILE) as history:
+        for mode, (count, total) in rows.items():
+            h = history.setdefault(mode, {"count": 0, "seconds": 0.0})
+            h["count"] += count
+            h["seconds"] += total
+        averages = {mode: h["seconds"] / h["count"] for mode, h in history.items() if h.get("count")}
+    for mode, (count, total) in sorted(rows.items()):
+        logging.info("State reset for %s: %s mode — %d resets, %.2fs average", title, mode, count, total / count)
+    if "cdp" in averages and "ui" in averages:
+        logging.info("State reset history: cdp %.2fs vs ui %.2fs per test — %.2fs saved per test",
+                     averages["cdp"], averages["ui"], averages["ui"] - averages["cdp"])
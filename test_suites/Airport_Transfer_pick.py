@@ -20,6 +20,51 @@ class TestAirportTransferPickup(ServiceBaseTestCase):
     _search_button_xpath = locators.AIRPORT_SEARCH_BUTTON_XPATH
     _service_label = "Pickup From Airport"
 
+    def _fill_form(self, label, todo, direction, city, date, time, go_to_payment):
+        """Run the form steps named in `todo`."""
+        if "open" in todo:
+            self._open_site(label, logged_in=go_to_payment)
+        if "tab" in todo:
+            self._click_tab(label)
+
+        # 3) Select direction
+        if "direction" in todo:
+            logging.info("Step 3: Selecting direction '%s' from dropdown", direction)
+            try:
+                methods.safe_click(self.driver, By.XPATH, locators.DIRECTION_SELECT_XPATH)
+                option_xpath = locators.DIRECTION_OPTION_XPATH_TEMPLATE.format(direction)
+                methods.safe_click(self.driver, By.XPATH, option_xpath)
+                logging.info("Direction '%s' selected successfully", direction)
+            except Exception as e:
+                self._take_screenshot(label, "direction")
+                logging.error("FAILED to select direction: %s", e)
+                self.fail(f"Direction select failed: {e}")
+
+        # 4) Type city
+        if "city" in todo:
+            if city:
+                logging.info("Step 4: Typing city name '%s' and selecting from suggestions", city)
+                try:
+                    methods.type_and_select_first_option(
+                        self.driver,
+                        locators.AIRPORT_CITY_XPATH,
+                        city,
+                        first_option_xpath=locators.AIRPORT_CITY_FIRST_OPTION_XPATH,
+                    )
+                    logging.info("City '%s' entered and first suggestion selected", city)
+                except Exception as e:
+                    self._take_screenshot(label, "city")
+                    logging.error("FAILED to enter city: %s", e)
+                    self.fail(f"City input failed: {e}")
+            else:
+                logging.info("Step 4: Skipping city input (left empty for worst case test)")
+
+        # 5-6) Set date and time
+        if "date" in todo:
+            self._set_date(label, locators.AIRPORT_DATE_XPATH, date)
+        if "time" in todo:
+            self._set_time(label, locators.AIRPORT_TIME_XPATH, time)
+
     def _run_search(self, label, direction, city, date, time, go_to_payment=False, validate=False):
         """Core search flow — reused for all test cases."""
 
@@ -29,42 +74,15 @@ class TestAirportTransferPickup(ServiceBaseTestCase):
         logging.info("  Payment flow: %s | Validation: %s", go_to_payment, validate)
         logging.info("============================================================")
 
-        self._open_site(label)
-        self._click_tab(label)
-
-        # 3) Select direction
-        logging.info("Step 3: Selecting direction '%s' from dropdown", direction)
-        try:
-            methods.safe_click(self.driver, By.XPATH, locators.DIRECTION_SELECT_XPATH)
-            option_xpath = locators.DIRECTION_OPTION_XPATH_TEMPLATE.format(direction)
-            methods.safe_click(self.driver, By.XPATH, option_xpath)
-            logging.info("Direction '%s' selected successfully", direction)
-        except Exception as e:
-            self._take_screenshot(label, "direction")
-            logging.error("FAILED to select direction: %s", e)
-            self.fail(f"Direction select failed: {e}")
-
-        # 4) Type city
-        if city:
-            logging.info("Step 4: Typing city name '%s' and selecting from suggestions", city)
-            try:
-                methods.type_and_select_first_option(
-                    self.driver,
-                    locators.AIRPORT_CITY_XPATH,
-                    city,
-                    first_option_xpath=locators.AIRPORT_CITY_FIRST_OPTION_XPATH,
-                )
-                logging.info("City '%s' entered and first suggestion selected", city)
-            except Exception as e:
-                self._take_screenshot(label, "city")
-                logging.error("FAILED to enter city: %s", e)
-                self.fail(f"City input failed: {e}")
-        else:
-            logging.info("Step 4: Skipping city input (left empty for worst case test)")
-
-        # 5-6) Set date and time
-        self._set_date(label, locators.AIRPORT_DATE_XPATH, date)
-        self._set_time(label, locators.AIRPORT_TIME_XPATH, time)
+        steps = [
+            ("open", go_to_payment),
+            ("tab", self._service_label),
+            ("direction", direction),
+            ("city", city),
+            ("date", date),
+            ("time", time),
+        ]
+        self._fill_form_steps(steps, lambda todo: self._fill_form(label, todo, direction, city, date, time, go_to_payment))
 
         # 7) Dismiss dropdown, click search, post-search flow
         self._dismiss_dropdown()
@@ -23,6 +23,62 @@ class TestLocalRental(ServiceBaseTestCase):
     _search_button_xpath = locators.LOCAL_RENTAL_SEARCH_BUTTON_XPATH
     _service_label = "Local Rental"
 
+    def _fill_form(self, label, todo, city, package, date, time, go_to_payment):
+        """Run the form steps named in `todo`."""
+        if "open" in todo:
+            self._open_site(label, logged_in=go_to_payment)
+        if "tab" in todo:
+            self._click_tab(label)
+
+        # 3) Type city and select first suggestion
+        if "city" in todo:
+            if city:
+                logging.info("Step 3: Typing city name '%s' and selecting from suggestions", city)
+                try:
+                    methods.type_and_select_first_option(
+                        self.driver,
+                        locators.LOCAL_RENTAL_CITY_XPATH,
+                        city,
+                        first_option_xpath=locators.LOCAL_RENTAL_CITY_FIRST_OPTION_XPATH,
+                    )
+                    logging.info("City '%s' entered and first suggestion selected", city)
+                except Exception as e:
+                    self._take_screenshot(label, "city")
+                    logging.error("FAILED to enter city: %s", e)
+                    self.fail(f"City input failed: {e}")
+            else:
+                logging.info("Step 3: Skipping city input (left empty for worst case test)")
+
+        # 4) Select package from dropdown
+        if "package" in todo:
+            logging.info("Step 4: Selecting package '%s' from dropdown", package)
+            try:
+                wait = WebDriverWait(self.driver, 15)
+                select_elem = wait.until(EC.element_to_be_clickable((By.XPATH, locators.LOCAL_RENTAL_PACKAGE_XPATH)))
+                logging.info("Waiting for package dropdown options to load from server...")
+                WebDriverWait(self.driver, 10).until(
+                    lambda d: len(Select(d.find_element(By.XPATH, locators.LOCAL_RENTAL_PACKAGE_XPATH)).options) > 1
+                )
+                sel = Select(select_elem)
+                options = [o.text.strip() for o in sel.options if o.text.strip() and o.get_attribute("value")]
+                match = next((o for o in options if package.lower() in o.lower()), None)
+                if match:
+                    sel.select_by_visible_text(match)
+                    logging.info("Package '%s' selected successfully by matching text", match)
+                else:
+                    sel.select_by_index(1)
+                    logging.info("Package selected by index 1 (available options: %s)", options)
+            except Exception as e:
+                self._take_screenshot(label, "package")
+                logging.error("FAILED to select package: %s", e)
+                self.fail(f"Package select failed: {e}")
+
+        # 5-6) Set date and time
+        if "date" in todo:
+            self._set_date(label, locators.LOCAL_RENTAL_DATE_XPATH, date)
+        if "time" in todo:
+            self._set_time(label, locators.LOCAL_RENTAL_TIME_XPATH, time)
+
     def _run_search(self, label, city, package, date, time, go_to_payment=False, validate=False):
         """Core search flow — reused for all test cases."""
 
@@ -32,53 +88,15 @@ class TestLocalRental(ServiceBaseTestCase):
         logging.info("  Payment flow: %s | Validation: %s", go_to_payment, validate)
         logging.info("============================================================")
 
-        self._open_site(label)
-        self._click_tab(label)
-
-        # 3) Type city and select first suggestion
-        if city:
-            logging.info("Step 3: Typing city name '%s' and selecting from suggestions", city)
-            try:
-                methods.type_and_select_first_option(
-                    self.driver,
-                    locators.LOCAL_RENTAL_CITY_XPATH,
-                    city,
-                    first_option_xpath=locators.LOCAL_RENTAL_CITY_FIRST_OPTION_XPATH,
-                )
-                logging.info("City '%s' entered and first suggestion selected", city)
-            except Exception as e:
-                self._take_screenshot(label, "city")
-                logging.error("FAILED to enter city: %s", e)
-                self.fail(f"City input failed: {e}")
-        else:
-            logging.info("Step 3: Skipping city input (left empty for worst case test)")
-
-        # 4) Select package from dropdown
-        logging.info("Step 4: Selecting package '%s' from dropdown", package)
-        try:
-            wait = WebDriverWait(self.driver, 15)
-            select_elem = wait.until(EC.element_to_be_clickable((By.XPATH, locators.LOCAL_RENTAL_PACKAGE_XPATH)))
-            logging.info("Waiting for package dropdown options to load from server...")
-            WebDriverWait(self.driver, 10).until(
-                lambda d: len(Select(d.find_element(By.XPATH, locators.LOCAL_RENTAL_PACKAGE_XPATH)).options) > 1
-            )
-            sel = Select(select_elem)
-            options = [o.text.strip() for o in sel.options if o.text.strip() and o.get_attribute("value")]
-            match = next((o for o in options if package.lower() in o.lower()), None)
-            if match:
-                sel.select_by_visible_text(match)
-                logging.info("Package '%s' selected successfully by matching text", match)
-            else:
-                sel.select_by_index(1)
-                logging.info("Package selected by index 1 (available options: %s)", options)
-        except Exception as e:
-            self._take_screenshot(label, "package")
-            logging.error("FAILED to select package: %s", e)
-            self.fail(f"Package select failed: {e}")
-
-        # 5-6) Set date and time
-        self._set_date(label, locators.LOCAL_RENTAL_DATE_XPATH, date)
-        self._set_time(label, locators.LOCAL_RENTAL_TIME_XPATH, time)
+        steps = [
+            ("open", go_to_payment),
+            ("tab", self._service_label),
+            ("city", city),
+            ("package", package),
+            ("date", date),
+            ("time", time),
+        ]
+        self._fill_form_steps(steps, lambda todo: self._fill_form(label, todo, city, package, date, time, go_to_payment))
 
         # 7) Dismiss dropdown, click search, post-search flow
         self._dismiss_dropdown()
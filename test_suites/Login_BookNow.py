@@ -3,7 +3,6 @@
 # Tests mobile + OTP validation on the login form that appears after Book Now.
 
 import logging
-import time as _time
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -12,7 +11,11 @@ from selenium.webdriver.support import expected_conditions as EC
 import allure
 import locators
 import methods
+import results_link
+import state_reset
 import testvalue
+import time_travel
+import waits
 
 from base_test import LoginBaseTestCase
 
@@ -22,20 +25,39 @@ class TestLoginBookNow(LoginBaseTestCase):
     _test_name = "Book Now Login"
 
     def _navigate_to_book_now_login(self, label):
-        """Search for a ride and click Book Now to reach the login form.
+        """Reach the results page, logged out, and click Book Now to reach the login form.
 
-        Flow: Open site -> Airport Transfer -> future date search -> Search -> Book Now -> Login form
-        Logs out first if already logged in.
+        The results page comes from a saved deep link when there is one
+        (results_link); otherwise the search form is filled and its result saved.
         """
         logging.info("Navigating to login form via Book Now for test '%s'", label)
 
         self._dismiss_alert()
 
+        search = ("airport", testvalue.BEST_DIRECTION, testvalue.BEST_CITY, testvalue.BEST_DATE, testvalue.BEST_TIME)
+        if results_link.open_results(self.driver, search, ready_xpath=locators.BOOK_NOW_BUTTON_FALLBACK_XPATH):
+            logging.info("Steps 1-7: Results page opened directly from a saved link")
+            self._dismiss_toasts()
+        else:
+            if self._search_via_form(label):
+                results_link.capture(self.driver, search)
+            else:
+                logging.info("Results page not confirmed for this search — not saving it as a link")
+
+        self._click_book_now(label)
+
+    def _search_via_form(self, label):
+        """Open site (cleared, logged out) -> Airport Transfer -> future date search -> Search.
+
+        Returns True when every field took its value and the results page
+        (its Book Now button) showed up, i.e. the page is safe to save as a link.
+        """
+        complete = True
         # 1) Open site
         logging.info("Step 1: Opening the website %s", locators.URL)
         try:
-            methods.open_site(self.driver)
-            logging.info("Website opened successfully")
+            elapsed = state_reset.open_clean_site(self.driver)
+            logging.info("Website opened logged out (%s reset, %.2fs)", state_reset.MODE, elapsed)
         except Exception as e:
             self._take_screenshot(label, "open_site")
             logging.error("FAILED to open website: %s", e)
@@ -43,19 +65,6 @@ class TestLoginBookNow(LoginBaseTestCase):
 
         self._dismiss_toasts()
 
-        # If user is already logged in, click Logout first
-        try:
-            logout_btn = self.driver.find_element(By.XPATH, locators.LOGOUT_BUTTON_XPATH)
-            self.driver.execute_script("arguments[0].click();", logout_btn)
-            logging.info("User was already logged in. Logging out first...")
-            _time.sleep(1)
-            methods.open_site(self.driver)
-            logging.info("Logged out and reopened home page")
-        except Exception:
-            logging.info("User is not logged in. Proceeding with search")
-
-        self._dismiss_toasts()
-
         # 2) Click Airport Transfer tab
         logging.info("Step 2: Clicking on the Airport Transfer tab")
         try:
@@ -101,6 +110,7 @@ class TestLoginBookNow(LoginBaseTestCase):
         except Exception as e:
             self._take_screenshot(label, "date")
             logging.warning("FAILED to set date: %s", e)
+            complete = False
 
         # 6) Set time
         logging.info("Step 6: Setting pickup time to '%s'", testvalue.BEST_TIME)
@@ -110,11 +120,12 @@ class TestLoginBookNow(LoginBaseTestCase):
         except Exception as e:
             self._take_screenshot(label, "time")
             logging.warning("FAILED to set time: %s", e)
+            complete = False
 
         # 7) Dismiss any open dropdown
         try:
             self.driver.find_element(By.TAG_NAME, "body").click()
-            _time.sleep(0.3)
+            waits.settle(self.driver, "book_now_login.dismiss_dropdown", ceiling=0.3)
         except Exception:
             pass
 
@@ -124,13 +135,16 @@ class TestLoginBookNow(LoginBaseTestCase):
             btn = self.driver.find_element(By.XPATH, locators.AIRPORT_SEARCH_BUTTON_XPATH)
             self.driver.execute_script("arguments[0].click();", btn)
             logging.info("Search button clicked. Waiting for results page to load...")
-            _time.sleep(3)
+            reached = waits.until(self.driver, "book_now_login.results",
+                                  EC.presence_of_element_located((By.XPATH, locators.BOOK_NOW_BUTTON_FALLBACK_XPATH)),
+                                  ceiling=3, alert_aware=True)
         except Exception as e:
             self._take_screenshot(label, "click_search")
             logging.error("FAILED to click search button: %s", e)
             self.fail(f"Click search failed: {e}")
+        return complete and bool(reached)
 
-
+    def _click_book_now(self, label):
         # 9) Click Book Now button
         logging.info("Step 8: Clicking 'Book Now' button on results page")
         try:
@@ -141,7 +155,9 @@ class TestLoginBookNow(LoginBaseTestCase):
             methods.scroll_into_view(self.driver, book_btn)
             book_btn.click()
             logging.info("Book Now button clicked. Waiting for login form to appear...")
-            _time.sleep(1)
+            waits.until(self.driver, "book_now_login.login_form",
+                        EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH)),
+                        ceiling=1, alert_aware=True)
         except Exception as e:
             self._take_screenshot(label, "book_now")
             logging.error("FAILED to click Book Now: %s", e)
@@ -187,13 +203,13 @@ class TestLoginBookNow(LoginBaseTestCase):
         mobile_input.clear()
         mobile_input.send_keys(testvalue.LOGIN_MOBILE_SHORT)
         logging.info("Entered short mobile number: '%s' (%d digits)", testvalue.LOGIN_MOBILE_SHORT, len(testvalue.LOGIN_MOBILE_SHORT))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         # Click Send OTP — should show a validation error
         logging.info("Clicking Send OTP with short mobile number. Expecting validation error...")
         try:
-            methods.safe_click(self.driver, By.XPATH, locators.LOGIN_SEND_OTP_BUTTON_XPATH)
-            _time.sleep(1)
+            # Validation is client-side: the alert (if any) comes without a request
+            methods.click_send_otp(self.driver, "login.send_otp", ceiling=1)
         except Exception:
             pass
 
@@ -244,7 +260,7 @@ class TestLoginBookNow(LoginBaseTestCase):
         mobile_input.clear()
         mobile_input.send_keys(testvalue.LOGIN_MOBILE_OVERFLOW)
         logging.info("Entered overflow mobile number: '%s' (%d digits)", testvalue.LOGIN_MOBILE_OVERFLOW, len(testvalue.LOGIN_MOBILE_OVERFLOW))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = mobile_input.get_attribute("value") or ""
         logging.info("Field accepted value: '%s' (%d characters)", actual, len(actual))
@@ -280,7 +296,7 @@ class TestLoginBookNow(LoginBaseTestCase):
         mobile_input.clear()
         mobile_input.send_keys(testvalue.LOGIN_MOBILE_ALPHA)
         logging.info("Entered alphabetic input: '%s'", testvalue.LOGIN_MOBILE_ALPHA)
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = mobile_input.get_attribute("value") or ""
         logging.info("Field accepted value: '%s'", actual)
@@ -316,8 +332,8 @@ class TestLoginBookNow(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
@@ -327,12 +343,14 @@ class TestLoginBookNow(LoginBaseTestCase):
         otp_input.clear()
         otp_input.send_keys(testvalue.LOGIN_OTP_SHORT)
         logging.info("Entered short OTP: '%s' (%d digits)", testvalue.LOGIN_OTP_SHORT, len(testvalue.LOGIN_OTP_SHORT))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         logging.info("Clicking Verify OTP with short OTP. Expecting validation error...")
         try:
             methods.safe_click(self.driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
-            _time.sleep(1)
+            waits.until(self.driver, "login.verify_otp",
+                        EC.invisibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH)),
+                        ceiling=1, alert_aware=True)
         except Exception:
             pass
 
@@ -366,8 +384,8 @@ class TestLoginBookNow(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
@@ -377,7 +395,7 @@ class TestLoginBookNow(LoginBaseTestCase):
         otp_input.clear()
         otp_input.send_keys(testvalue.LOGIN_OTP_OVERFLOW)
         logging.info("Entered overflow OTP: '%s' (%d digits)", testvalue.LOGIN_OTP_OVERFLOW, len(testvalue.LOGIN_OTP_OVERFLOW))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = otp_input.get_attribute("value") or ""
         logging.info("OTP field accepted value: '%s' (%d characters)", actual, len(actual))
@@ -412,8 +430,8 @@ class TestLoginBookNow(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
@@ -423,7 +441,7 @@ class TestLoginBookNow(LoginBaseTestCase):
         otp_input.clear()
         otp_input.send_keys(testvalue.LOGIN_OTP_ALPHA)
         logging.info("Entered alphabetic OTP: '%s'", testvalue.LOGIN_OTP_ALPHA)
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = otp_input.get_attribute("value") or ""
         logging.info("OTP field accepted value: '%s'", actual)
@@ -451,7 +469,7 @@ class TestLoginBookNow(LoginBaseTestCase):
         label = "booknow_valid_login"
         logging.info("============================================================")
         logging.info("STARTING TEST: Valid login after Book Now")
-        logging.info("  Mobile: %s | OTP: %s", testvalue.LOGIN_VALID_MOBILE, testvalue.LOGIN_VALID_OTP)
+        logging.info("  Mobile: %s | OTP: %s", self.account.mobile, self.account.otp)
         logging.info("============================================================")
 
         self._navigate_to_book_now_login(label)
@@ -459,12 +477,12 @@ class TestLoginBookNow(LoginBaseTestCase):
         wait = WebDriverWait(self.driver, 15)
 
         # Enter mobile number
-        logging.info("Entering mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        logging.info("Entering mobile number: '%s'", self.account.mobile)
         mobile_input = wait.until(
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
         logging.info("Mobile number entered successfully")
 
         # Send OTP
@@ -472,12 +490,12 @@ class TestLoginBookNow(LoginBaseTestCase):
         self._send_otp_with_retry(label)
 
         # Enter OTP
-        logging.info("Entering OTP: '%s'", testvalue.LOGIN_VALID_OTP)
+        logging.info("Entering OTP: '%s'", self.account.otp)
         otp_input = wait.until(
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))
         )
         otp_input.clear()
-        otp_input.send_keys(testvalue.LOGIN_VALID_OTP)
+        otp_input.send_keys(self.account.otp)
         logging.info("OTP entered successfully")
 
         # Verify OTP
@@ -485,7 +503,9 @@ class TestLoginBookNow(LoginBaseTestCase):
         try:
             methods.safe_click(self.driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
             logging.info("Verify OTP clicked. Waiting for response...")
-            _time.sleep(1)
+            waits.until(self.driver, "login.verify_otp",
+                        EC.invisibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH)),
+                        ceiling=1, alert_aware=True)
         except Exception as e:
             self._take_screenshot(label, "verify_otp")
             logging.error("FAILED to click Verify OTP: %s", e)
@@ -501,11 +521,11 @@ class TestLoginBookNow(LoginBaseTestCase):
                 EC.visibility_of_element_located((By.XPATH, locators.LOGIN_NICKNAME_XPATH))
             )
             actual_nickname = nickname_el.text.strip()
-            logging.info("  Expected nickname: '%s'", testvalue.LOGIN_EXPECTED_NICKNAME)
+            logging.info("  Expected nickname: '%s'", self.account.nickname)
             logging.info("  Actual nickname on navbar: '%s'", actual_nickname)
             self.assertEqual(
-                actual_nickname.lower(), testvalue.LOGIN_EXPECTED_NICKNAME.lower(),
-                f"Nickname mismatch: expected '{testvalue.LOGIN_EXPECTED_NICKNAME}', got '{actual_nickname}'"
+                actual_nickname.lower(), self.account.nickname.lower(),
+                f"Nickname mismatch: expected '{self.account.nickname}', got '{actual_nickname}'"
             )
             logging.info("  NICKNAME MATCHED SUCCESSFULLY")
         except AssertionError as e:
@@ -526,7 +546,7 @@ class TestLoginBookNow(LoginBaseTestCase):
         "1. Open site, search for a ride with future date, click Book Now\n"
         "2. Login form appears after Book Now\n"
         "3. Enter a valid mobile number and send OTP\n"
-        "4. Wait 65 seconds for the OTP to expire\n"
+        "4. Let 65 seconds pass (page clock fast-forward) for the OTP to expire\n"
         "5. Enter the (now expired) OTP\n"
         "6. Click Verify OTP button\n"
         "7. Verify that an expiry error message appears\n"
@@ -539,6 +559,10 @@ class TestLoginBookNow(LoginBaseTestCase):
         logging.info("STARTING TEST: OTP expiry after 60 seconds (Book Now)")
         logging.info("============================================================")
 
+        # Fake page clock from the first page load on, so the expiry below is a fast-forward
+        clock = time_travel.install(self.driver)
+        self.addCleanup(time_travel.uninstall, self.driver, clock)
+
         self._navigate_to_book_now_login(label)
 
         wait = WebDriverWait(self.driver, 15)
@@ -546,34 +570,42 @@ class TestLoginBookNow(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
-        # Wait 65 seconds for OTP to expire
-        logging.info("Waiting 65 seconds for OTP to expire...")
-        _time.sleep(65)
-        logging.info("65 seconds passed. OTP should now be expired")
+        # Let 65 seconds pass for the OTP to expire
+        logging.info("Advancing the clock 65 seconds for OTP to expire...")
+        how = time_travel.advance(self.driver, 65)
+        logging.info("65 seconds passed (%s). OTP should now be expired", how)
 
         otp_input = wait.until(
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))
         )
         otp_input.clear()
-        otp_input.send_keys(testvalue.LOGIN_VALID_OTP)
-        logging.info("Entered expired OTP: '%s'", testvalue.LOGIN_VALID_OTP)
-        _time.sleep(0.5)
+        otp_input.send_keys(self.account.otp)
+        logging.info("Entered expired OTP: '%s'", self.account.otp)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         logging.info("Clicking Verify OTP with expired OTP. Expecting expiry error...")
         try:
             methods.safe_click(self.driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
-            _time.sleep(1)
+            waits.until(self.driver, "login.verify_otp",
+                        EC.invisibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH)),
+                        ceiling=1, alert_aware=True)
         except Exception:
             pass
 
         alert_text = self._dismiss_alert()
         self._take_screenshot(label, "final_state")
         logging.info("OTP expiry result — alert: %s", alert_text)
+
+        logged_in = bool(self.driver.find_elements(By.XPATH, locators.LOGOUT_BUTTON_XPATH))
+        self.assertFalse(logged_in, "Expired OTP was accepted — user is logged in")
+        otp_still_shown = any(el.is_displayed() for el in
+                              self.driver.find_elements(By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))
+        self.assertTrue(alert_text or otp_still_shown, "No expiry error shown for the expired OTP")
         logging.info("TEST COMPLETED: OTP expiry validation (Book Now)\n")
 
 
@@ -3,7 +3,6 @@
 # Tests mobile + OTP validation on the home page login form.
 
 import logging
-import time as _time
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -12,7 +11,10 @@ from selenium.webdriver.support import expected_conditions as EC
 import allure
 import locators
 import methods
+import state_reset
 import testvalue
+import time_travel
+import waits
 
 from base_test import LoginBaseTestCase
 
@@ -22,12 +24,12 @@ class TestLoginHome(LoginBaseTestCase):
     _test_name = "Home Page Login"
 
     def _open_login_form(self, label):
-        """Navigate to the home page login form (logs out first if already logged in)."""
+        """Navigate to the home page login form, starting from a cleared, logged-out session."""
         logging.info("Opening login form from home page for test '%s'", label)
         self._dismiss_alert()
         try:
-            methods.open_site(self.driver)
-            logging.info("Website opened successfully")
+            elapsed = state_reset.open_clean_site(self.driver)
+            logging.info("Website opened logged out (%s reset, %.2fs)", state_reset.MODE, elapsed)
         except Exception as e:
             self._take_screenshot(label, "open_site")
             logging.error("FAILED to open website: %s", e)
@@ -35,19 +37,6 @@ class TestLoginHome(LoginBaseTestCase):
 
         self._dismiss_toasts()
 
-        # If user is already logged in, click Logout first
-        try:
-            logout_btn = self.driver.find_element(By.XPATH, locators.LOGOUT_BUTTON_XPATH)
-            self.driver.execute_script("arguments[0].click();", logout_btn)
-            logging.info("User was already logged in. Logging out first...")
-            _time.sleep(1)
-            methods.open_site(self.driver)
-            logging.info("Logged out and reopened home page")
-        except Exception:
-            logging.info("User is not logged in. Proceeding to login form")
-
-        self._dismiss_toasts()
-
         try:
             methods.safe_click(self.driver, By.XPATH, locators.LOGIN_BUTTON_XPATH)
             logging.info("Login button on home page clicked. Login form should now be visible")
@@ -123,7 +112,9 @@ class TestLoginHome(LoginBaseTestCase):
         try:
             methods.safe_click(self.driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
             logging.info("Verify OTP button clicked. Waiting for response...")
-            _time.sleep(1)
+            waits.until(self.driver, "login.verify_otp",
+                        EC.invisibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH)),
+                        ceiling=1, alert_aware=True)
         except Exception as e:
             self._take_screenshot(label, "verify_otp")
             logging.error("FAILED to click Verify OTP: %s", e)
@@ -161,13 +152,13 @@ class TestLoginHome(LoginBaseTestCase):
         mobile_input.clear()
         mobile_input.send_keys(testvalue.LOGIN_MOBILE_SHORT)
         logging.info("Entered short mobile number: '%s' (%d digits)", testvalue.LOGIN_MOBILE_SHORT, len(testvalue.LOGIN_MOBILE_SHORT))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         # Click Send OTP — should show a validation error
         logging.info("Clicking Send OTP with short mobile number. Expecting validation error...")
         try:
-            methods.safe_click(self.driver, By.XPATH, locators.LOGIN_SEND_OTP_BUTTON_XPATH)
-            _time.sleep(1)
+            # Validation is client-side: the alert (if any) comes without a request
+            methods.click_send_otp(self.driver, "login.send_otp", ceiling=1)
         except Exception:
             pass
 
@@ -219,7 +210,7 @@ class TestLoginHome(LoginBaseTestCase):
         mobile_input.clear()
         mobile_input.send_keys(testvalue.LOGIN_MOBILE_OVERFLOW)
         logging.info("Entered overflow mobile number: '%s' (%d digits)", testvalue.LOGIN_MOBILE_OVERFLOW, len(testvalue.LOGIN_MOBILE_OVERFLOW))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = mobile_input.get_attribute("value") or ""
         logging.info("Field accepted value: '%s' (%d characters)", actual, len(actual))
@@ -255,7 +246,7 @@ class TestLoginHome(LoginBaseTestCase):
         mobile_input.clear()
         mobile_input.send_keys(testvalue.LOGIN_MOBILE_ALPHA)
         logging.info("Entered alphabetic input: '%s'", testvalue.LOGIN_MOBILE_ALPHA)
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = mobile_input.get_attribute("value") or ""
         logging.info("Field accepted value: '%s'", actual)
@@ -290,8 +281,8 @@ class TestLoginHome(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
@@ -301,13 +292,15 @@ class TestLoginHome(LoginBaseTestCase):
         otp_input.clear()
         otp_input.send_keys(testvalue.LOGIN_OTP_SHORT)
         logging.info("Entered short OTP: '%s' (%d digits)", testvalue.LOGIN_OTP_SHORT, len(testvalue.LOGIN_OTP_SHORT))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         # Click Verify OTP — should fail with short OTP
         logging.info("Clicking Verify OTP with short OTP. Expecting validation error...")
         try:
             methods.safe_click(self.driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
-            _time.sleep(1)
+            waits.until(self.driver, "login.verify_otp",
+                        EC.invisibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH)),
+                        ceiling=1, alert_aware=True)
         except Exception:
             pass
 
@@ -340,8 +333,8 @@ class TestLoginHome(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
@@ -351,7 +344,7 @@ class TestLoginHome(LoginBaseTestCase):
         otp_input.clear()
         otp_input.send_keys(testvalue.LOGIN_OTP_OVERFLOW)
         logging.info("Entered overflow OTP: '%s' (%d digits)", testvalue.LOGIN_OTP_OVERFLOW, len(testvalue.LOGIN_OTP_OVERFLOW))
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = otp_input.get_attribute("value") or ""
         logging.info("OTP field accepted value: '%s' (%d characters)", actual, len(actual))
@@ -385,8 +378,8 @@ class TestLoginHome(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
@@ -396,7 +389,7 @@ class TestLoginHome(LoginBaseTestCase):
         otp_input.clear()
         otp_input.send_keys(testvalue.LOGIN_OTP_ALPHA)
         logging.info("Entered alphabetic OTP: '%s'", testvalue.LOGIN_OTP_ALPHA)
-        _time.sleep(0.5)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         actual = otp_input.get_attribute("value") or ""
         logging.info("OTP field accepted value: '%s'", actual)
@@ -424,8 +417,8 @@ class TestLoginHome(LoginBaseTestCase):
         label = "home_valid_login"
         self._run_login(
             label,
-            testvalue.LOGIN_VALID_MOBILE,
-            testvalue.LOGIN_VALID_OTP,
+            self.account.mobile,
+            self.account.otp,
         )
 
         # Validate nickname on navbar after login
@@ -436,11 +429,11 @@ class TestLoginHome(LoginBaseTestCase):
                 EC.visibility_of_element_located((By.XPATH, locators.LOGIN_NICKNAME_XPATH))
             )
             actual_nickname = nickname_el.text.strip()
-            logging.info("  Expected nickname: '%s'", testvalue.LOGIN_EXPECTED_NICKNAME)
+            logging.info("  Expected nickname: '%s'", self.account.nickname)
             logging.info("  Actual nickname on navbar: '%s'", actual_nickname)
             self.assertEqual(
-                actual_nickname.lower(), testvalue.LOGIN_EXPECTED_NICKNAME.lower(),
-                f"Nickname mismatch: expected '{testvalue.LOGIN_EXPECTED_NICKNAME}', got '{actual_nickname}'"
+                actual_nickname.lower(), self.account.nickname.lower(),
+                f"Nickname mismatch: expected '{self.account.nickname}', got '{actual_nickname}'"
             )
             logging.info("  NICKNAME MATCHED SUCCESSFULLY")
         except AssertionError as e:
@@ -457,7 +450,7 @@ class TestLoginHome(LoginBaseTestCase):
         "Steps:\n"
         "1. Open the B2C website and click Login\n"
         "2. Enter a valid mobile number and send OTP\n"
-        "3. Wait 65 seconds for the OTP to expire\n"
+        "3. Let 65 seconds pass (page clock fast-forward) for the OTP to expire\n"
         "4. Enter the (now expired) OTP\n"
         "5. Click Verify OTP button\n"
         "6. Verify that an expiry error message appears\n"
@@ -470,6 +463,10 @@ class TestLoginHome(LoginBaseTestCase):
         logging.info("STARTING TEST: OTP expiry after 60 seconds (Home Page)")
         logging.info("============================================================")
 
+        # Fake page clock from the first page load on, so the expiry below is a fast-forward
+        clock = time_travel.install(self.driver)
+        self.addCleanup(time_travel.uninstall, self.driver, clock)
+
         self._open_login_form(label)
 
         wait = WebDriverWait(self.driver, 15)
@@ -477,35 +474,43 @@ class TestLoginHome(LoginBaseTestCase):
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH))
         )
         mobile_input.clear()
-        mobile_input.send_keys(testvalue.LOGIN_VALID_MOBILE)
-        logging.info("Entered valid mobile number: '%s'", testvalue.LOGIN_VALID_MOBILE)
+        mobile_input.send_keys(self.account.mobile)
+        logging.info("Entered valid mobile number: '%s'", self.account.mobile)
 
         self._send_otp_with_retry(label)
 
-        # Wait 65 seconds for OTP to expire
-        logging.info("Waiting 65 seconds for OTP to expire...")
-        _time.sleep(65)
-        logging.info("65 seconds passed. OTP should now be expired")
+        # Let 65 seconds pass for the OTP to expire
+        logging.info("Advancing the clock 65 seconds for OTP to expire...")
+        how = time_travel.advance(self.driver, 65)
+        logging.info("65 seconds passed (%s). OTP should now be expired", how)
 
         otp_input = wait.until(
             EC.element_to_be_clickable((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))
         )
         otp_input.clear()
-        otp_input.send_keys(testvalue.LOGIN_VALID_OTP)
-        logging.info("Entered expired OTP: '%s'", testvalue.LOGIN_VALID_OTP)
-        _time.sleep(0.5)
+        otp_input.send_keys(self.account.otp)
+        logging.info("Entered expired OTP: '%s'", self.account.otp)
+        waits.settle(self.driver, "login.after_typing", ceiling=0.5)
 
         # Click Verify OTP
         logging.info("Clicking Verify OTP with expired OTP. Expecting expiry error...")
         try:
             methods.safe_click(self.driver, By.XPATH, locators.LOGIN_VERIFY_OTP_BUTTON_XPATH)
-            _time.sleep(1)
+            waits.until(self.driver, "login.verify_otp",
+                        EC.invisibility_of_element_located((By.XPATH, locators.LOGIN_OTP_INPUT_XPATH)),
+                        ceiling=1, alert_aware=True)
         except Exception:
             pass
 
         alert_text = self._dismiss_alert()
         self._take_screenshot(label, "final_state")
         logging.info("OTP expiry result — alert: %s", alert_text)
+
+        logged_in = bool(self.driver.find_elements(By.XPATH, locators.LOGOUT_BUTTON_XPATH))
+        self.assertFalse(logged_in, "Expired OTP was accepted — user is logged in")
+        otp_still_shown = any(el.is_displayed() for el in
+                              self.driver.find_elements(By.XPATH, locators.LOGIN_OTP_INPUT_XPATH))
+        self.assertTrue(alert_text or otp_still_shown, "No expiry error shown for the expired OTP")
         logging.info("TEST COMPLETED: OTP expiry validation\n")
 
 
@@ -3,46 +3,56 @@
 # Covers: Airport Pickup, Airport Drop, Local Rental, Outstation Trip.
 
 import logging
-import time as _time
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.support.select import Select
-from webdriver_manager.chrome import ChromeDriverManager
 
-from selenium import webdriver
 from datetime import datetime
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 import allure
+import browser_pool
 import locators
 import methods
+import results_link
 import testvalue
+import waits
 
 from base_test import BaseTestCase
 
 
+def _visible_pac_items(driver):
+    """Condition: a displayed Google Places dropdown with at least one suggestion."""
+    for container in driver.find_elements(By.CSS_SELECTOR, "div.pac-container"):
+        if container.is_displayed() and container.find_elements(By.CSS_SELECTOR, "div.pac-item"):
+            return True
+    return False
+
+
 @allure.feature("Modify Search")
 class TestModifySearch(BaseTestCase):
     _test_name = "Modify Search"
+    _resource_policy = "keep-places"  # city inputs use Google Places Autocomplete
+
+    # Initial search of the cross-tab tests: form-fill helper and search button, by form
+    _INITIAL_FORMS = {
+        "airport": ("_fill_airport_form", locators.AIRPORT_SEARCH_BUTTON_XPATH),
+        "local_rental": ("_fill_local_rental_form", locators.LOCAL_RENTAL_SEARCH_BUTTON_XPATH),
+    }
 
     def setUp(self):
         """Check if browser session is alive; restart if crashed."""
         try:
             self.driver.title  # quick session health check
         except Exception:
-            logging.warning("Browser session is dead. Restarting Chrome for next test...")
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
+            logging.warning("Browser session is dead. Swapping in a fresh Chrome from the pool...")
+            pool = browser_pool.get_pool()
+            pool.release(self.driver)  # unhealthy, so the pool discards it
             cls = type(self)
-            cls.driver = webdriver.Chrome(
-                service=ChromeService(ChromeDriverManager().install()),
-                options=cls._chrome_options,
-            )
+            cls.driver = pool.lease()
             cls.wait = methods.get_wait(self.driver)
+            cls._apply_resource_policy()
             logging.info("Chrome browser restarted successfully")
 
     def _convert_to_site_time_format(self, time_12h):
@@ -70,54 +80,15 @@ class TestModifySearch(BaseTestCase):
             logging.warning("Results page did NOT load for '%s'. Skipping validation", label)
             return False
 
-        # --- Location ---
-        logging.info("Validating LOCATION on results page...")
-        try:
-            location_el = self.driver.find_element(By.XPATH, locators.RESULTS_LOCATION_XPATH)
-            actual_location = location_el.text.strip()
-            logging.info("  Expected city: '%s' | Actual: '%s'", expected_city, actual_location)
-            self.assertIn(
-                expected_city.lower(), actual_location.lower(),
-                f"Location mismatch: expected '{expected_city}' in '{actual_location}'"
-            )
-            logging.info("  LOCATION MATCHED")
-        except AssertionError as e:
-            self._take_screenshot(label, "validate_location")
-            logging.error("  LOCATION VALIDATION FAILED: %s", e)
-            raise e
-
-        # --- Date ---
-        logging.info("Validating DATE on results page...")
-        try:
-            date_el = self.driver.find_element(By.XPATH, locators.RESULTS_DATE_XPATH)
-            actual_date = date_el.text.strip()
-            logging.info("  Expected: '%s' | Actual: '%s'", expected_date, actual_date)
-            self.assertEqual(
-                expected_date, actual_date,
-                f"Date mismatch: expected '{expected_date}', got '{actual_date}'"
-            )
-            logging.info("  DATE MATCHED")
-        except AssertionError as e:
-            self._take_screenshot(label, "validate_date")
-            logging.error("  DATE VALIDATION FAILED: %s", e)
-            raise e
-
-        # --- Time ---
-        logging.info("Validating TIME on results page...")
-        try:
-            time_el = self.driver.find_element(By.XPATH, locators.RESULTS_TIME_XPATH)
-            actual_time = time_el.text.strip()
-            expected_site_time = self._convert_to_site_time_format(expected_time)
-            logging.info("  Expected: '%s' | Actual: '%s'", expected_site_time, actual_time)
-            self.assertEqual(
-                expected_site_time, actual_time,
-                f"Time mismatch: expected '{expected_site_time}', got '{actual_time}'"
-            )
-            logging.info("  TIME MATCHED")
-        except AssertionError as e:
-            self._take_screenshot(label, "validate_time")
-            logging.error("  TIME VALIDATION FAILED: %s", e)
-            raise e
+        summary = methods.read_results_summary(self.driver)
+        expected_site_time = self._convert_to_site_time_format(expected_time)
+        logging.info("  Expected: city '%s', date '%s', time '%s'", expected_city, expected_date, expected_site_time)
+        logging.info("  Actual:   location '%s', date '%s', time '%s'", summary.location, summary.date, summary.time)
+        problems = methods.results_mismatches(summary, expected_city, expected_date, expected_site_time)
+        if problems:
+            self._take_screenshot(label, "validate_results")
+            logging.error("  RESULTS VALIDATION FAILED:\n    %s", "\n    ".join(problems))
+            self.fail("Results page mismatch:\n" + "\n".join(problems))
 
         logging.info("========== ALL VALIDATIONS PASSED for '%s' ==========", label)
         return True
@@ -126,7 +97,7 @@ class TestModifySearch(BaseTestCase):
         """Dismiss any open dropdown, click Search, wait for results."""
         try:
             self.driver.find_element(By.TAG_NAME, "body").click()
-            _time.sleep(0.3)
+            waits.settle(self.driver, "modify.dismiss_dropdown", ceiling=0.3)
         except Exception:
             pass
 
@@ -135,7 +106,7 @@ class TestModifySearch(BaseTestCase):
             btn = self.driver.find_element(By.XPATH, search_button_xpath)
             self.driver.execute_script("arguments[0].click();", btn)
             logging.info("Search button clicked. Waiting for results page to load...")
-            _time.sleep(4)
+            waits.network_idle(self.driver, "modify.search_results", ceiling=4, alert_aware=True)
         except Exception as e:
             self._take_screenshot(label, "click_search")
             logging.error("FAILED to click search button: %s", e)
@@ -149,7 +120,7 @@ class TestModifySearch(BaseTestCase):
             self.driver.execute_script(
                 "document.querySelectorAll('.Toastify__toast').forEach(el => el.remove());"
             )
-            _time.sleep(0.3)
+            waits.settle(self.driver, "modify.remove_toasts", ceiling=0.3)
             wait = WebDriverWait(self.driver, 10)
             modify_btn = wait.until(
                 EC.element_to_be_clickable((By.XPATH, locators.RESULTS_PAGE_UNIQUE_XPATH))
@@ -159,12 +130,43 @@ class TestModifySearch(BaseTestCase):
             except Exception:
                 self.driver.execute_script("arguments[0].click();", modify_btn)
             logging.info("Modify button clicked. Search form should now be visible")
-            _time.sleep(1)
+            waits.settle(self.driver, "modify.open_form", ceiling=1)
         except Exception as e:
             self._take_screenshot(label, "click_modify")
             logging.error("FAILED to click Modify button: %s", e)
             self.fail(f"Click Modify failed: {e}")
 
+    def _initial_results(self, label, kind, service, values, expected):
+        """Reach the results page of a cross-tab test's initial search. Returns the next step number.
+
+        The page is restored from a saved link (results_link) when its summary
+        matches `expected` (city, date, time); otherwise the form is filled and
+        searched, and the result saved for the other tests that start from the
+        same search. Skips the test if the search shows no results.
+        """
+        fill_name, search_xpath = self._INITIAL_FORMS[kind]
+        link = ("modify", kind) + tuple(values)
+        if results_link.open_results(self.driver, link):
+            city, date, time_val = expected
+            summary = methods.read_results_summary(self.driver)
+            problems = methods.results_mismatches(summary, city, date, self._convert_to_site_time_format(time_val))
+            if not problems:
+                next_step = 3 + len(values)  # open, tab, one step per form value
+                logging.info("Steps 1-%d: %s results restored from a saved link", next_step - 1, service)
+                return next_step
+            logging.warning("Restored results do not match the search (%s) — searching through the form",
+                            "; ".join(problems))
+            results_link.mark_failed(link)
+
+        logging.info("Step 1: Opening the website")
+        methods.open_site(self.driver)
+        next_step = getattr(self, fill_name)(*values, label, 2)
+        self._dismiss_dropdown_and_search(label, search_xpath, next_step)
+        if not self._validate_results_page(label + "_initial", *expected):
+            self.skipTest(f"{service} initial search did not produce results — skipping cross-tab test")
+        results_link.capture(self.driver, link)
+        return next_step
+
     # ══════════════════════════════════════════════════════════════
     # Reusable form-fill helpers (for cross-tab modify tests)
     # ══════════════════════════════════════════════════════════════
@@ -177,13 +179,13 @@ class TestModifySearch(BaseTestCase):
         try:
             methods.safe_click(self.driver, By.XPATH, locators.AIRPORT_TRANSFER_TAB_XPATH, timeout=5)
         except Exception:
-            # Fallback: img[2] may be hidden when tab is inactive; click the anchor/li directly
-            logging.info("  img[2] not clickable, falling back to li[1]/a click via JS")
+            # Fallback: the tab link may be covered inside the Modify overlay; click it via JS
+            logging.info("  Airport Transfer tab not clickable, falling back to a JS click")
             tab_a = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, '//*[@id="myTab"]/li[1]/a'))
+                EC.presence_of_element_located((By.XPATH, locators.AIRPORT_TRANSFER_TAB_XPATH))
             )
             self.driver.execute_script("arguments[0].click();", tab_a)
-            _time.sleep(1)
+            waits.settle(self.driver, "modify.switch_tab", ceiling=1)
         step += 1
 
         logging.info("Step %d: Selecting direction '%s'", step, direction)
@@ -195,7 +197,7 @@ class TestModifySearch(BaseTestCase):
         try:
             city_input = self.driver.find_element(By.XPATH, locators.AIRPORT_CITY_XPATH)
             city_input.clear()
-            _time.sleep(0.5)
+            waits.settle(self.driver, "modify.clear_city", ceiling=0.5)
         except Exception:
             pass
         methods.type_and_select_first_option(
@@ -226,7 +228,7 @@ class TestModifySearch(BaseTestCase):
         try:
             city_input = self.driver.find_element(By.XPATH, locators.LOCAL_RENTAL_CITY_XPATH)
             city_input.clear()
-            _time.sleep(0.5)
+            waits.settle(self.driver, "modify.clear_city", ceiling=0.5)
         except Exception:
             pass
         methods.type_and_select_first_option(
@@ -329,7 +331,7 @@ class TestModifySearch(BaseTestCase):
         logging.info("Step 10: Changing city to '%s'", testvalue.MODIFY_CITY)
         city_input = self.driver.find_element(By.XPATH, locators.AIRPORT_CITY_XPATH)
         city_input.clear()
-        _time.sleep(0.5)
+        waits.settle(self.driver, "modify.clear_city", ceiling=0.5)
         methods.type_and_select_first_option(
             self.driver, locators.AIRPORT_CITY_XPATH, testvalue.MODIFY_CITY,
             first_option_xpath=locators.AIRPORT_CITY_FIRST_OPTION_XPATH,
@@ -413,7 +415,7 @@ class TestModifySearch(BaseTestCase):
         logging.info("Step 10: Changing city to '%s'", testvalue.MODIFY_DROP_CITY)
         city_input = self.driver.find_element(By.XPATH, locators.AIRPORT_CITY_XPATH)
         city_input.clear()
-        _time.sleep(0.5)
+        waits.settle(self.driver, "modify.clear_city", ceiling=0.5)
         methods.type_and_select_first_option(
             self.driver, locators.AIRPORT_CITY_XPATH, testvalue.MODIFY_DROP_CITY,
             first_option_xpath=locators.AIRPORT_CITY_FIRST_OPTION_XPATH,
@@ -512,7 +514,7 @@ class TestModifySearch(BaseTestCase):
         logging.info("Step 10: Changing city to '%s'", testvalue.MODIFY_LR_CITY)
         city_input = self.driver.find_element(By.XPATH, locators.LOCAL_RENTAL_CITY_XPATH)
         city_input.clear()
-        _time.sleep(0.5)
+        waits.settle(self.driver, "modify.clear_city", ceiling=0.5)
         methods.type_and_select_first_option(
             self.driver, locators.LOCAL_RENTAL_CITY_XPATH, testvalue.MODIFY_LR_CITY,
             first_option_xpath=locators.LOCAL_RENTAL_CITY_FIRST_OPTION_XPATH,
@@ -561,12 +563,12 @@ class TestModifySearch(BaseTestCase):
         except Exception:
             pass
         input_el.click()
-        _time.sleep(0.5)
+        waits.settle(self.driver, "pac.focus", ceiling=0.5)
         input_el.send_keys(value)
 
         # Wait for a VISIBLE pac-container with pac-items
         for attempt in range(3):
-            _time.sleep(2)
+            waits.until(self.driver, "pac.suggestions", _visible_pac_items, ceiling=2)
             try:
                 containers = self.driver.find_elements(By.CSS_SELECTOR, "div.pac-container")
                 for container in containers:
@@ -576,24 +578,24 @@ class TestModifySearch(BaseTestCase):
                             # Use ActionChains for a real mouse click on pac-item
                             from selenium.webdriver.common.action_chains import ActionChains
                             ActionChains(self.driver).move_to_element(items[0]).click().perform()
-                            _time.sleep(1)
+                            waits.settle(self.driver, "pac.select", ceiling=1)
                             logging.info("Google Places suggestion selected for '%s' (attempt %d)", value, attempt + 1)
                             new_val = input_el.get_attribute("value")
                             logging.info("  Input value after selection: '%s'", new_val)
                             # Force-close any remaining pac-container by pressing Escape
                             from selenium.webdriver.common.keys import Keys
                             input_el.send_keys(Keys.ESCAPE)
-                            _time.sleep(0.5)
+                            waits.settle(self.driver, "pac.escape", ceiling=0.5)
                             # Click body to fully dismiss
                             self.driver.find_element(By.TAG_NAME, "body").click()
-                            _time.sleep(0.5)
+                            waits.settle(self.driver, "pac.dismiss", ceiling=0.5)
                             return
             except Exception:
                 pass
             logging.info("No visible pac-items found for '%s' (attempt %d), retrying...", value, attempt + 1)
             try:
                 input_el.clear()
-                _time.sleep(0.3)
+                waits.settle(self.driver, "pac.clear", ceiling=0.3)
                 input_el.send_keys(value)
             except Exception:
                 pass
@@ -602,7 +604,7 @@ class TestModifySearch(BaseTestCase):
         from selenium.webdriver.common.keys import Keys
         input_el.send_keys(Keys.ARROW_DOWN)
         input_el.send_keys(Keys.ENTER)
-        _time.sleep(1)
+        waits.settle(self.driver, "pac.keyboard_select", ceiling=1)
 
     # ══════════════════════════════════════════════════════════════
     # TEST 4: Outstation Trip
@@ -697,7 +699,7 @@ class TestModifySearch(BaseTestCase):
             "el.dispatchEvent(new Event('change', { bubbles: true })); }",
             testvalue.MODIFY_OS_DATE
         )
-        _time.sleep(0.5)
+        waits.settle(self.driver, "modify.set_os_date", ceiling=0.5)
 
         logging.info("Step 12: Setting time to '%s'", testvalue.MODIFY_OS_TIME)
         methods.set_time(self.driver, locators.OUTSTATION_TIME_XPATH, testvalue.MODIFY_OS_TIME)
@@ -736,18 +738,12 @@ class TestModifySearch(BaseTestCase):
         logging.info("STARTING TEST: Airport Pickup → Local Rental (Cross-Tab)")
         logging.info("============================================================")
 
-        # ── Initial search: Airport Pickup ──
-        logging.info("Step 1: Opening the website")
-        methods.open_site(self.driver)
-        next_step = self._fill_airport_form(
-            testvalue.BEST_DIRECTION, testvalue.BEST_CITY,
-            testvalue.BEST_DATE, testvalue.BEST_TIME, label, 2
+        # ── Initial search: Airport Pickup (restored from a saved link once built) ──
+        next_step = self._initial_results(
+            label, "airport", "Airport Pickup",
+            (testvalue.BEST_DIRECTION, testvalue.BEST_CITY, testvalue.BEST_DATE, testvalue.BEST_TIME),
+            (testvalue.BEST_CITY, testvalue.BEST_DATE, testvalue.BEST_TIME),
         )
-        self._dismiss_dropdown_and_search(label, locators.AIRPORT_SEARCH_BUTTON_XPATH, next_step)
-
-        loaded = self._validate_results_page(label + "_initial", testvalue.BEST_CITY, testvalue.BEST_DATE, testvalue.BEST_TIME)
-        if not loaded:
-            self.skipTest("Airport Pickup initial search did not produce results — skipping cross-tab test")
 
         # ── Modify → Local Rental ──
         self._click_modify(label, next_step + 1)
@@ -784,18 +780,12 @@ class TestModifySearch(BaseTestCase):
         logging.info("STARTING TEST: Airport Pickup → Airport Drop (Cross-Tab)")
         logging.info("============================================================")
 
-        # ── Initial search: Airport Pickup ──
-        logging.info("Step 1: Opening the website")
-        methods.open_site(self.driver)
-        next_step = self._fill_airport_form(
-            testvalue.BEST_DIRECTION, testvalue.BEST_CITY,
-            testvalue.BEST_DATE, testvalue.BEST_TIME, label, 2
+        # ── Initial search: Airport Pickup (restored from a saved link once built) ──
+        next_step = self._initial_results(
+            label, "airport", "Airport Pickup",
+            (testvalue.BEST_DIRECTION, testvalue.BEST_CITY, testvalue.BEST_DATE, testvalue.BEST_TIME),
+            (testvalue.BEST_CITY, testvalue.BEST_DATE, testvalue.BEST_TIME),
         )
-        self._dismiss_dropdown_and_search(label, locators.AIRPORT_SEARCH_BUTTON_XPATH, next_step)
-
-        loaded = self._validate_results_page(label + "_initial", testvalue.BEST_CITY, testvalue.BEST_DATE, testvalue.BEST_TIME)
-        if not loaded:
-            self.skipTest("Airport Pickup initial search did not produce results — skipping cross-tab test")
 
         # ── Modify → Airport Drop ──
         self._click_modify(label, next_step + 1)
@@ -832,18 +822,12 @@ class TestModifySearch(BaseTestCase):
         logging.info("STARTING TEST: Airport Drop → Local Rental (Cross-Tab)")
         logging.info("============================================================")
 
-        # ── Initial search: Airport Drop ──
-        logging.info("Step 1: Opening the website")
-        methods.open_site(self.driver)
-        next_step = self._fill_airport_form(
-            testvalue.DROP_BEST_DIRECTION, testvalue.DROP_BEST_CITY,
-            testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME, label, 2
+        # ── Initial search: Airport Drop (restored from a saved link once built) ──
+        next_step = self._initial_results(
+            label, "airport", "Airport Drop",
+            (testvalue.DROP_BEST_DIRECTION, testvalue.DROP_BEST_CITY, testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME),
+            (testvalue.DROP_BEST_CITY, testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME),
         )
-        self._dismiss_dropdown_and_search(label, locators.AIRPORT_SEARCH_BUTTON_XPATH, next_step)
-
-        loaded = self._validate_results_page(label + "_initial", testvalue.DROP_BEST_CITY, testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME)
-        if not loaded:
-            self.skipTest("Airport Drop initial search did not produce results — skipping cross-tab test")
 
         # ── Modify → Local Rental ──
         self._click_modify(label, next_step + 1)
@@ -880,18 +864,12 @@ class TestModifySearch(BaseTestCase):
         logging.info("STARTING TEST: Airport Drop → Airport Pickup (Cross-Tab)")
         logging.info("============================================================")
 
-        # ── Initial search: Airport Drop ──
-        logging.info("Step 1: Opening the website")
-        methods.open_site(self.driver)
-        next_step = self._fill_airport_form(
-            testvalue.DROP_BEST_DIRECTION, testvalue.DROP_BEST_CITY,
-            testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME, label, 2
+        # ── Initial search: Airport Drop (restored from a saved link once built) ──
+        next_step = self._initial_results(
+            label, "airport", "Airport Drop",
+            (testvalue.DROP_BEST_DIRECTION, testvalue.DROP_BEST_CITY, testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME),
+            (testvalue.DROP_BEST_CITY, testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME),
         )
-        self._dismiss_dropdown_and_search(label, locators.AIRPORT_SEARCH_BUTTON_XPATH, next_step)
-
-        loaded = self._validate_results_page(label + "_initial", testvalue.DROP_BEST_CITY, testvalue.DROP_BEST_DATE, testvalue.DROP_BEST_TIME)
-        if not loaded:
-            self.skipTest("Airport Drop initial search did not produce results — skipping cross-tab test")
 
         # ── Modify → Airport Pickup ──
         self._click_modify(label, next_step + 1)
@@ -928,18 +906,12 @@ class TestModifySearch(BaseTestCase):
         logging.info("STARTING TEST: Local Rental → Airport Pickup (Cross-Tab)")
         logging.info("============================================================")
 
-        # ── Initial search: Local Rental ──
-        logging.info("Step 1: Opening the website")
-        methods.open_site(self.driver)
-        next_step = self._fill_local_rental_form(
-            testvalue.LR_BEST_CITY, testvalue.LR_BEST_PACKAGE,
-            testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME, label, 2
+        # ── Initial search: Local Rental (restored from a saved link once built) ──
+        next_step = self._initial_results(
+            label, "local_rental", "Local Rental",
+            (testvalue.LR_BEST_CITY, testvalue.LR_BEST_PACKAGE, testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME),
+            (testvalue.LR_BEST_CITY, testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME),
         )
-        self._dismiss_dropdown_and_search(label, locators.LOCAL_RENTAL_SEARCH_BUTTON_XPATH, next_step)
-
-        loaded = self._validate_results_page(label + "_initial", testvalue.LR_BEST_CITY, testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME)
-        if not loaded:
-            self.skipTest("Local Rental initial search did not produce results — skipping cross-tab test")
 
         # ── Modify → Airport Pickup ──
         self._click_modify(label, next_step + 1)
@@ -976,18 +948,12 @@ class TestModifySearch(BaseTestCase):
         logging.info("STARTING TEST: Local Rental → Airport Drop (Cross-Tab)")
         logging.info("============================================================")
 
-        # ── Initial search: Local Rental ──
-        logging.info("Step 1: Opening the website")
-        methods.open_site(self.driver)
-        next_step = self._fill_local_rental_form(
-            testvalue.LR_BEST_CITY, testvalue.LR_BEST_PACKAGE,
-            testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME, label, 2
+        # ── Initial search: Local Rental (restored from a saved link once built) ──
+        next_step = self._initial_results(
+            label, "local_rental", "Local Rental",
+            (testvalue.LR_BEST_CITY, testvalue.LR_BEST_PACKAGE, testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME),
+            (testvalue.LR_BEST_CITY, testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME),
         )
-        self._dismiss_dropdown_and_search(label, locators.LOCAL_RENTAL_SEARCH_BUTTON_XPATH, next_step)
-
-        loaded = self._validate_results_page(label + "_initial", testvalue.LR_BEST_CITY, testvalue.LR_BEST_DATE, testvalue.LR_BEST_TIME)
-        if not loaded:
-            self.skipTest("Local Rental initial search did not produce results — skipping cross-tab test")
 
         # ── Modify → Airport Drop ──
         self._click_modify(label, next_step + 1)
@@ -23,6 +23,75 @@ class TestOutstationTrip(ServiceBaseTestCase):
     _search_button_xpath = locators.OUTSTATION_SEARCH_BUTTON_XPATH
     _service_label = "Outstation"
 
+    def _fill_form(self, label, todo, trip_type, from_city, to_city, date, time, go_to_payment):
+        """Run the form steps named in `todo`."""
+        if "open" in todo:
+            self._open_site(label, logged_in=go_to_payment)
+        if "tab" in todo:
+            self._click_tab(label)
+
+        # 3) Select trip type from dropdown
+        if "trip_type" in todo:
+            logging.info("Step 3: Selecting trip type '%s' from dropdown", trip_type)
+            try:
+                wait = WebDriverWait(self.driver, 15)
+                select_elem = wait.until(EC.element_to_be_clickable((By.XPATH, locators.OUTSTATION_TRIP_TYPE_XPATH)))
+                logging.info("Waiting for trip type dropdown options to load from server...")
+                WebDriverWait(self.driver, 10).until(
+                    lambda d: len(Select(d.find_element(By.XPATH, locators.OUTSTATION_TRIP_TYPE_XPATH)).options) > 1
+                )
+                sel = Select(select_elem)
+                options = [o.text.strip() for o in sel.options if o.text.strip() and o.get_attribute("value")]
+                match = next((o for o in options if trip_type.lower() in o.lower()), None)
+                if match:
+                    sel.select_by_visible_text(match)
+                    logging.info("Trip type '%s' selected successfully by matching text", match)
+                else:
+                    sel.select_by_index(1)
+                    logging.info("Trip type selected by index 1 (available options: %s)", options)
+            except Exception as e:
+                self._take_screenshot(label, "trip_type")
+                logging.error("FAILED to select trip type: %s", e)
+                self.fail(f"Trip type select failed: {e}")
+
+        # 4) Type From City and select first suggestion
+        if "from_city" in todo:
+            logging.info("Step 4: Typing 'From' city '%s' and selecting from suggestions", from_city)
+            try:
+                methods.type_and_select_first_option(
+                    self.driver,
+                    locators.OUTSTATION_FROM_CITY_XPATH,
+                    from_city,
+                    first_option_xpath=locators.OUTSTATION_FROM_CITY_FIRST_OPTION_XPATH,
+                )
+                logging.info("From city '%s' entered and first suggestion selected", from_city)
+            except Exception as e:
+                self._take_screenshot(label, "from_city")
+                logging.error("FAILED to enter 'From' city: %s", e)
+                self.fail(f"From city input failed: {e}")
+
+        # 5) Type To City and select first suggestion
+        if "to_city" in todo:
+            logging.info("Step 5: Typing 'To' city '%s' and selecting from suggestions", to_city)
+            try:
+                methods.type_and_select_first_option(
+                    self.driver,
+                    locators.OUTSTATION_TO_CITY_XPATH,
+                    to_city,
+                    first_option_xpath=locators.OUTSTATION_TO_CITY_FIRST_OPTION_XPATH,
+                )
+                logging.info("To city '%s' entered and first suggestion selected", to_city)
+            except Exception as e:
+                self._take_screenshot(label, "to_city")
+                logging.error("FAILED to enter 'To' city: %s", e)
+                self.fail(f"To city input failed: {e}")
+
+        # 6-7) Set date and time
+        if "date" in todo:
+            self._set_date(label, locators.OUTSTATION_DATE_XPATH, date)
+        if "time" in todo:
+            self._set_time(label, locators.OUTSTATION_TIME_XPATH, time)
+
     def _run_search(self, label, trip_type, from_city, to_city, date, time, go_to_payment=False, validate=False):
         """Core search flow — reused for all test cases."""
 
@@ -32,65 +101,18 @@ class TestOutstationTrip(ServiceBaseTestCase):
         logging.info("  Payment flow: %s | Validation: %s", go_to_payment, validate)
         logging.info("============================================================")
 
-        self._open_site(label)
-        self._click_tab(label)
-
-        # 3) Select trip type from dropdown
-        logging.info("Step 3: Selecting trip type '%s' from dropdown", trip_type)
-        try:
-            wait = WebDriverWait(self.driver, 15)
-            select_elem = wait.until(EC.element_to_be_clickable((By.XPATH, locators.OUTSTATION_TRIP_TYPE_XPATH)))
-            logging.info("Waiting for trip type dropdown options to load from server...")
-            WebDriverWait(self.driver, 10).until(
-                lambda d: len(Select(d.find_element(By.XPATH, locators.OUTSTATION_TRIP_TYPE_XPATH)).options) > 1
-            )
-            sel = Select(select_elem)
-            options = [o.text.strip() for o in sel.options if o.text.strip() and o.get_attribute("value")]
-            match = next((o for o in options if trip_type.lower() in o.lower()), None)
-            if match:
-                sel.select_by_visible_text(match)
-                logging.info("Trip type '%s' selected successfully by matching text", match)
-            else:
-                sel.select_by_index(1)
-                logging.info("Trip type selected by index 1 (available options: %s)", options)
-        except Exception as e:
-            self._take_screenshot(label, "trip_type")
-            logging.error("FAILED to select trip type: %s", e)
-            self.fail(f"Trip type select failed: {e}")
-
-        # 4) Type From City and select first suggestion
-        logging.info("Step 4: Typing 'From' city '%s' and selecting from suggestions", from_city)
-        try:
-            methods.type_and_select_first_option(
-                self.driver,
-                locators.OUTSTATION_FROM_CITY_XPATH,
-                from_city,
-                first_option_xpath=locators.OUTSTATION_FROM_CITY_FIRST_OPTION_XPATH,
-            )
-            logging.info("From city '%s' entered and first suggestion selected", from_city)
-        except Exception as e:
-            self._take_screenshot(label, "from_city")
-            logging.error("FAILED to enter 'From' city: %s", e)
-            self.fail(f"From city input failed: {e}")
-
-        # 5) Type To City and select first suggestion
-        logging.info("Step 5: Typing 'To' city '%s' and selecting from suggestions", to_city)
-        try:
-            methods.type_and_select_first_option(
-                self.driver,
-                locators.OUTSTATION_TO_CITY_XPATH,
-                to_city,
-                first_option_xpath=locators.OUTSTATION_TO_CITY_FIRST_OPTION_XPATH,
-            )
-            logging.info("To city '%s' entered and first suggestion selected", to_city)
-        except Exception as e:
-            self._take_screenshot(label, "to_city")
-            logging.error("FAILED to enter 'To' city: %s", e)
-            self.fail(f"To city input failed: {e}")
-
-        # 6-7) Set date and time
-        self._set_date(label, locators.OUTSTATION_DATE_XPATH, date)
-        self._set_time(label, locators.OUTSTATION_TIME_XPATH, time)
+        steps = [
+            ("open", go_to_payment),
+            ("tab", self._service_label),
+            ("trip_type", trip_type),
+            ("from_city", from_city),
+            ("to_city", to_city),
+            ("date", date),
+            ("time", time),
+        ]
+        self._fill_form_steps(
+            steps, lambda todo: self._fill_form(label, todo, trip_type, from_city, to_city, date, time, go_to_payment)
+        )
 
         # 8) Dismiss dropdown, click search, post-search flow
         self._dismiss_dropdown()
@@ -9,19 +9,25 @@ import time as _time
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
 from datetime import datetime
-from PIL import ImageGrab
+import accounts
 import allure
+import browser_pool
+import command_stats
 import locators
 import methods
+import otp_limiter
+import resource_policy
+import scenario_tree
+import screenshots
+import session_cache
+import state_reset
 import testvalue
+import waits
 
 SCREENSHOT_DIR = os.path.join(os.path.dirname(__file__), "..", "screenshots")
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
@@ -33,78 +39,154 @@ class BaseTestCase(unittest.TestCase):
     """Shared setup, teardown, and screenshot utilities for all test suites."""
 
     screenshot_count = 0
+    screenshot_dir = SCREENSHOT_DIR
     _test_name = "Base"
+    # resource_policy preset: "none", "forms-only" or "keep-places"
+    _resource_policy = "none"
+    # Set by async_runner, which logs the stats reports once for the whole run
+    _defer_reports = False
 
     @classmethod
     def setUpClass(cls):
-        logging.info("Starting Chrome browser for %s tests", cls._test_name)
-        cls._chrome_options = webdriver.ChromeOptions()
-        cls._chrome_options.add_argument("--start-maximized")
-        cls._chrome_options.add_argument("--window-size=1920,1080")
-        cls.driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()),
-            options=cls._chrome_options,
-        )
+        if os.environ.get("B2C_SCREENSHOT_PER_SUITE"):
+            # Parallel workers share label names (e.g. "future_date") — keep each suite's files apart
+            cls.screenshot_dir = os.path.join(SCREENSHOT_DIR, cls.__name__)
+            os.makedirs(cls.screenshot_dir, exist_ok=True)
+        logging.info("Leasing Chrome browser from the pool for %s tests", cls._test_name)
+        cls.driver = browser_pool.get_pool().lease()
         cls.wait = methods.get_wait(cls.driver)
-        existing = [f for f in os.listdir(SCREENSHOT_DIR) if f.endswith(".png")]
+        cls._apply_resource_policy()
+        existing = [f for f in os.listdir(cls.screenshot_dir) if f.endswith(".png")]
         cls.screenshot_count = len(existing)
         logging.info("Chrome browser is ready. Screenshot count starts at %d", cls.screenshot_count)
 
     @classmethod
     def tearDownClass(cls):
-        logging.info("All tests finished. Closing Chrome browser now")
+        screenshots.flush()
+        if not cls._defer_reports:
+            waits.log_report(cls._test_name)
+            otp_limiter.log_report(cls._test_name)
+            state_reset.log_report(cls._test_name)
+            command_stats.log_report(cls._test_name, f"{cls.__module__}.{cls.__qualname__}.")
+            resource_policy.save_sizes()
+        logging.info("All tests finished. Returning Chrome browser to the pool")
         try:
-            cls.driver.quit()
-            logging.info("Chrome browser closed successfully")
+            browser_pool.get_pool().release(cls.driver)
         except Exception:
             pass
 
+    @classmethod
+    def _apply_resource_policy(cls):
+        try:
+            cls._resource_policy_in_effect = resource_policy.apply(cls.driver, cls._resource_policy)
+        except Exception as e:
+            logging.warning("Could not apply resource policy '%s': %s", cls._resource_policy, e)
+            cls._resource_policy_in_effect = "none"
+        resource_policy.drain(cls.driver)  # start the per-test report from here
+
+    def _log_resource_usage(self):
+        usage = resource_policy.drain(self.driver)
+        if usage is None:
+            return
+        if self._resource_policy_in_effect == "none":
+            resource_policy.remember_sizes(usage)
+        logging.info("Resources for %s [%s]: %s", self._testMethodName,
+                     self._resource_policy_in_effect, resource_policy.describe(usage))
+
+    def run(self, result=None):
+        command_stats.set_test(self.id())  # WebDriver commands from here on count for this test
+        try:
+            return super().run(result)
+        finally:
+            command_stats.set_test(None)
+
+    @property
+    def account(self):
+        """Test account (mobile, otp, nickname) leased for this test on first use, released in tearDown."""
+        if "_account" not in self.__dict__:
+            self._account = accounts.lease(self.id())
+        return self._account
+
     def tearDown(self):
         """Auto-capture error screenshot when test fails or is interrupted."""
         try:
-            if not getattr(self._outcome, 'success', True):
+            self._log_resource_usage()
+        except Exception:
+            pass
+        if "_account" in self.__dict__:
+            try:
+                accounts.release(self.__dict__.pop("_account"), self.id())
+            except Exception as e:
+                logging.warning("Could not release test account: %s", e)
+        try:
+            failed = not getattr(self._outcome, 'success', True)
+            if failed:
                 self._take_screenshot(self._testMethodName, "error_state")
+            ring = self.__dict__.pop("_step_ring", None)
+            if failed and ring:
+                logging.info("Test failed — saving the last %d step screenshots", len(ring))
+                for label, step_name, png in ring.drain():
+                    self._save_screenshot(label, step_name, png)
         except Exception:
             pass
 
     def _take_screenshot(self, label, step_name):
+        try:
+            png = screenshots.capture(self.driver)
+        except Exception as e:
+            logging.error("Failed to capture screenshot: %s", e)
+            return
+        if screenshots.failure_only():
+            self._buffer_screenshot(label, step_name, png)
+        else:
+            self._save_screenshot(label, step_name, png)
+
+    def _buffer_screenshot(self, label, step_name, png):
+        """Keep a capture in memory; it is written only if tearDown sees a failure."""
+        if "_step_ring" not in self.__dict__:
+            self._step_ring = screenshots.StepRing()
+        self._step_ring.add(label, step_name, png)
+        logging.info("Screenshot for step '%s' buffered in memory", step_name)
+
+    def _save_screenshot(self, label, step_name, png):
         cls = type(self)
         cls.screenshot_count += 1
         count = cls.screenshot_count
         filename = f"{label}_{count}_{step_name}.png"
-        path = os.path.join(SCREENSHOT_DIR, filename)
-        logging.info("Taking screenshot for step '%s' and saving to: %s", step_name, path)
+        path = os.path.join(self.screenshot_dir, filename)
+        logging.info("Saving screenshot for step '%s' to: %s", step_name, path)
         try:
-            self.driver.save_screenshot(path)
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name=f"{label}_{step_name}",
-                attachment_type=allure.attachment_type.PNG,
-            )
-            logging.info("Screenshot saved successfully and attached to Allure report")
+            screenshots.save_async(path, png)
+            allure.attach(png, name=f"{label}_{step_name}", attachment_type=allure.attachment_type.PNG)
+            logging.info("Screenshot queued for writing and attached to Allure report")
         except Exception as e:
             logging.error("Failed to save screenshot: %s", e)
 
     def _capture_alert_if_present(self, label):
-        """Check for JS alert popup — if found, capture desktop screenshot and dismiss."""
+        """Check for JS alert popup — if found, record its text, accept it and capture the page with a replica of it."""
         try:
             alert = self.driver.switch_to.alert
             alert_text = alert.text
-            logging.warning("JS alert detected: %s", alert_text)
-            cls = type(self)
-            cls.screenshot_count += 1
-            count = cls.screenshot_count
-            filename = f"{label}_{count}_error_popup.png"
-            path = os.path.join(SCREENSHOT_DIR, filename)
-            desktop_img = ImageGrab.grab()
-            desktop_img.save(path)
-            with open(path, "rb") as f:
-                allure.attach(f.read(), name=f"{label}_error_popup",
-                              attachment_type=allure.attachment_type.PNG)
+        except Exception:
+            return
+        logging.warning("JS alert detected: %s", alert_text)
+        try:
+            # The page cannot be captured while a native alert is open
             alert.accept()
-            logging.info("Error popup screenshot saved and alert dismissed")
         except Exception:
             pass
+        try:
+            allure.attach(alert_text, name=f"{label}_error_popup_text",
+                          attachment_type=allure.attachment_type.TEXT)
+            png = screenshots.capture_alert(self.driver, alert_text)
+        except Exception as e:
+            logging.error("Failed to capture error popup: %s", e)
+            return
+        if screenshots.failure_only():
+            self._buffer_screenshot(label, "error_popup", png)
+        else:
+            self._save_screenshot(label, "error_popup", png)
+        logging.info("Error popup captured and alert dismissed")
 
     def _dismiss_alert(self):
         """Dismiss any browser alert if present. Returns alert text or None."""
@@ -113,7 +195,7 @@ class BaseTestCase(unittest.TestCase):
             text = alert.text
             logging.warning("Alert detected: %s", text)
             alert.accept()
-            _time.sleep(0.5)
+            waits.settle(self.driver, "dismiss_alert", ceiling=0.5, alert_aware=True)
             return text
         except Exception:
             return None
@@ -136,9 +218,46 @@ class BaseTestCase(unittest.TestCase):
 class ServiceBaseTestCase(BaseTestCase):
     """Shared logic for the 4 service search test suites."""
 
+    # Outstation cities and the traveller form's pickup location use Google Places
+    _resource_policy = "keep-places"
+
     _tab_xpath = None
     _search_button_xpath = None
     _service_label = None
+    # Form page left by the previous test (scenario_tree.Checkpoint)
+    _checkpoint = None
+    # Set when a form step (date, time) fails to write its field
+    _form_step_failed = False
+
+    def tearDown(self):
+        if not getattr(self._outcome, 'success', True):
+            type(self)._checkpoint = None  # page state after a failure is unknown
+        super().tearDown()
+
+    def _pending_form_steps(self, steps):
+        """Names of the form steps still to run; the leading ones the page already holds are left out."""
+        scenario_tree.record(self.id(), steps)
+        done = scenario_tree.resume(self.driver, type(self)._checkpoint, steps)
+        type(self)._checkpoint = None
+        return {name for name, _ in steps[done:]}
+
+    def _fill_form_steps(self, steps, fill):
+        """Call fill(todo) with the pending step names, resuming from the previous test's form if possible.
+
+        A resumed form keeps the previous test's values in any field a step
+        fails to write, so if a step does not take effect the whole form is
+        filled again from the first step.
+        """
+        todo = self._pending_form_steps(steps)
+        self._form_step_failed = False
+        fill(todo)
+        if self._form_step_failed and len(todo) < len(steps):
+            logging.warning("A resumed form step did not take effect — filling the form again from step 1")
+            self._form_step_failed = False
+            fill({name for name, _ in steps})
+        # A form with a failed step is not a known state to resume from
+        if not self._form_step_failed:
+            type(self)._checkpoint = scenario_tree.take_checkpoint(self.driver, steps)
 
     def _convert_12h_to_24h(self, time_12h):
         """Convert '10:30 AM' or '2:45 PM' to '10:30' or '14:45'."""
@@ -160,64 +279,31 @@ class ServiceBaseTestCase(BaseTestCase):
             logging.warning("Results page did NOT load for '%s'. Page may have stayed on search form. Skipping validation", label)
             return
 
-        # --- Location ---
-        logging.info("Step 1 of 3: Validating LOCATION on results page...")
-        try:
-            location_el = self.driver.find_element(By.XPATH, locators.RESULTS_LOCATION_XPATH)
-            actual_location = location_el.text.strip()
-            logging.info("  Expected city: '%s'", expected_city)
-            logging.info("  Actual location on page: '%s'", actual_location)
-            self.assertIn(
-                expected_city.lower(), actual_location.lower(),
-                f"Location mismatch: expected '{expected_city}' in '{actual_location}'"
-            )
-            logging.info("  LOCATION MATCHED SUCCESSFULLY")
-        except AssertionError as e:
-            self._take_screenshot(label, "validate_location")
-            logging.error("  LOCATION VALIDATION FAILED: %s", e)
-            raise e
-
-        # --- Date ---
-        logging.info("Step 2 of 3: Validating DATE on results page...")
-        try:
-            date_el = self.driver.find_element(By.XPATH, locators.RESULTS_DATE_XPATH)
-            actual_date = date_el.text.strip()
-            logging.info("  Expected date: '%s'", expected_date)
-            logging.info("  Actual date on page: '%s'", actual_date)
-            self.assertEqual(
-                expected_date, actual_date,
-                f"Date mismatch: expected '{expected_date}', got '{actual_date}'"
-            )
-            logging.info("  DATE MATCHED SUCCESSFULLY")
-        except AssertionError as e:
-            self._take_screenshot(label, "validate_date")
-            logging.error("  DATE VALIDATION FAILED: %s", e)
-            raise e
-
-        # --- Time ---
-        logging.info("Step 3 of 3: Validating TIME on results page...")
-        try:
-            time_el = self.driver.find_element(By.XPATH, locators.RESULTS_TIME_XPATH)
-            actual_time = time_el.text.strip()
-            expected_time_24h = self._convert_12h_to_24h(expected_time)
-            logging.info("  Input time (12h): '%s' -> Converted to 24h: '%s'", expected_time, expected_time_24h)
-            logging.info("  Actual time on page: '%s'", actual_time)
-            self.assertEqual(
-                expected_time_24h, actual_time,
-                f"Time mismatch: expected '{expected_time_24h}', got '{actual_time}'"
-            )
-            logging.info("  TIME MATCHED SUCCESSFULLY")
-        except AssertionError as e:
-            self._take_screenshot(label, "validate_time")
-            logging.error("  TIME VALIDATION FAILED: %s", e)
-            raise e
+        summary = methods.read_results_summary(self.driver)
+        expected_time_24h = self._convert_12h_to_24h(expected_time)
+        logging.info("  Expected: city '%s', date '%s', time '%s'", expected_city, expected_date, expected_time_24h)
+        logging.info("  Actual:   location '%s', date '%s', time '%s'", summary.location, summary.date, summary.time)
+        problems = methods.results_mismatches(summary, expected_city, expected_date, expected_time_24h)
+        if problems:
+            self._take_screenshot(label, "validate_results")
+            logging.error("  RESULTS VALIDATION FAILED:\n    %s", "\n    ".join(problems))
+            self.fail("Results page mismatch:\n" + "\n".join(problems))
 
         logging.info("========== ALL VALIDATIONS PASSED for '%s' ==========", label)
 
     # ── Reusable search-flow helpers ──────────────────────────────────
 
-    def _open_site(self, label):
+    def _open_site(self, label, logged_in=False):
+        """Open the home page; `logged_in` restores the account's cached login session."""
         logging.info("Step 1: Opening the website %s", locators.URL)
+        if logged_in and session_cache.ENABLED:
+            try:
+                how = session_cache.open_logged_in(self.driver, self.account)
+                logging.info("Website opened (%s as %s)", how, self.account.mobile)
+                return
+            except Exception as e:
+                self._dismiss_alert()
+                logging.warning("Could not open a logged-in session (%s). Book Now will log in instead", e)
         try:
             methods.open_site(self.driver)
             logging.info("Website opened successfully")
@@ -243,6 +329,7 @@ class ServiceBaseTestCase(BaseTestCase):
         except Exception as e:
             self._take_screenshot(label, "date")
             logging.warning("FAILED to set date '%s': %s", date, e)
+            self._form_step_failed = True
 
     def _set_time(self, label, time_xpath, time):
         try:
@@ -251,11 +338,12 @@ class ServiceBaseTestCase(BaseTestCase):
         except Exception as e:
             self._take_screenshot(label, "time")
             logging.warning("FAILED to set time '%s': %s", time, e)
+            self._form_step_failed = True
 
     def _dismiss_dropdown(self):
         try:
             self.driver.find_element(By.TAG_NAME, "body").click()
-            _time.sleep(0.3)
+            waits.settle(self.driver, "dismiss_dropdown", ceiling=0.3)
         except Exception:
             pass
 
@@ -264,6 +352,7 @@ class ServiceBaseTestCase(BaseTestCase):
             btn = self.driver.find_element(By.XPATH, self._search_button_xpath)
             self.driver.execute_script("arguments[0].click();", btn)
             logging.info("Search button clicked")
+            waits.network_idle(self.driver, "search.network_idle", ceiling=3, alert_aware=True)
         except Exception as e:
             self._take_screenshot(label, "click_search")
             logging.error("FAILED to click search button: %s", e)
@@ -274,7 +363,7 @@ class ServiceBaseTestCase(BaseTestCase):
         logging.info("Starting payment flow (Book Now -> Login -> Fill Details -> Pay)")
         try:
             booked = methods.click_book_now_and_login(
-                self.driver, testvalue.LOGIN_VALID_MOBILE, testvalue.LOGIN_VALID_OTP
+                self.driver, self.account.mobile, self.account.otp
             )
         except Exception as e:
             self._take_screenshot(label, "book_now")
@@ -312,11 +401,12 @@ class ServiceBaseTestCase(BaseTestCase):
 
     def _post_search(self, label, city, date, time, go_to_payment, validate):
         """After clicking search: alert capture -> validate -> payment -> final_state."""
-        _time.sleep(0.5)
+        results_visible = EC.visibility_of_element_located((By.XPATH, locators.RESULTS_PAGE_UNIQUE_XPATH))
+        waits.until(self.driver, "post_search.alert_check", results_visible, ceiling=0.5, alert_aware=True)
         self._capture_alert_if_present(label)
 
         if go_to_payment:
-            _time.sleep(2.5)
+            waits.until(self.driver, "post_search.results", results_visible, ceiling=2.5, alert_aware=True)
             if validate:
                 self._validate_results_page(label, city, date, time)
             self._run_payment_flow(label, city, date, time)
@@ -336,18 +426,23 @@ class ServiceBaseTestCase(BaseTestCase):
 class LoginBaseTestCase(BaseTestCase):
     """Shared logic for the 2 login test suites."""
 
+    _resource_policy = "forms-only"
+
     def _send_otp_with_retry(self, label, max_retries=4):
-        """Click Send OTP with retry on rate limiting."""
+        """Click Send OTP with retry on rate limiting. Sends are paced by the shared per-mobile limiter."""
+        try:
+            mobile = self.driver.find_element(By.XPATH, locators.LOGIN_MOBILE_INPUT_XPATH).get_attribute("value")
+        except Exception:
+            mobile = None
         for attempt in range(max_retries):
             try:
-                methods.safe_click(self.driver, By.XPATH, locators.LOGIN_SEND_OTP_BUTTON_XPATH)
+                otp_limiter.acquire(mobile)
+                methods.click_send_otp(self.driver, "send_otp")
                 logging.info("Send OTP button clicked (attempt %d of %d)", attempt + 1, max_retries)
-                _time.sleep(1)
                 alert_text = self._dismiss_alert()
                 if alert_text and "error" in alert_text.lower():
-                    wait_sec = 15 * (attempt + 1)
-                    logging.warning("OTP rate limited. Waiting %d seconds before retry...", wait_sec)
-                    _time.sleep(wait_sec)
+                    logging.warning("OTP rate limited on attempt %d. Retrying when the limiter allows...", attempt + 1)
+                    otp_limiter.penalize(mobile)
                     continue
                 logging.info("OTP sent successfully")
                 return True
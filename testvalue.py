@@ -103,6 +103,13 @@ LOGIN_VALID_MOBILE   = "6239677566"
 LOGIN_VALID_OTP      = "111111"
 LOGIN_EXPECTED_NICKNAME = "nik"
 
+# ── Test accounts ───────────────────────────────────────────────
+# Leased one per test by accounts.py (a single account is shared by all
+# tests). Used when B2C_ACCOUNTS_FILE has no accounts for the backend under test.
+TEST_ACCOUNTS = [
+    {"mobile": LOGIN_VALID_MOBILE, "otp": LOGIN_VALID_OTP, "nickname": LOGIN_EXPECTED_NICKNAME},
+]
+
 # ── Invalid mobile ──────────────────────────────────────────────
 LOGIN_INVALID_MOBILE = "0000000000"
 LOGIN_INVALID_OTP    = "111111"
@@ -0,0 +1,155 @@
+# time_travel.py
+# Fast-forward time instead of sleeping through it (e.g. OTP expiry).
+#
+# Browser side: a fake clock installed at document start shifts Date and runs
+# due setTimeout/setInterval callbacks on advance(), so countdowns and
+# client-side expiry checks see the time as passed.
+# Server side: expiry enforced by the backend cannot be faked from the
+# browser, so time is only fast-forwarded when the server clock moves too:
+# when the suite runs against a local stand-in backend, set
+# B2C_SERVER_CLOCK_URL to its clock endpoint and advance() moves it as well.
+# Without it, advance() sleeps for real (the real backend expires OTPs on its
+# own clock).
+#
+# B2C_TIME_TRAVEL=fast forces the browser-only fast-forward (a stand-in
+# backend without expiry of its own); B2C_TIME_TRAVEL=real forces the sleep.
+
+import os
+import json
+import logging
+import urllib.request
+import time as _time
+
+# Stand-in backend endpoint; receives POST {"advance_seconds": N}
+SERVER_CLOCK_URL = os.environ.get("B2C_SERVER_CLOCK_URL")
+MODE = os.environ.get("B2C_TIME_TRAVEL", "fast" if SERVER_CLOCK_URL else "real")
+
+FAKE_CLOCK_JS = """
+(function () {
+    if (window.__b2cClock) { return; }
+    var RealDate = Date, realNow = Date.now.bind(Date);
+    var realSetTimeout = window.setTimeout.bind(window), realClearTimeout = window.clearTimeout.bind(window);
+    var offset = 0, nextId = 1, timers = {};
+
+    function now() { return realNow() + offset; }
+
+    function FakeDate() {
+        if (!(this instanceof FakeDate)) { return new RealDate(now()).toString(); }
+        if (arguments.length === 0) { return new RealDate(now()); }
+        return new (Function.prototype.bind.apply(RealDate, [null].concat(Array.prototype.slice.call(arguments))))();
+    }
+    FakeDate.prototype = RealDate.prototype;
+    FakeDate.now = now;
+    FakeDate.parse = RealDate.parse;
+    FakeDate.UTC = RealDate.UTC;
+    window.Date = FakeDate;
+
+    function fire(id) {
+        var t = timers[id];
+        if (!t) { return; }
+        if (t.interval) {
+            t.due += t.delay;
+            schedule(id);
+        } else {
+            delete timers[id];
+        }
+        if (typeof t.fn === 'function') { t.fn.apply(window, t.args); } else { (0, eval)(t.fn); }
+    }
+    function schedule(id) {
+        var t = timers[id];
+        t.real = realSetTimeout(function () { fire(id); }, Math.max(0, t.due - now()));
+    }
+    function add(fn, delay, args, interval) {
+        var id = nextId++;
+        delay = Math.max(interval ? 1 : 0, Number(delay) || 0);
+        timers[id] = {fn: fn, delay: delay, args: args, interval: interval, due: now() + delay};
+        schedule(id);
+        return id;
+    }
+    function clear(id) {
+        var t = timers[id];
+        if (t) { realClearTimeout(t.real); delete timers[id]; }
+    }
+    window.setTimeout = function (fn, delay) { return add(fn, delay, Array.prototype.slice.call(arguments, 2), false); };
+    window.setInterval = function (fn, delay) { return add(fn, delay, Array.prototype.slice.call(arguments, 2), true); };
+    window.clearTimeout = clear;
+    window.clearInterval = clear;
+
+    window.__b2cClock = {
+        // Move the clock forward and run every callback that came due, in order.
+        advance: function (ms) {
+            var target = now() + ms, fired = 0;
+            while (fired < 100000) {
+                var dueId = null;
+                for (var id in timers) {
+                    if (timers[id].due <= target && (dueId === null || timers[id].due < timers[dueId].due)) { dueId = id; }
+                }
+                if (dueId === null) { break; }
+                offset += Math.max(0, timers[dueId].due - now());
+                realClearTimeout(timers[dueId].real);
+                fire(dueId);
+                fired++;
+            }
+            offset += Math.max(0, target - now());
+            return fired;
+        },
+        offset: function () { return offset; }
+    };
+})();
+"""
+
+
+def enabled():
+    return MODE != "real"
+
+
+def install(driver):
+    """Install the fake clock for every new document in this session. Returns a handle for uninstall()."""
+    if not enabled():
+        return None
+    result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": FAKE_CLOCK_JS})
+    return result.get("identifier")
+
+
+def uninstall(driver, handle):
+    if handle is None:
+        return
+    try:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": handle})
+    except Exception:
+        pass
+
+
+def _advance_server(seconds):
+    request = urllib.request.Request(
+        SERVER_CLOCK_URL, data=json.dumps({"advance_seconds": seconds}).encode(),
+        headers={"Content-Type": "application/json"}, method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        response.read()
+
+
+def advance(driver, seconds):
+    """Let `seconds` pass for the page (and the stand-in server, if configured).
+
+    Sleeps for real unless fast-forwarding is enabled (see the header) and the
+    page has the fake clock. Returns a short description of what was done,
+    for the log.
+    """
+    if not enabled():
+        logging.info("Time travel: sleeping %ss for real (server clock cannot be moved)", seconds)
+        _time.sleep(seconds)
+        return "real sleep"
+    fired = driver.execute_script(
+        "return window.__b2cClock ? window.__b2cClock.advance(arguments[0]) : null;", seconds * 1000
+    )
+    if fired is None:
+        logging.warning("No fake clock on this page (install() before loading it) — sleeping for real")
+        _time.sleep(seconds)
+        return "real sleep"
+    done = f"browser clock, {fired} timer callbacks run"
+    if SERVER_CLOCK_URL:
+        _advance_server(seconds)
+        done += ", stand-in server clock"
+    logging.info("Time travel: fast-forwarded %ss (%s)", seconds, done)
+    return done
@@ -0,0 +1,102 @@
+# timings.py
+# Persistent per-test timing history and duration-aware shard planning
+# (longest-processing-time-first bin packing).
+
+import os
+import json
+import logging
+import statistics
+
+TIMINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_timings.json")
+
+# Estimates used until a test or suite has been timed at least once
+DEFAULT_TEST_SECONDS = 60.0
+DEFAULT_CLASS_SETUP_SECONDS = 10.0
+
+# Weight of the newest sample in the moving average
+SMOOTHING = 0.5
+
+
+def class_of(test_id):
+    """'pkg.module.Class.method' -> 'pkg.module.Class'."""
+    return test_id.rsplit(".", 1)[0]
+
+
+def load_history(path=TIMINGS_FILE):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return {"tests": data.get("tests", {}), "classes": data.get("classes", {})}
+    except (OSError, ValueError):
+        return {"tests": {}, "classes": {}}
+
+
+def save_history(history, path=TIMINGS_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _smooth(old, sample):
+    if old is None:
+        return round(sample, 3)
+    return round(SMOOTHING * sample + (1 - SMOOTHING) * old, 3)
+
+
+def record(history, summaries):
+    """Fold the timings of finished worker summaries into the history."""
+    for summary in summaries:
+        for test_id, seconds in summary.get("test_durations", {}).items():
+            history["tests"][test_id] = _smooth(history["tests"].get(test_id), seconds)
+        for class_id, seconds in summary.get("class_overheads", {}).items():
+            history["classes"][class_id] = _smooth(history["classes"].get(class_id), seconds)
+    return history
+
+
+def _estimator(history):
+    tests, classes = history["tests"], history["classes"]
+    test_default = statistics.median(tests.values()) if tests else DEFAULT_TEST_SECONDS
+    class_default = statistics.median(classes.values()) if classes else DEFAULT_CLASS_SETUP_SECONDS
+    return (lambda t: tests.get(t, test_default)), (lambda c: classes.get(c, class_default))
+
+
+def plan_shards(test_ids, count, history):
+    """Split test ids into `count` groups of roughly equal expected duration.
+
+    Tests are placed longest first onto the currently lightest group. A group
+    that does not yet contain a test's class is charged that class's setup
+    cost (browser start), so suites are not scattered across every worker
+    without need. Each group keeps the original test order, which keeps the
+    tests of a class contiguous and so runs setUpClass once per group.
+    """
+    test_cost, class_cost = _estimator(history)
+    order = {t: i for i, t in enumerate(test_ids)}
+    groups = [{"load": 0.0, "tests": [], "classes": set()} for _ in range(count)]
+
+    for test_id in sorted(test_ids, key=lambda t: (-test_cost(t), order[t])):
+        cls = class_of(test_id)
+
+        def cost(group):
+            extra = 0.0 if cls in group["classes"] else class_cost(cls)
+            return group["load"] + test_cost(test_id) + extra
+
+        group = min(groups, key=cost)
+        group["load"] = cost(group)
+        group["tests"].append(test_id)
+        group["classes"].add(cls)
+
+    for i, group in enumerate(groups):
+        logging.info("Shard %d/%d: %d tests, ~%.0fs expected", i + 1, count, len(group["tests"]), group["load"])
+    return [sorted(g["tests"], key=order.get) for g in groups]
+
+
+def parse_shard(value):
+    """'2/4' -> (2, 4), 1-based."""
+    try:
+        index, total = (int(p) for p in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like 'i/N', got '{value}'")
+    if not 1 <= index <= total:
+        raise ValueError(f"Shard index must be between 1 and {total}, got {index}")
+    return index, total
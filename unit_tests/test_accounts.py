@@ -0,0 +1,69 @@
+# unit_tests/test_accounts.py
+# Test account leases (no browser needed).
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import accounts
+import interprocess
+
+A = accounts.Account("1111111111", "111111", "a")
+B = accounts.Account("2222222222", "222222", "b")
+
+
+class TestLease(unittest.TestCase):
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        for patcher in (mock.patch.object(interprocess, "STATE_DIR", state_dir.name),
+                        mock.patch.object(accounts, "_accounts", [A, B]),
+                        mock.patch.object(accounts, "LEASE_WAIT_SECONDS", 0),
+                        mock.patch.object(accounts, "POLL_SECONDS", 0)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _leases(self):
+        with interprocess.locked_json(accounts.STATE_FILE) as leases:
+            return dict(leases)
+
+    def to_verify_each_holder_gets_its_own_account(self):
+        self.assertEqual(accounts.lease("t1"), A)
+        self.assertEqual(accounts.lease("t2"), B)
+        self.assertEqual({v["holder"] for v in self._leases().values()}, {"t1", "t2"})
+
+    def to_verify_release_frees_the_account(self):
+        accounts.lease("t1")
+        accounts.lease("t2")
+        accounts.release(A, "t1")
+        self.assertEqual(accounts.lease("t3"), A)
+
+    def to_verify_release_by_another_holder_is_ignored(self):
+        accounts.lease("t1")
+        accounts.release(A, "t2")
+        self.assertIn(accounts._key(A), self._leases())
+
+    def to_verify_lease_gives_up_when_all_accounts_are_taken(self):
+        accounts.lease("t1")
+        accounts.lease("t2")
+        with self.assertRaises(RuntimeError):
+            accounts.lease("t3")
+
+    def to_verify_stale_leases_are_dropped(self):
+        now = 10 ** 6
+        with interprocess.locked_json(accounts.STATE_FILE) as leases:
+            leases[accounts._key(A)] = {"holder": "old", "pid": os.getpid(),
+                                        "since": now - accounts.STALE_LEASE_SECONDS - 1}
+            leases[accounts._key(B)] = {"holder": "fresh", "pid": os.getpid(), "since": now - 1}
+        with mock.patch.object(accounts._time, "time", return_value=now):
+            self.assertEqual(accounts.lease("t1"), A)
+        self.assertEqual(self._leases()[accounts._key(A)]["holder"], "t1")
+        self.assertEqual(self._leases()[accounts._key(B)]["holder"], "fresh")
+
+    def to_verify_a_single_account_is_shared(self):
+        with mock.patch.object(accounts, "_accounts", [A]):
+            self.assertEqual(accounts.lease("t1"), A)
+            self.assertEqual(accounts.lease("t2"), A)
+        self.assertEqual(self._leases(), {})
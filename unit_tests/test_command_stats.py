@@ -0,0 +1,83 @@
+# unit_tests/test_command_stats.py
+# WebDriver command counting and @command_budget (no browser needed).
+
+import unittest
+
+import command_stats
+
+
+class _FakeExecutor:
+    def execute(self, command, params):
+        return {"value": None}
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.command_executor = _FakeExecutor()
+
+
+def _send(driver, n):
+    for _ in range(n):
+        driver.command_executor.execute("findElement", {})
+
+
+def _run(test):
+    """Run one TestCase the way BaseTestCase does (commands tagged with its id)."""
+    result = unittest.TestResult()
+    command_stats.set_test(test.id())
+    try:
+        test.run(result)
+    finally:
+        command_stats.set_test(None)
+    return result
+
+
+class TestCommandBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = _FakeDriver()
+        command_stats.install(self.driver)
+
+    def _case(self, limit, body):
+        class Budgeted(unittest.TestCase):
+            @command_stats.command_budget(limit)
+            def runTest(self):
+                body()
+
+        return Budgeted()
+
+    def to_verify_overrun_fails_the_test(self):
+        result = _run(self._case(3, lambda: _send(self.driver, 5)))
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn("5 WebDriver commands, over the budget of 3", result.failures[0][1])
+
+    def to_verify_test_within_budget_passes(self):
+        result = _run(self._case(5, lambda: _send(self.driver, 5)))
+        self.assertTrue(result.wasSuccessful())
+
+    def to_verify_reports_of_other_tests_do_not_reset_the_count(self):
+        def body():
+            _send(self.driver, 2)
+            command_stats.log_report("siblings", "")  # e.g. a concurrent test's tearDownClass
+            _send(self.driver, 2)
+
+        result = _run(self._case(3, body))
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn("4 WebDriver commands", result.failures[0][1])
+
+
+class TestLogReport(unittest.TestCase):
+
+    def to_verify_report_skips_and_keeps_running_tests(self):
+        driver = _FakeDriver()
+        command_stats.install(driver)
+        command_stats.set_test("m.Report.finished")
+        _send(driver, 2)
+        command_stats.set_test("m.Report.running")
+        _send(driver, 3)
+        try:
+            command_stats.log_report("Report", "m.Report.")
+            self.assertEqual(command_stats.by_caller("m.Report.finished"), [])
+            self.assertEqual(sum(n for _, n, _ in command_stats.by_caller("m.Report.running")), 3)
+        finally:
+            command_stats.set_test(None)
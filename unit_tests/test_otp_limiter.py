@@ -0,0 +1,44 @@
+# unit_tests/test_otp_limiter.py
+# OTP send pacing (no browser needed).
+
+import tempfile
+import unittest
+from unittest import mock
+
+import interprocess
+import otp_limiter
+
+MOBILE = "1111111111"
+
+
+class TestOtpLimiter(unittest.TestCase):
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.now = 1000.0
+        for patcher in (mock.patch.object(interprocess, "STATE_DIR", state_dir.name),
+                        mock.patch.object(otp_limiter, "BURST", None),
+                        mock.patch.object(otp_limiter, "INTERVAL_SECONDS", 15.0),
+                        mock.patch.object(otp_limiter, "PACE_WINDOW_SECONDS", 600.0),
+                        mock.patch.object(otp_limiter._time, "time", lambda: self.now),
+                        mock.patch.object(otp_limiter._time, "sleep")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def to_verify_sends_are_not_paced_before_a_rate_limit(self):
+        self.assertEqual([otp_limiter.acquire(MOBILE) for _ in range(5)], [0.0] * 5)
+
+    def to_verify_a_rate_limit_spaces_the_following_sends(self):
+        otp_limiter.penalize(MOBILE)
+        self.assertEqual([otp_limiter.acquire(MOBILE) for _ in range(3)], [15.0, 30.0, 45.0])
+
+    def to_verify_pacing_stops_after_the_window(self):
+        otp_limiter.penalize(MOBILE)
+        self.now += 601
+        self.assertEqual(otp_limiter.acquire(MOBILE), 0.0)
+        self.assertEqual(otp_limiter.acquire(MOBILE), 0.0)
+
+    def to_verify_configured_burst_paces_from_the_start(self):
+        with mock.patch.object(otp_limiter, "BURST", 2.0):
+            self.assertEqual([otp_limiter.acquire(MOBILE) for _ in range(3)], [0.0, 0.0, 15.0])
@@ -0,0 +1,115 @@
+# unit_tests/test_scenario_tree.py
+# Step-prefix ordering and checkpoint resume (no browser needed).
+
+import tempfile
+import unittest
+from unittest import mock
+
+import interprocess
+import scenario_tree
+
+
+def _steps(*values):
+    return [(f"s{i}", v) for i, v in enumerate(values)]
+
+
+class _FakeDriver:
+    """Just enough of a WebDriver for resume(): a URL and fixed form values."""
+
+    def __init__(self, url, values):
+        self.current_url = url
+        self.values = values
+
+    def execute_script(self, script, *args):
+        return self.values
+
+
+class TestSharedPrefix(unittest.TestCase):
+
+    def to_verify_prefix_length(self):
+        self.assertEqual(scenario_tree.shared_prefix(_steps("a", "b", "c"), _steps("a", "b", "x")), 2)
+        self.assertEqual(scenario_tree.shared_prefix(_steps("a", "b"), _steps("a", "b", "c")), 2)
+        self.assertEqual(scenario_tree.shared_prefix(_steps("x"), _steps("a")), 0)
+
+    def to_verify_values_compare_as_stored(self):
+        # Steps read back from the state file are lists of strings
+        stored = scenario_tree.normalize([("open", False), ("date", 5)])
+        self.assertEqual(scenario_tree.shared_prefix(stored, [("open", False), ("date", "5")]), 2)
+        self.assertEqual(scenario_tree.shared_prefix([("open", False)], [("open", "False")]), 0)
+
+
+class TestScenarioTree(unittest.TestCase):
+
+    def to_verify_depth_first_groups_longest_shared_prefixes(self):
+        tree = scenario_tree.ScenarioTree()
+        tree.add("t1", _steps("a", "b", "c1"))
+        tree.add("t2", _steps("x", "b", "c1"))
+        tree.add("t3", _steps("a", "b", "c2"))
+        tree.add("t4", _steps("a", "b"))
+        self.assertEqual(list(tree.depth_first()), ["t4", "t1", "t3", "t2"])
+
+    def to_verify_identical_steps_keep_insertion_order(self):
+        tree = scenario_tree.ScenarioTree()
+        tree.add("t1", _steps("a"))
+        tree.add("t2", _steps("a"))
+        self.assertEqual(list(tree.depth_first()), ["t1", "t2"])
+
+
+class TestOrder(unittest.TestCase):
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        for patcher in (mock.patch.object(interprocess, "STATE_DIR", state_dir.name),
+                        mock.patch.object(scenario_tree, "ENABLED", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def to_verify_order_within_each_class(self):
+        scenario_tree.record("m.A.a1", _steps("a", "b", "c1"))
+        scenario_tree.record("m.A.a2", _steps("x", "b", "c1"))
+        scenario_tree.record("m.A.a3", _steps("a", "b", "c2"))
+        scenario_tree.record("m.B.b1", _steps("a"))
+        ids = ["m.A.a1", "m.A.a2", "m.A.unrecorded", "m.A.a3", "m.B.b1"]
+        self.assertEqual(scenario_tree.order(ids), ["m.A.a1", "m.A.a3", "m.A.a2", "m.A.unrecorded", "m.B.b1"])
+
+    def to_verify_order_is_unchanged_when_disabled(self):
+        scenario_tree.record("m.A.a1", _steps("z"))
+        scenario_tree.record("m.A.a2", _steps("a"))
+        with mock.patch.object(scenario_tree, "ENABLED", False):
+            self.assertEqual(scenario_tree.order(["m.A.a1", "m.A.a2"]), ["m.A.a1", "m.A.a2"])
+
+
+class TestResume(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(scenario_tree, "ENABLED", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.previous = _steps("open", "tab", "pickup", "Delhi", "date1", "10:00 AM")
+        self.driver = _FakeDriver("https://site/", {"city#0": "Delhi"})
+        self.checkpoint = scenario_tree.take_checkpoint(self.driver, self.previous)
+
+    def to_verify_shared_steps_are_skipped_on_the_same_form(self):
+        steps = _steps("open", "tab", "pickup", "Delhi", "date1", "11:00 AM")
+        self.assertEqual(scenario_tree.resume(self.driver, self.checkpoint, steps), 5)
+
+    def to_verify_a_later_empty_value_forces_a_full_run(self):
+        steps = _steps("open", "tab", "pickup", "", "date1", "10:00 AM")
+        self.assertEqual(scenario_tree.resume(self.driver, self.checkpoint, steps), 0)
+
+    def to_verify_a_changed_form_forces_a_full_run(self):
+        steps = _steps("open", "tab", "pickup", "Delhi", "date2", "10:00 AM")
+        self.driver.values = {"city#0": "Mumbai"}
+        self.assertEqual(scenario_tree.resume(self.driver, self.checkpoint, steps), 0)
+
+    def to_verify_another_page_forces_a_full_run(self):
+        # e.g. the results page the previous search left; history is never used
+        steps = _steps("open", "tab", "pickup", "Delhi", "date1", "11:00 AM")
+        self.driver.current_url = "https://site/results"
+        self.assertEqual(scenario_tree.resume(self.driver, self.checkpoint, steps), 0)
+
+    def to_verify_nothing_is_reused_when_disabled(self):
+        steps = _steps("open", "tab", "pickup", "Delhi", "date1", "11:00 AM")
+        with mock.patch.object(scenario_tree, "ENABLED", False):
+            self.assertEqual(scenario_tree.resume(self.driver, self.checkpoint, steps), 0)
@@ -0,0 +1,53 @@
+# unit_tests/test_timings.py
+# Shard planning and --shard parsing (no browser needed).
+
+import unittest
+
+import timings
+
+
+def _history(tests, classes=None):
+    return {"tests": tests, "classes": classes or {}}
+
+
+class TestPlanShards(unittest.TestCase):
+
+    def to_verify_longest_tests_are_spread_and_classes_kept_together(self):
+        ids = ["m.A.a1", "m.A.a2", "m.B.b1"]
+        history = _history({"m.A.a1": 10, "m.A.a2": 10, "m.B.b1": 20}, {"m.A": 5, "m.B": 5})
+        self.assertEqual(timings.plan_shards(ids, 2, history), [["m.B.b1"], ["m.A.a1", "m.A.a2"]])
+
+    def to_verify_class_setup_is_charged_to_groups_without_the_class(self):
+        # a2 would fit on b1's lighter group, but that group would pay A's setup again
+        ids = ["m.A.a1", "m.A.a2", "m.B.b1"]
+        history = _history({"m.A.a1": 40, "m.A.a2": 5, "m.B.b1": 37}, {"m.A": 10, "m.B": 10})
+        self.assertEqual(timings.plan_shards(ids, 2, history), [["m.A.a1", "m.A.a2"], ["m.B.b1"]])
+
+    def to_verify_groups_keep_the_original_test_order(self):
+        ids = ["m.A.short", "m.A.long", "m.A.mid"]
+        history = _history({"m.A.short": 1, "m.A.long": 30, "m.A.mid": 10}, {"m.A": 0})
+        (group,) = timings.plan_shards(ids, 1, history)
+        self.assertEqual(group, ids)
+
+    def to_verify_untimed_tests_use_defaults_and_extra_groups_stay_empty(self):
+        ids = [f"m.A.t{i}" for i in range(4)]
+        groups = timings.plan_shards(ids, 3, _history({}))
+        self.assertEqual(sorted(len(g) for g in groups), [1, 1, 2])
+        self.assertEqual(sorted(t for g in groups for t in g), ids)
+        self.assertEqual(timings.plan_shards(ids[:1], 2, _history({}))[1], [])
+
+
+class TestParseShard(unittest.TestCase):
+
+    def to_verify_valid_shard(self):
+        self.assertEqual(timings.parse_shard("2/4"), (2, 4))
+
+    def to_verify_malformed_shard_is_rejected(self):
+        for value in ("2", "a/b", "1/2/3", ""):
+            with self.assertRaises(ValueError):
+                timings.parse_shard(value)
+
+    def to_verify_out_of_range_shard_is_rejected(self):
+        for value in ("0/3", "4/3", "1/0"):
+            with self.assertRaises(ValueError):
+                timings.parse_shard(value)
@@ -0,0 +1,214 @@
+# waits.py
+# Condition-based replacements for fixed time.sleep() calls.
+#
+# Every wait has a ceiling — normally the sleep it replaces — and returns as
+# soon as its condition holds (DOM quiet, element stable, network quiet, or a
+# caller-supplied condition). Time saved against the ceiling is tallied per
+# call site and logged by log_report().
+#
+# install_network_tracker() adds a document-start script that counts in-flight
+# fetch/XHR requests; network_idle() waits on that counter.
+
+import logging
+import threading
+import time as _time
+
+POLL_SECONDS = 0.05
+DOM_QUIET_MS = 150
+NETWORK_QUIET_MS = 300
+
+# Installs a MutationObserver once per document and reports how long the DOM
+# and the resource list have been quiet. Resource timing entries only appear
+# when a request finishes, so "network quiet" here means "nothing finished
+# loading for N ms".
+_PAGE_STATE_JS = """
+var s = window.__b2cSettle, now = performance.now();
+if (!s) {
+    s = window.__b2cSettle = {lastMutation: now, resources: -1, lastResource: now};
+    new MutationObserver(function () { s.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+var n = performance.getEntriesByType('resource').length;
+if (n !== s.resources) { s.resources = n; s.lastResource = now; }
+return {dom: now - s.lastMutation, net: now - s.lastResource, ready: document.readyState};
+"""
+
+# Injected at document start (before any page script) via CDP. Wraps fetch and
+# XMLHttpRequest to keep a count of requests in flight and the time the count
+# last changed.
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__b2cNet) { return; }
+    var net = window.__b2cNet = {inflight: 0, total: 0, lastChange: performance.now()};
+    function started() { net.inflight++; net.total++; net.lastChange = performance.now(); }
+    function finished() { net.inflight = Math.max(0, net.inflight - 1); net.lastChange = performance.now(); }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return fetch.apply(this, arguments).then(
+                function (r) { finished(); return r; },
+                function (e) { finished(); throw e; });
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var done = false, xhr = this;
+        function once() { if (!done) { done = true; finished(); } }
+        started();
+        xhr.addEventListener('loadend', once);
+        try { return send.apply(xhr, arguments); } catch (e) { once(); throw e; }
+    };
+})();
+"""
+
+# `since` is the page clock when the wait began, so requests that finished
+# before the click do not count as idle time. A new document resets the page
+# clock, in which case only the document's own activity counts.
+_NETWORK_STATE_JS = """
+var net = window.__b2cNet, now = performance.now(), since = arguments[0] || 0;
+if (!net) { return null; }
+var last = since <= now ? Math.max(net.lastChange, since) : net.lastChange;
+return {inflight: net.inflight, idle: now - last, ready: document.readyState};
+"""
+
+_RECT_JS = """
+var r = arguments[0].getBoundingClientRect();
+return [r.x, r.y, r.width, r.height];
+"""
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(site, ceiling, elapsed):
+    with _stats_lock:
+        calls, waited, budget = _stats.get(site, (0, 0.0, 0.0))
+        _stats[site] = (calls + 1, waited + elapsed, budget + ceiling)
+
+
+def _alert_open(driver):
+    try:
+        driver.switch_to.alert
+        return True
+    except Exception:
+        return False
+
+
+def _poll(driver, site, ceiling, check, alert_aware):
+    """Call check() until it returns a truthy value or the ceiling passes."""
+    start = _time.monotonic()
+    deadline = start + ceiling
+    value = None
+    while True:
+        # Any command other than alert handling would dismiss an open alert,
+        # so stop here and leave it for the caller to inspect.
+        if alert_aware and _alert_open(driver):
+            break
+        try:
+            value = check()
+        except Exception:
+            value = None
+        if value:
+            break
+        remaining = deadline - _time.monotonic()
+        if remaining <= 0:
+            break
+        _time.sleep(min(POLL_SECONDS, remaining))
+    _record(site, ceiling, _time.monotonic() - start)
+    return value
+
+
+def settle(driver, site, ceiling, dom=True, network=False, alert_aware=False,
+           dom_quiet_ms=DOM_QUIET_MS, network_quiet_ms=NETWORK_QUIET_MS):
+    """Replace a blind sleep: return once the page is quiet, or after `ceiling` seconds.
+
+    Never raises. Pass alert_aware=True where a JS alert may pop up, so it
+    is not dismissed by the polling.
+    """
+    def check():
+        state = driver.execute_script(_PAGE_STATE_JS)
+        if state["ready"] != "complete":
+            return False
+        if dom and state["dom"] < dom_quiet_ms:
+            return False
+        if network and state["net"] < network_quiet_ms:
+            return False
+        return True
+
+    _poll(driver, site, ceiling, check, alert_aware)
+
+
+def until(driver, site, condition, ceiling, alert_aware=False):
+    """Replace a sleep that stands in for a known condition.
+
+    `condition` is called with the driver (like an expected_conditions
+    callable). Returns its first truthy value, or None once `ceiling`
+    seconds have passed. Never raises.
+    """
+    return _poll(driver, site, ceiling, lambda: condition(driver), alert_aware)
+
+
+def install_network_tracker(driver):
+    """Register NETWORK_TRACKER_JS to run at the start of every new document."""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS})
+    try:
+        driver.execute_script(NETWORK_TRACKER_JS)  # the document already open
+    except Exception:
+        pass
+
+
+def network_idle(driver, site, ceiling, idle_ms=NETWORK_QUIET_MS, alert_aware=False):
+    """Wait until no fetch/XHR has been in flight for `idle_ms`, or `ceiling` seconds pass.
+
+    Falls back to settle(network=True) on drivers without the tracker.
+    Returns True if the network went idle. Never raises.
+    """
+    try:
+        since = driver.execute_script("return window.__b2cNet ? performance.now() : null;")
+    except Exception:
+        since = None
+    if since is None:
+        settle(driver, site, ceiling, dom=False, network=True, alert_aware=alert_aware,
+               network_quiet_ms=idle_ms)
+        return False
+
+    def check():
+        state = driver.execute_script(_NETWORK_STATE_JS, since)
+        return bool(state) and state["ready"] == "complete" and state["inflight"] == 0 and state["idle"] >= idle_ms
+
+    return bool(_poll(driver, site, ceiling, check, alert_aware))
+
+
+def element_stable(driver, site, element, ceiling):
+    """Wait until an element stops moving/resizing (e.g. after an animation)."""
+    last = []
+
+    def check():
+        rect = driver.execute_script(_RECT_JS, element)
+        stable = rect == last[-1] if last else False
+        last.append(rect)
+        return stable
+
+    _poll(driver, site, ceiling, check, alert_aware=False)
+
+
+def report():
+    """Per call site: (site, calls, seconds waited, seconds saved vs. fixed sleeps)."""
+    with _stats_lock:
+        rows = [(site, calls, waited, budget - waited) for site, (calls, waited, budget) in _stats.items()]
+    return sorted(rows, key=lambda r: -r[3])
+
+
+def log_report(title, reset=True):
+    rows = report()
+    if not rows:
+        return
+    logging.info("Wait savings for %s (vs. fixed sleeps):", title)
+    for site, calls, waited, saved in rows:
+        logging.info("  %-40s %4d calls  waited %6.1fs  saved %6.1fs", site, calls, waited, saved)
+    logging.info("  %-40s %4d calls  waited %6.1fs  saved %6.1fs", "TOTAL",
+                 sum(r[1] for r in rows), sum(r[2] for r in rows), sum(r[3] for r in rows))
+    if reset:
+        with _stats_lock:
+            _stats.clear()